@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from .base_agent import BaseAgent
+from .context_window_config import ContextWindowConfig
 from .live_request_queue import LiveRequest
 from .live_request_queue import LiveRequestQueue
 from .llm_agent import Agent
@@ -25,6 +26,7 @@ from .sequential_agent import SequentialAgent
 __all__ = [
     'Agent',
     'BaseAgent',
+    'ContextWindowConfig',
     'LlmAgent',
     'LoopAgent',
     'ParallelAgent',
@@ -0,0 +1,65 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from typing import Callable
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic import Field
+
+from ..events.event import Event
+
+
+class ContextWindowConfig(BaseModel):
+  """Limits the conversation history an LLM agent sends to the model.
+
+  The most recent events are kept, as long as they fit in all the set limits.
+  A function call and its response are kept or dropped together. The latest
+  event is always kept. The kept events start with a user turn, so when only
+  model turns fit, e.g. function calls, the user turn before them is kept too.
+
+  Example:
+  ```
+    agent = LlmAgent(
+        ...,
+        context_window=ContextWindowConfig(
+            max_tokens=20_000,
+            pinned=lambda event: event.author == 'user',
+        ),
+    )
+  ```
+  """
+
+  model_config = ConfigDict(
+      extra='forbid',
+  )
+  """The pydantic model config."""
+
+  max_tokens: Optional[int] = Field(default=None, gt=0)
+  """The maximum number of tokens of the kept events, estimated locally from
+  their size. Unlimited if not set."""
+
+  max_events: Optional[int] = Field(default=None, gt=0)
+  """The maximum number of kept events. Unlimited if not set."""
+
+  pinned: Optional[Callable[[Event], bool]] = None
+  """Whether an event is always kept, e.g. the user's requests.
+
+  Pinned events are kept in addition to the events that fit in the limits.
+  Finding them requires the whole history, so sessions loaded with a
+  `session_events_page_size` page in all their older events.
+  """
@@ -14,6 +14,7 @@
 
 from __future__ import annotations
 
+from typing import Any
 from typing import Optional
 import uuid
 
@@ -158,6 +159,16 @@ class InvocationContext(BaseModel):
   of this invocation.
   """
 
+  _function_declarations: dict[tuple[Any, ...], Any] = {}
+  """The function declarations of tool lists, reused by the LLM calls of this
+  invocation.
+  """
+
+  _contents_builders: dict[tuple[Any, ...], Any] = {}
+  """The builders of the LLM request contents of agents, reused by the LLM
+  calls of this invocation.
+  """
+
   def increment_llm_call_count(
       self,
   ):
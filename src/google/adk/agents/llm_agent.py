@@ -29,6 +29,7 @@ from pydantic import BaseModel
 from pydantic import Field
 from pydantic import field_validator
 from pydantic import model_validator
+from pydantic import PrivateAttr
 from typing_extensions import override
 from typing_extensions import TypeAlias
 
@@ -50,6 +51,7 @@ from ..tools.function_tool import FunctionTool
 from ..tools.tool_context import ToolContext
 from .base_agent import BaseAgent
 from .callback_context import CallbackContext
+from .context_window_config import ContextWindowConfig
 from .invocation_context import InvocationContext
 from .readonly_context import ReadonlyContext
 
@@ -104,12 +106,20 @@ ExamplesUnion = Union[list[Example], BaseExampleProvider]
 
 
 async def _convert_tool_union_to_tools(
-    tool_union: ToolUnion, ctx: ReadonlyContext
+    tool_union: ToolUnion,
+    ctx: ReadonlyContext,
+    function_tools: Optional[dict[int, FunctionTool]] = None,
 ) -> list[BaseTool]:
   if isinstance(tool_union, BaseTool):
     return [tool_union]
   if isinstance(tool_union, Callable):
-    return [FunctionTool(func=tool_union)]
+    if function_tools is None:
+      return [FunctionTool(func=tool_union)]
+    # Reuse the wrapping tool, which caches the function's declaration.
+    tool = function_tools.get(id(tool_union))
+    if tool is None or tool.func is not tool_union:
+      tool = function_tools[id(tool_union)] = FunctionTool(func=tool_union)
+    return [tool]
 
   return await tool_union.get_tools(ctx)
 
@@ -138,6 +148,9 @@ class LlmAgent(BaseAgent):
   tools: list[ToolUnion] = Field(default_factory=list)
   """Tools available to this agent."""
 
+  _function_tools: dict[int, FunctionTool] = PrivateAttr(default_factory=dict)
+  """The FunctionTools wrapping the functions in tools, by function id."""
+
   generate_content_config: Optional[types.GenerateContentConfig] = None
   """The additional content generation configurations.
 
@@ -169,6 +182,11 @@ class LlmAgent(BaseAgent):
             instruction and input
   """
 
+  context_window: Optional[ContextWindowConfig] = None
+  """Limits the included contents to the most recent ones. Includes all
+  contents if not set.
+  """
+
   # Controlled input/output configurations - Start
   input_schema: Optional[type[BaseModel]] = None
   """The input schema when agent is used as a tool."""
@@ -361,7 +379,11 @@ class LlmAgent(BaseAgent):
     """
     resolved_tools = []
     for tool_union in self.tools:
-      resolved_tools.extend(await _convert_tool_union_to_tools(tool_union, ctx))
+      resolved_tools.extend(
+          await _convert_tool_union_to_tools(
+              tool_union, ctx, self._function_tools
+          )
+      )
     return resolved_tools
 
   @property
@@ -14,6 +14,8 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
+import dataclasses
 import json
 import logging
 from pathlib import Path
@@ -28,13 +30,21 @@ try:
   from a2a.client import A2AClient
   from a2a.client.client import A2ACardResolver  # Import A2ACardResolver
   from a2a.types import AgentCard
+  from a2a.types import Artifact as A2AArtifact
   from a2a.types import Message as A2AMessage
   from a2a.types import MessageSendParams as A2AMessageSendParams
   from a2a.types import Part as A2APart
   from a2a.types import Role
   from a2a.types import SendMessageRequest
+  from a2a.types import SendMessageResponse
   from a2a.types import SendMessageSuccessResponse
+  from a2a.types import SendStreamingMessageRequest
+  from a2a.types import SendStreamingMessageSuccessResponse
   from a2a.types import Task as A2ATask
+  from a2a.types import TaskArtifactUpdateEvent
+  from a2a.types import TaskState
+  from a2a.types import TaskStatus
+  from a2a.types import TaskStatusUpdateEvent
 
 except ImportError as e:
   import sys
@@ -56,6 +66,7 @@ from ..a2a.converters.part_converter import convert_genai_part_to_a2a_part
 from ..a2a.logs.log_utils import build_a2a_request_log
 from ..a2a.logs.log_utils import build_a2a_response_log
 from ..agents.invocation_context import InvocationContext
+from ..agents.run_config import StreamingMode
 from ..events.event import Event
 from ..flows.llm_flows.contents import _convert_foreign_event
 from ..flows.llm_flows.contents import _is_other_agent_reply
@@ -67,10 +78,52 @@ from .base_agent import BaseAgent
 A2A_METADATA_PREFIX = "a2a:"
 DEFAULT_TIMEOUT = 600.0
 
+_FINAL_TASK_STATES = frozenset({
+    TaskState.completed,
+    TaskState.canceled,
+    TaskState.failed,
+    TaskState.rejected,
+    TaskState.input_required,
+    TaskState.auth_required,
+    TaskState.unknown,
+})
+
+
+# Bounds of the per-agent caches of synced histories and converted parts.
+_MAX_SYNCED_SESSIONS = 1024
+_MAX_CONVERTED_EVENTS = 4096
+
 
 logger = logging.getLogger("google_adk." + __name__)
 
 
+@dataclasses.dataclass(frozen=True)
+class _SyncedHistory:
+  """The last event of a session delivered to the remote agent."""
+
+  context_id: Optional[str]
+  event_index: int
+  event_id: str
+
+
+def _apply_artifact_update(
+    artifacts: Optional[list[A2AArtifact]], update: TaskArtifactUpdateEvent
+) -> list[A2AArtifact]:
+  """Apply an artifact update to the artifacts of a task."""
+  artifacts = list(artifacts or [])
+  for i, artifact in enumerate(artifacts):
+    if artifact.artifactId == update.artifact.artifactId:
+      if update.append:
+        artifacts[i] = artifact.model_copy(
+            update={"parts": [*artifact.parts, *update.artifact.parts]}
+        )
+      else:
+        artifacts[i] = update.artifact
+      return artifacts
+  artifacts.append(update.artifact)
+  return artifacts
+
+
 @experimental
 class AgentCardResolutionError(Exception):
   """Raised when agent card resolution fails."""
@@ -99,6 +152,8 @@ class RemoteA2aAgent(BaseAgent):
   - HTTP client management with proper resource cleanup
   - A2A message conversion and error handling
   - Session state management across requests
+  - Streaming of partial events, when running in SSE streaming mode and the
+    remote agent supports streaming
   """
 
   def __init__(
@@ -137,6 +192,10 @@ class RemoteA2aAgent(BaseAgent):
     self._httpx_client_needs_cleanup = httpx_client is None
     self._timeout = timeout
     self._is_resolved = False
+    # Session ID -> history already in the remote context.
+    self._synced_histories: OrderedDict[str, _SyncedHistory] = OrderedDict()
+    # Event ID -> A2A parts of the event.
+    self._converted_parts: OrderedDict[str, list[A2APart]] = OrderedDict()
 
     # Validate and store agent card reference
     if isinstance(agent_card, AgentCard):
@@ -316,40 +375,101 @@ class RemoteA2aAgent(BaseAgent):
   ) -> tuple[list[A2APart], dict[str, Any], str]:
     """Construct A2A message parts from session events.
 
+    Only the events the remote agent hasn't seen yet are sent: the events
+    after the last one synced to the remote context, or without synced
+    history, after the last reply of this agent. Failed requests aren't
+    replies, so their events are sent again.
+
     Args:
       ctx: The invocation context
 
     Returns:
       List of A2A parts extracted from session events, context ID
     """
-    message_parts: list[A2APart] = []
+    events = ctx.session.events
+    start = 0
     context_id = None
-    for event in reversed(ctx.session.events):
-      if _is_other_agent_reply(self.name, event):
-        event = _convert_foreign_event(event)
-      elif event.author == self.name:
+    synced = self._synced_histories.get(ctx.session.id)
+    if (
+        synced is not None
+        and synced.event_index < len(events)
+        and events[synced.event_index].id == synced.event_id
+    ):
+      start = synced.event_index + 1
+      context_id = synced.context_id
+
+    event_parts: list[list[A2APart]] = []
+    for index in range(len(events) - 1, start - 1, -1):
+      event = events[index]
+      if event.author == self.name:
+        if event.error_message:
+          continue
         # stop on content generated by current a2a agent given it should already
         # be in remote session
         if event.custom_metadata:
-          context_id = (
-              event.custom_metadata.get(A2A_METADATA_PREFIX + "context_id")
-              if event.custom_metadata
-              else None
+          context_id = event.custom_metadata.get(
+              A2A_METADATA_PREFIX + "context_id"
           )
         break
-
-      if not event.content or not event.content.parts:
-        continue
-
-      for part in event.content.parts:
-
+      event_parts.append(self._convert_event_parts(event))
+
+    message_parts = [part for parts in reversed(event_parts) for part in parts]
+    return message_parts, context_id
+
+  def _convert_event_parts(self, event: Event) -> list[A2APart]:
+    """Convert the parts of an event to A2A parts, caching the result."""
+    parts = self._converted_parts.get(event.id)
+    if parts is not None:
+      self._converted_parts.move_to_end(event.id)
+      return parts
+
+    parts = []
+    content_event = event
+    if _is_other_agent_reply(self.name, event):
+      content_event = _convert_foreign_event(event)
+    if content_event.content and content_event.content.parts:
+      for part in content_event.content.parts:
         converted_part = convert_genai_part_to_a2a_part(part)
         if converted_part:
-          message_parts.append(converted_part)
+          parts.append(converted_part)
         else:
           logger.warning("Failed to convert part to A2A format: %s", part)
 
-    return message_parts[::-1], context_id
+    self._converted_parts[event.id] = parts
+    if len(self._converted_parts) > _MAX_CONVERTED_EVENTS:
+      self._converted_parts.popitem(last=False)
+    return parts
+
+  def _record_synced_history(
+      self,
+      ctx: InvocationContext,
+      event_index: int,
+      a2a_request: SendMessageRequest,
+      event: Event,
+  ) -> None:
+    """Record that the session events up to the index reached the remote.
+
+    Args:
+      ctx: The invocation context
+      event_index: Index of the last session event sent with the request
+      a2a_request: The request sent
+      event: The event converted from the response
+    """
+    if event.error_message or event_index < 0:
+      return
+    context_id = (event.custom_metadata or {}).get(
+        A2A_METADATA_PREFIX + "context_id",
+        a2a_request.params.message.contextId,
+    )
+    session_id = ctx.session.id
+    self._synced_histories[session_id] = _SyncedHistory(
+        context_id=context_id,
+        event_index=event_index,
+        event_id=ctx.session.events[event_index].id,
+    )
+    self._synced_histories.move_to_end(session_id)
+    if len(self._synced_histories) > _MAX_SYNCED_SESSIONS:
+      self._synced_histories.popitem(last=False)
 
   async def _handle_a2a_response(
       self, a2a_response: Any, ctx: InvocationContext
@@ -438,6 +558,9 @@ class RemoteA2aAgent(BaseAgent):
       )
       return
 
+    # Index of the last event sent with the request
+    last_event_index = len(ctx.session.events) - 1
+
     # Create A2A request for function response or regular message
     a2a_request = self._create_a2a_request_for_user_function_response(ctx)
     if not a2a_request:
@@ -472,19 +595,21 @@ class RemoteA2aAgent(BaseAgent):
     logger.info(build_a2a_request_log(a2a_request))
 
     try:
+      if self._should_stream(ctx):
+        async for event in self._send_streaming_message(a2a_request, ctx):
+          if not event.partial:
+            self._record_synced_history(
+                ctx, last_event_index, a2a_request, event
+            )
+          yield event
+        return
+
       a2a_response = await self._a2a_client.send_message(request=a2a_request)
       logger.info(build_a2a_response_log(a2a_response))
 
       event = await self._handle_a2a_response(a2a_response, ctx)
-
-      # Add metadata about the request and response
-      event.custom_metadata = event.custom_metadata or {}
-      event.custom_metadata[A2A_METADATA_PREFIX + "request"] = (
-          a2a_request.model_dump(exclude_none=True, by_alias=True)
-      )
-      event.custom_metadata[A2A_METADATA_PREFIX + "response"] = (
-          a2a_response.root.model_dump(exclude_none=True, by_alias=True)
-      )
+      self._add_request_response_metadata(event, a2a_request, a2a_response)
+      self._record_synced_history(ctx, last_event_index, a2a_request, event)
 
       yield event
 
@@ -506,6 +631,160 @@ class RemoteA2aAgent(BaseAgent):
           },
       )
 
+  def _should_stream(self, ctx: InvocationContext) -> bool:
+    """Whether to use the streaming endpoint of the remote agent."""
+    capabilities = self._agent_card.capabilities
+    return (
+        capabilities is not None
+        and bool(capabilities.streaming)
+        and ctx.run_config is not None
+        and ctx.run_config.streaming_mode == StreamingMode.SSE
+    )
+
+  def _add_request_response_metadata(
+      self,
+      event: Event,
+      a2a_request: SendMessageRequest,
+      a2a_response: SendMessageResponse,
+  ) -> None:
+    """Add metadata about the request and response to the event."""
+    event.custom_metadata = event.custom_metadata or {}
+    event.custom_metadata[A2A_METADATA_PREFIX + "request"] = (
+        a2a_request.model_dump(exclude_none=True, by_alias=True)
+    )
+    event.custom_metadata[A2A_METADATA_PREFIX + "response"] = (
+        a2a_response.root.model_dump(exclude_none=True, by_alias=True)
+    )
+
+  def _convert_task_update(
+      self,
+      update: Union[TaskStatusUpdateEvent, TaskArtifactUpdateEvent],
+      ctx: InvocationContext,
+  ) -> Optional[Event]:
+    """Convert a task update to a partial event.
+
+    Args:
+      update: The status or artifact update of the remote task
+      ctx: The invocation context
+
+    Returns:
+      Partial event with the content of the update, None if it has no content
+    """
+    if isinstance(update, TaskStatusUpdateEvent):
+      message = update.status.message
+      # The first update of a task may echo the request.
+      if not message or message.role == Role.user:
+        return None
+      event = convert_a2a_task_to_event(
+          A2ATask(
+              id=update.taskId,
+              contextId=update.contextId,
+              status=update.status,
+          ),
+          self.name,
+          ctx,
+      )
+    else:
+      if not update.artifact.parts:
+        return None
+      event = convert_a2a_message_to_event(
+          A2AMessage(
+              messageId=update.artifact.artifactId,
+              role=Role.agent,
+              parts=update.artifact.parts,
+          ),
+          self.name,
+          ctx,
+      )
+
+    event.partial = True
+    event.custom_metadata = event.custom_metadata or {}
+    event.custom_metadata[A2A_METADATA_PREFIX + "task_id"] = update.taskId
+    event.custom_metadata[A2A_METADATA_PREFIX + "context_id"] = (
+        update.contextId
+    )
+    return event
+
+  async def _send_streaming_message(
+      self, a2a_request: SendMessageRequest, ctx: InvocationContext
+  ) -> AsyncGenerator[Event, None]:
+    """Send the request via the streaming endpoint of the remote agent.
+
+    Task updates are yielded as partial events as soon as they arrive. Once
+    the task is final, the task with all its updates applied is converted to
+    a complete event, like the response of a non-streaming request.
+
+    Args:
+      a2a_request: The request to send
+      ctx: The invocation context
+
+    Yields:
+      Partial events for the task updates, then the complete event
+    """
+    stream = self._a2a_client.send_message_streaming(
+        request=SendStreamingMessageRequest(
+            id=a2a_request.id, params=a2a_request.params
+        )
+    )
+    result: Optional[Union[A2ATask, A2AMessage]] = None
+    a2a_response: Optional[SendMessageResponse] = None
+    # Closes the connection also when the loop breaks early or this generator
+    # is closed, e.g. when the invocation ends.
+    try:
+      async for streaming_response in stream:
+        if not isinstance(
+            streaming_response.root, SendStreamingMessageSuccessResponse
+        ):
+          # Error responses are the same for both endpoints.
+          a2a_response = SendMessageResponse(root=streaming_response.root)
+          break
+
+        update = streaming_response.root.result
+        if isinstance(update, A2AMessage):
+          result = update
+          break
+        if isinstance(update, A2ATask):
+          result = update
+          if update.status.state in _FINAL_TASK_STATES:
+            break
+          continue
+
+        if result is None:
+          result = A2ATask(
+              id=update.taskId,
+              contextId=update.contextId,
+              status=TaskStatus(state=TaskState.working),
+          )
+        if isinstance(update, TaskStatusUpdateEvent):
+          result.status = update.status
+          message = update.status.message
+          if message and message.role != Role.user:
+            # The task converts to its last message if the final status has
+            # none.
+            result.history = [*(result.history or []), message]
+          if update.final:
+            break
+        else:
+          result.artifacts = _apply_artifact_update(result.artifacts, update)
+
+        event = self._convert_task_update(update, ctx)
+        if event:
+          yield event
+    finally:
+      await stream.aclose()
+
+    if a2a_response is None:
+      if result is None:
+        raise A2AClientError("Stream ended without a result")
+      a2a_response = SendMessageResponse(
+          root=SendMessageSuccessResponse(id=a2a_request.id, result=result)
+      )
+    logger.info(build_a2a_response_log(a2a_response))
+
+    event = await self._handle_a2a_response(a2a_response, ctx)
+    self._add_request_response_metadata(event, a2a_request, a2a_response)
+    yield event
+
   async def _run_live_impl(
       self, ctx: InvocationContext
   ) -> AsyncGenerator[Event, None]:
@@ -22,6 +22,7 @@ from typing import Optional
 from google.genai import types
 from pydantic import BaseModel
 from pydantic import ConfigDict
+from pydantic import Field
 from pydantic import field_validator
 
 logger = logging.getLogger('google_adk.' + __name__)
@@ -89,6 +90,22 @@ class RunConfig(BaseModel):
     - Less than or equal to 0: This allows for unbounded number of llm calls.
   """
 
+  max_concurrent_function_calls: Optional[int] = Field(default=None, ge=1)
+  """
+  The maximum number of function calls from one model response that an agent
+  executes concurrently, including their before and after tool callbacks.
+  Unlimited if not set. Set it to 1 to execute the function calls one by one.
+  """
+
+  session_events_page_size: Optional[int] = None
+  """
+  If set, the runner loads only this many of the most recent session events
+  up front, and older events are paged in when the invocation needs them, e.g.
+  when an LLM agent includes the full conversation history in its request.
+  An LLM agent with a `context_window` without pinned events only pages in
+  the events that may fit in it. Loads all session events if not set.
+  """
+
   @field_validator('max_llm_calls', mode='after')
   @classmethod
   def validate_max_llm_calls(cls, value: int) -> int:
@@ -0,0 +1,108 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import fnmatch
+import re
+from typing import Dict, List, Optional, Sequence
+
+_WILDCARDS = frozenset("*?[")
+
+
+def _is_literal(text: str) -> bool:
+  return not _WILDCARDS.intersection(text)
+
+
+class _PrefixNode:
+  __slots__ = ("children", "index")
+
+  def __init__(self):
+    self.children: Dict[str, _PrefixNode] = {}
+    # Index of the first pattern `<path to this node>*`, if any.
+    self.index: Optional[int] = None
+
+
+class GlobPatternSet:
+  """Ordered list of `fnmatch` patterns, compiled for fast matching.
+
+  Patterns are split by shape when the set is built:
+
+  - literal patterns, e.g. `db/users`, go into a dict,
+  - literal-prefix patterns, e.g. `db/*`, go into a character trie,
+  - all other patterns are combined into a single regex.
+
+  Matching a name costs one dict lookup plus a trie walk of O(len(name)),
+  independent of the number of literal and literal-prefix patterns, plus
+  one regex match if there are other patterns. Like `fnmatch.fnmatch` on
+  POSIX, matching is case-sensitive.
+  """
+
+  def __init__(self, patterns: Sequence[str]):
+    self.patterns = list(patterns)
+    self._literals: Dict[str, int] = {}
+    self._prefixes = _PrefixNode()
+    self._has_prefixes = False
+    regex_parts: List[str] = []
+
+    for index, pattern in enumerate(self.patterns):
+      if _is_literal(pattern):
+        self._literals.setdefault(pattern, index)
+        continue
+
+      prefix = pattern.rstrip("*")
+      if _is_literal(prefix):
+        node = self._prefixes
+        for char in prefix:
+          child = node.children.get(char)
+          if child is None:
+            child = node.children[char] = _PrefixNode()
+          node = child
+        if node.index is None:
+          node.index = index
+        self._has_prefixes = True
+        continue
+
+      regex_parts.append(f"(?P<p{index}>{fnmatch.translate(pattern)})")
+
+    self._regex = re.compile("|".join(regex_parts)) if regex_parts else None
+
+  def __len__(self) -> int:
+    return len(self.patterns)
+
+  def match(self, name: str) -> Optional[str]:
+    """Get the first pattern matching the name, or None."""
+    index = self._literals.get(name)
+
+    if self._has_prefixes:
+      node = self._prefixes
+      for char in name:
+        if node.index is not None and (index is None or node.index < index):
+          index = node.index
+        node = node.children.get(char)
+        if node is None:
+          break
+      else:
+        if node.index is not None and (index is None or node.index < index):
+          index = node.index
+
+    if self._regex is not None:
+      # Alternatives are tried in order, so this is the first regex match.
+      match = self._regex.match(name)
+      if match:
+        regex_index = int(match.lastgroup[1:])
+        if index is None or regex_index < index:
+          index = regex_index
+
+    return None if index is None else self.patterns[index]
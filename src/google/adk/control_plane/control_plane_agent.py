@@ -14,16 +14,17 @@
 
 from __future__ import annotations
 
+import inspect
 import logging
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set
 
+from google.genai import types
 from pydantic import Field
 
 from ..agents.base_agent import BaseAgent
 from ..agents.invocation_context import InvocationContext
 from ..agents.llm_agent import LlmAgent
 from ..events.event import Event
-from ..models import types
 from ..tools.base_tool import BaseTool
 from ..tools.function_tool import FunctionTool
 from .policy_engine import PolicyDecision, PolicyEngine
@@ -81,21 +82,9 @@ class ControlPlaneAgent(LlmAgent):
   def _add_control_plane_tools(self):
     """Add tools for control plane operations."""
     control_tools = [
-        FunctionTool(
-            name="check_policies",
-            description="Check if an action is allowed by policies",
-            func=self._check_policies_tool,
-        ),
-        FunctionTool(
-            name="list_active_policies",
-            description="List all active policies",
-            func=self._list_policies_tool,
-        ),
-        FunctionTool(
-            name="get_policy_decision",
-            description="Get detailed policy decision for an action",
-            func=self._get_policy_decision_tool,
-        ),
+        FunctionTool(self._check_policies_tool),
+        FunctionTool(self._list_policies_tool),
+        FunctionTool(self._get_policy_decision_tool),
     ]
     
     # Add control tools to existing tools
@@ -146,31 +135,38 @@ class ControlPlaneAgent(LlmAgent):
     
     # Add policy enforcement to tool calls
     original_before_tool = self.before_tool_callback
+    original_before_tools = self.canonical_before_tool_callbacks
     
-    async def policy_enforced_before_tool(context):
-      # Check tool usage policies
-      tool_name = context.metadata.get("tool_name")
-      if tool_name and self.enforce_policies:
+    async def policy_enforced_before_tool(tool, args, tool_context):
+      # Check tool usage policies. The checks of parallel tool calls run
+      # concurrently, so they are evaluated as one batch.
+      if self.enforce_policies:
         policy_context = PolicyContext(
             agent_name=self.name,
             user_id=invocation_context.session.user_id,
             session_id=invocation_context.session.id,
-            action=f"tool_call:{tool_name}",
-            metadata={"tool_name": tool_name},
+            action=f"tool_call:{tool.name}",
+            metadata={"tool_name": tool.name},
         )
         
-        decision = await self.policy_engine.evaluate(
+        decision = await self.policy_engine.evaluate_coalesced(
             policy_context, self.policy_types_to_check
         )
         
         if not decision.allowed:
-          # Modify context to prevent tool execution
-          context.metadata["policy_blocked"] = True
-          context.metadata["policy_reason"] = decision.blocking_policies[0].reason
+          # Returning a response prevents the tool execution
+          return {
+              "policy_blocked": True,
+              "policy_reason": decision.blocking_policies[0].reason,
+          }
       
-      # Call original callback if exists
-      if original_before_tool:
-        return await original_before_tool(context)
+      # Call original callbacks if they exist
+      for callback in original_before_tools:
+        response = callback(tool=tool, args=args, tool_context=tool_context)
+        if inspect.isawaitable(response):
+          response = await response
+        if response:
+          return response
     
     # Temporarily replace callback
     self.before_tool_callback = policy_enforced_before_tool
@@ -253,7 +249,7 @@ class ControlPlaneAgent(LlmAgent):
         f"user={invocation_context.session.user_id}, "
         f"session={invocation_context.session.id}, "
         f"author={event.author}, "
-        f"type={event.type}"
+        f"event={event.id}"
     )
     
     # TODO: Implement persistent audit storage
@@ -273,7 +269,7 @@ class ControlPlaneAgent(LlmAgent):
         metadata=kwargs,
     )
     
-    decision = await self.policy_engine.evaluate(
+    decision = await self.policy_engine.evaluate_coalesced(
         policy_context, self.policy_types_to_check
     )
     
@@ -315,7 +311,7 @@ class ControlPlaneAgent(LlmAgent):
         metadata=kwargs,
     )
     
-    decision = await self.policy_engine.evaluate(
+    decision = await self.policy_engine.evaluate_coalesced(
         policy_context, self.policy_types_to_check, fail_fast=False
     )
     
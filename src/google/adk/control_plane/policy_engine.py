@@ -15,8 +15,20 @@
 from __future__ import annotations
 
 import asyncio
+from collections import OrderedDict
+import itertools
 import logging
-from typing import Dict, List, Optional, Set
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from pydantic import BaseModel, Field
 
@@ -38,18 +50,59 @@ class PolicyDecision(BaseModel):
   recommendations: List[str] = Field(
       description="Aggregated recommendations"
   )
-  metadata: Dict[str, any] = Field(
+  metadata: Dict[str, Any] = Field(
       default_factory=dict, description="Additional decision metadata"
   )
 
 
 class PolicyEngine:
-  """Engine for managing and evaluating policies."""
+  """Engine for managing and evaluating policies.
   
-  def __init__(self):
-    """Initialize the policy engine."""
+  For each set of policy types, the engine compiles the enabled policies
+  into a plan sorted by priority, and keeps it until a policy is registered
+  or unregistered. Changes to a registered policy take effect once it is
+  registered again.
+  
+  Decisions that only involve pure policies are cached in an LRU cache,
+  keyed on the context fields the policies depend on (see
+  `Policy.cache_key`).
+  
+  In concurrent mode, the policies of each priority tier are evaluated
+  concurrently, tier after tier. The decision is the same as with
+  sequential evaluation: results are reported in priority order, and with
+  `fail_fast` only up to the first denial in that order.
+  """
+  
+  def __init__(
+      self,
+      decision_cache_size: int = 1024,
+      concurrent: bool = False,
+      policy_timeout: Optional[float] = None,
+  ):
+    """Initialize the policy engine.
+    
+    Args:
+        decision_cache_size: Maximum number of cached decisions, 0 disables
+          the cache
+        concurrent: Whether evaluate() evaluates policies of the same
+          priority concurrently by default
+        policy_timeout: Seconds a policy may take before it's treated as a
+          denial (None = no limit)
+    """
+    self.concurrent = concurrent
+    self.policy_timeout = policy_timeout
     self._policies: Dict[str, Policy] = {}
     self._policy_types: Dict[PolicyType, List[str]] = {}
+    self._plans: Dict[Hashable, Tuple[Policy, ...]] = {}
+    self.decision_cache_size = decision_cache_size
+    self._decision_cache: OrderedDict[Hashable, PolicyDecision] = OrderedDict()
+    self._cache_hits = 0
+    self._cache_misses = 0
+    self._pending_batches: Dict[
+        Tuple[Optional[FrozenSet[PolicyType]], bool],
+        List[Tuple[PolicyContext, asyncio.Future]],
+    ] = {}
+    self._batch_tasks: Set[asyncio.Task] = set()
     
   def register_policy(self, policy: Policy) -> None:
     """Register a policy with the engine.
@@ -67,6 +120,7 @@ class PolicyEngine:
       self._policy_types[policy.policy_type] = []
     if policy.name not in self._policy_types[policy.policy_type]:
       self._policy_types[policy.policy_type].append(policy.name)
+    self._invalidate()
     
     logger.info(
         f"Registered policy: {policy.name} (type: {policy.policy_type})"
@@ -90,6 +144,7 @@ class PolicyEngine:
     # Remove from type index
     if policy.policy_type in self._policy_types:
       self._policy_types[policy.policy_type].remove(policy_name)
+    self._invalidate()
     
     logger.info(f"Unregistered policy: {policy_name}")
     return True
@@ -133,11 +188,97 @@ class PolicyEngine:
     
     return policies
   
+  def get_metrics(self) -> Dict[str, Any]:
+    """Get policy engine metrics."""
+    lookups = self._cache_hits + self._cache_misses
+    return {
+        "registered_policies": len(self._policies),
+        "compiled_plans": len(self._plans),
+        "decision_cache_size": len(self._decision_cache),
+        "decision_cache_hits": self._cache_hits,
+        "decision_cache_misses": self._cache_misses,
+        "decision_cache_hit_rate": (
+            self._cache_hits / lookups if lookups else 0.0
+        ),
+    }
+  
+  def _invalidate(self) -> None:
+    """Drop the compiled plans and cached decisions."""
+    self._plans.clear()
+    self._decision_cache.clear()
+  
+  def _plan_key(self, policy_types: Optional[Set[PolicyType]]) -> Hashable:
+    """Get the key of a plan, which changes when a policy is toggled."""
+    return (
+        frozenset(policy_types) if policy_types else None,
+        tuple(policy.enabled for policy in self._policies.values()),
+    )
+  
+  def _get_plan(self, plan_key: Hashable) -> Tuple[Policy, ...]:
+    """Get the enabled policies of the given types, by priority."""
+    plan = self._plans.get(plan_key)
+    if plan is None:
+      policy_types, _ = plan_key
+      policies = [
+          policy
+          for policy in self._policies.values()
+          if policy.enabled
+          and (policy_types is None or policy.policy_type in policy_types)
+      ]
+      # The sort is stable, so equal priorities keep registration order.
+      policies.sort(key=lambda p: p.priority, reverse=True)
+      plan = self._plans[plan_key] = tuple(policies)
+    return plan
+  
+  def _decision_cache_key(
+      self,
+      plan_key: Hashable,
+      plan: Tuple[Policy, ...],
+      context: PolicyContext,
+      fail_fast: bool,
+  ) -> Optional[Hashable]:
+    """Get the decision cache key, or None if the decision can't be cached."""
+    if not self.decision_cache_size:
+      return None
+    policy_keys = []
+    for policy in plan:
+      policy_key = policy.cache_key(context)
+      if policy_key is None:
+        return None
+      policy_keys.append(policy_key)
+    key = (plan_key, fail_fast, tuple(policy_keys))
+    try:
+      hash(key)
+    except TypeError:
+      return None
+    return key
+  
+  def _get_cached_decision(self, key: Hashable) -> Optional[PolicyDecision]:
+    decision = self._decision_cache.get(key)
+    if decision is None:
+      self._cache_misses += 1
+      return None
+    self._cache_hits += 1
+    self._decision_cache.move_to_end(key)
+    # Callers may modify their decision.
+    return decision.model_copy(deep=True)
+  
+  def _cache_decision(self, key: Hashable, decision: PolicyDecision) -> None:
+    if any(
+        result.metadata.get("evaluation_error")
+        for result in decision.evaluated_policies
+    ):
+      return
+    self._decision_cache[key] = decision.model_copy(deep=True)
+    if len(self._decision_cache) > self.decision_cache_size:
+      self._decision_cache.popitem(last=False)
+  
   async def evaluate(
       self,
       context: PolicyContext,
       policy_types: Optional[Set[PolicyType]] = None,
       fail_fast: bool = True,
+      concurrent: Optional[bool] = None,
   ) -> PolicyDecision:
     """Evaluate all applicable policies.
     
@@ -145,67 +286,183 @@ class PolicyEngine:
         context: The context for policy evaluation
         policy_types: Specific policy types to evaluate (None = all)
         fail_fast: Stop on first denial (True) or evaluate all (False)
+        concurrent: Evaluate policies of the same priority concurrently
+          (None = the engine's default)
         
     Returns:
         PolicyDecision with the final verdict and details
     """
-    evaluated_policies = []
-    blocking_policies = []
-    all_recommendations = []
+    plan_key = self._plan_key(policy_types)
+    policies_to_evaluate = self._get_plan(plan_key)
+    cache_key = self._decision_cache_key(
+        plan_key, policies_to_evaluate, context, fail_fast
+    )
+    if cache_key is not None:
+      decision = self._get_cached_decision(cache_key)
+      if decision is not None:
+        return decision
     
-    # Get policies to evaluate
-    policies_to_evaluate = []
-    if policy_types:
-      for policy_type in policy_types:
-        policies_to_evaluate.extend(
-            self.list_policies(policy_type=policy_type, enabled_only=True)
-        )
-    else:
-      policies_to_evaluate = self.list_policies(enabled_only=True)
+    decision = await self._decide(
+        policies_to_evaluate, context, fail_fast, concurrent
+    )
+    if cache_key is not None:
+      self._cache_decision(cache_key, decision)
+    return decision
+  
+  async def evaluate_many(
+      self,
+      contexts: Sequence[PolicyContext],
+      policy_types: Optional[Set[PolicyType]] = None,
+      fail_fast: bool = True,
+      concurrent: Optional[bool] = None,
+  ) -> List[PolicyDecision]:
+    """Evaluate the applicable policies for several contexts.
     
-    # Evaluate policies
-    for policy in policies_to_evaluate:
-      try:
-        result = await policy.evaluate(context)
-        evaluated_policies.append(result)
-        
-        if not result.allowed:
-          blocking_policies.append(result)
-          all_recommendations.extend(result.recommendations)
-          
-          if fail_fast:
-            logger.info(
-                f"Policy {policy.name} denied action (fail_fast=True)"
-            )
-            break
+    The plan is looked up once for all contexts. Contexts with the same
+    decision cache key, e.g. the same action and resource for the built-in
+    policies, are evaluated once and share the decision. Distinct contexts
+    are evaluated concurrently.
+    
+    Args:
+        contexts: The contexts for policy evaluation
+        policy_types: Specific policy types to evaluate (None = all)
+        fail_fast: Stop on first denial (True) or evaluate all (False)
+        concurrent: Evaluate policies of the same priority concurrently
+          (None = the engine's default)
         
-      except Exception as e:
-        logger.error(f"Error evaluating policy {policy.name}: {e}")
-        # Treat errors as denials for safety
-        error_result = PolicyResult(
-            allowed=False,
-            policy_name=policy.name,
-            policy_type=policy.policy_type,
-            reason=f"Policy evaluation error: {str(e)}",
-            recommendations=["Fix policy configuration"],
+    Returns:
+        A PolicyDecision per context, in the order of the contexts
+    """
+    plan_key = self._plan_key(policy_types)
+    policies_to_evaluate = self._get_plan(plan_key)
+    decisions: List[Optional[PolicyDecision]] = [None] * len(contexts)
+    # The cache key and context indexes of each group sharing a decision.
+    groups: List[Tuple[Optional[Hashable], List[int]]] = []
+    groups_by_key: Dict[Hashable, List[int]] = {}
+    for i, context in enumerate(contexts):
+      cache_key = self._decision_cache_key(
+          plan_key, policies_to_evaluate, context, fail_fast
+      )
+      if cache_key is None:
+        groups.append((None, [i]))
+      elif cache_key in groups_by_key:
+        groups_by_key[cache_key].append(i)
+      else:
+        decisions[i] = self._get_cached_decision(cache_key)
+        if decisions[i] is None:
+          groups_by_key[cache_key] = [i]
+          groups.append((cache_key, groups_by_key[cache_key]))
+    
+    group_decisions = await asyncio.gather(*(
+        self._decide(
+            policies_to_evaluate, contexts[indexes[0]], fail_fast, concurrent
         )
-        evaluated_policies.append(error_result)
-        blocking_policies.append(error_result)
-        
-        if fail_fast:
-          break
+        for _, indexes in groups
+    ))
+    for (cache_key, indexes), decision in zip(groups, group_decisions):
+      if cache_key is not None:
+        self._cache_decision(cache_key, decision)
+      decisions[indexes[0]] = decision
+      for i in indexes[1:]:
+        decisions[i] = decision.model_copy(deep=True)
+    return decisions
+  
+  async def evaluate_coalesced(
+      self,
+      context: PolicyContext,
+      policy_types: Optional[Set[PolicyType]] = None,
+      fail_fast: bool = True,
+  ) -> PolicyDecision:
+    """Evaluate a context in one batch with concurrent callers' contexts.
     
-    # Determine final decision
-    allowed = len(blocking_policies) == 0
+    Calls made before the event loop gets to run the batch, e.g. the
+    checks of parallel tool calls, are evaluated together with
+    `evaluate_many`.
     
-    # Deduplicate recommendations
-    unique_recommendations = list(dict.fromkeys(all_recommendations))
+    Args:
+        context: The context for policy evaluation
+        policy_types: Specific policy types to evaluate (None = all)
+        fail_fast: Stop on first denial (True) or evaluate all (False)
+        
+    Returns:
+        PolicyDecision with the final verdict and details
+    """
+    batch_key = (frozenset(policy_types) if policy_types else None, fail_fast)
+    loop = asyncio.get_running_loop()
+    batch = self._pending_batches.get(batch_key)
+    if batch is None:
+      batch = self._pending_batches[batch_key] = []
+      # Runs after the callers that are already scheduled joined the batch.
+      loop.call_soon(self._start_batch, batch_key)
+    future = loop.create_future()
+    batch.append((context, future))
+    return await future
+  
+  def _start_batch(
+      self, batch_key: Tuple[Optional[FrozenSet[PolicyType]], bool]
+  ) -> None:
+    batch = self._pending_batches.pop(batch_key)
+    policy_types, fail_fast = batch_key
+    task = asyncio.create_task(
+        self._run_batch(batch, set(policy_types or ()), fail_fast)
+    )
+    self._batch_tasks.add(task)
+    task.add_done_callback(self._batch_tasks.discard)
+  
+  async def _run_batch(
+      self,
+      batch: List[Tuple[PolicyContext, asyncio.Future]],
+      policy_types: Set[PolicyType],
+      fail_fast: bool,
+  ) -> None:
+    try:
+      decisions = await self.evaluate_many(
+          [context for context, _ in batch], policy_types, fail_fast
+      )
+    except Exception as e:
+      for _, future in batch:
+        if not future.done():
+          future.set_exception(e)
+      return
+    except BaseException:
+      # E.g. the batch task is cancelled on shutdown, so are its callers.
+      for _, future in batch:
+        future.cancel()
+      raise
+    for (_, future), decision in zip(batch, decisions):
+      if not future.done():
+        future.set_result(decision)
+  
+  async def _decide(
+      self,
+      policies_to_evaluate: Sequence[Policy],
+      context: PolicyContext,
+      fail_fast: bool,
+      concurrent: Optional[bool],
+  ) -> PolicyDecision:
+    """Evaluate the policies of a plan for a context."""
+    if concurrent is None:
+      concurrent = self.concurrent
+    if concurrent:
+      evaluated_policies = await self._evaluate_tiers(
+          policies_to_evaluate, context, fail_fast
+      )
+    else:
+      evaluated_policies = await self._evaluate_sequentially(
+          policies_to_evaluate, context, fail_fast
+      )
     
-    decision = PolicyDecision(
-        allowed=allowed,
-        evaluated_policies=evaluated_policies,
-        blocking_policies=blocking_policies,
-        recommendations=unique_recommendations,
+    blocking_policies = []
+    all_recommendations = []
+    for result in evaluated_policies:
+      if not result.allowed:
+        blocking_policies.append(result)
+        all_recommendations.extend(result.recommendations)
+    
+    decision = self._make_decision(
+        evaluated_policies,
+        blocking_policies,
+        all_recommendations,
         metadata={
             "total_policies_evaluated": len(evaluated_policies),
             "total_policies_available": len(policies_to_evaluate),
@@ -213,8 +470,8 @@ class PolicyEngine:
         },
     )
     
-    logger.info(
-        f"Policy decision: allowed={allowed}, "
+    logger.debug(
+        f"Policy decision: allowed={decision.allowed}, "
         f"evaluated={len(evaluated_policies)}, "
         f"blocked={len(blocking_policies)}"
     )
@@ -226,7 +483,7 @@ class PolicyEngine:
       context: PolicyContext,
       policy_types: Optional[Set[PolicyType]] = None,
   ) -> PolicyDecision:
-    """Evaluate policies in parallel for better performance.
+    """Evaluate all policies concurrently, without stopping on denials.
     
     Args:
         context: The context for policy evaluation
@@ -235,54 +492,107 @@ class PolicyEngine:
     Returns:
         PolicyDecision with the final verdict and details
     """
-    # Get policies to evaluate
-    policies_to_evaluate = []
-    if policy_types:
-      for policy_type in policy_types:
-        policies_to_evaluate.extend(
-            self.list_policies(policy_type=policy_type, enabled_only=True)
-        )
-    else:
-      policies_to_evaluate = self.list_policies(enabled_only=True)
-    
-    # Create evaluation tasks
-    tasks = []
-    for policy in policies_to_evaluate:
-      task = asyncio.create_task(self._evaluate_policy_safe(policy, context))
-      tasks.append((policy, task))
-    
-    # Wait for all evaluations
-    evaluated_policies = []
-    blocking_policies = []
-    all_recommendations = []
-    
-    for policy, task in tasks:
-      result = await task
-      evaluated_policies.append(result)
-      
-      if not result.allowed:
-        blocking_policies.append(result)
-        all_recommendations.extend(result.recommendations)
-    
-    # Determine final decision
-    allowed = len(blocking_policies) == 0
-    
-    # Deduplicate recommendations
-    unique_recommendations = list(dict.fromkeys(all_recommendations))
+    return await self.evaluate(
+        context, policy_types, fail_fast=False, concurrent=True
+    )
+  
+  async def _evaluate_sequentially(
+      self,
+      policies: Sequence[Policy],
+      context: PolicyContext,
+      fail_fast: bool,
+  ) -> List[PolicyResult]:
+    """Evaluate policies one after the other."""
+    results = []
+    for policy in policies:
+      result = await self._evaluate_policy_safe(policy, context)
+      results.append(result)
+      if not result.allowed and fail_fast:
+        logger.info(f"Policy {policy.name} denied action (fail_fast=True)")
+        break
+    return results
+  
+  async def _evaluate_tiers(
+      self,
+      policies: Sequence[Policy],
+      context: PolicyContext,
+      fail_fast: bool,
+  ) -> List[PolicyResult]:
+    """Evaluate each priority tier of policies concurrently."""
+    results = []
+    for _, tier in itertools.groupby(policies, key=lambda p: p.priority):
+      tier_results = await self._evaluate_tier(list(tier), context, fail_fast)
+      results.extend(tier_results)
+      if fail_fast and any(not result.allowed for result in tier_results):
+        # Lower tiers are never started.
+        break
+    return results
+  
+  async def _evaluate_tier(
+      self,
+      policies: List[Policy],
+      context: PolicyContext,
+      fail_fast: bool,
+  ) -> List[PolicyResult]:
+    """Evaluate the policies of one tier concurrently.
     
-    decision = PolicyDecision(
-        allowed=allowed,
+    With fail_fast, a denial cancels the policies after it in the tier,
+    while the ones before it still run, so that the results match a
+    sequential evaluation.
+    """
+    if len(policies) == 1:
+      return [await self._evaluate_policy_safe(policies[0], context)]
+    
+    tasks = [
+        asyncio.create_task(self._evaluate_policy_safe(policy, context))
+        for policy in policies
+    ]
+    indexes = {task: i for i, task in enumerate(tasks)}
+    # Index of the first denial in priority order.
+    first_denial = len(tasks)
+    try:
+      pending = set(tasks)
+      while pending:
+        done, pending = await asyncio.wait(
+            pending, return_when=asyncio.FIRST_COMPLETED
+        )
+        if not fail_fast:
+          continue
+        for task in done:
+          if not task.result().allowed:
+            first_denial = min(first_denial, indexes[task])
+        for task in list(pending):
+          if indexes[task] > first_denial:
+            task.cancel()
+            pending.discard(task)
+    finally:
+      for task in tasks:
+        task.cancel()
+    
+    if first_denial < len(tasks):
+      logger.info(
+          f"Policy {policies[first_denial].name} denied action"
+          " (fail_fast=True)"
+      )
+    return [task.result() for task in tasks[: first_denial + 1]]
+  
+  def _make_decision(
+      self,
+      evaluated_policies: List[PolicyResult],
+      blocking_policies: List[PolicyResult],
+      all_recommendations: List[str],
+      metadata: Dict[str, Any],
+  ) -> PolicyDecision:
+    """Combine policy results into the final decision."""
+    return PolicyDecision(
+        # Determine final decision
+        allowed=len(blocking_policies) == 0,
         evaluated_policies=evaluated_policies,
         blocking_policies=blocking_policies,
-        recommendations=unique_recommendations,
-        metadata={
-            "total_policies_evaluated": len(evaluated_policies),
-            "total_policies_available": len(policies_to_evaluate),
-            "parallel_evaluation": True,
-        },
+        # Deduplicate recommendations
+        recommendations=list(dict.fromkeys(all_recommendations)),
+        metadata=metadata,
     )
-    
-    return decision
   
   async def _evaluate_policy_safe(
       self, policy: Policy, context: PolicyContext
@@ -297,13 +607,31 @@ class PolicyEngine:
         PolicyResult (error result if evaluation fails)
     """
     try:
-      return await policy.evaluate(context)
+      return await asyncio.wait_for(
+          policy.evaluate(context), timeout=self.policy_timeout
+      )
+    except asyncio.TimeoutError:
+      logger.error(
+          f"Policy {policy.name} timed out after {self.policy_timeout}s"
+      )
+      return PolicyResult(
+          allowed=False,
+          policy_name=policy.name,
+          policy_type=policy.policy_type,
+          reason=(
+              f"Policy evaluation timed out after {self.policy_timeout}s"
+          ),
+          metadata={"evaluation_error": True},
+          recommendations=["Retry the action later"],
+      )
     except Exception as e:
       logger.error(f"Error evaluating policy {policy.name}: {e}")
+      # Treat errors as denials for safety
       return PolicyResult(
           allowed=False,
           policy_name=policy.name,
           policy_type=policy.policy_type,
           reason=f"Policy evaluation error: {str(e)}",
+          metadata={"evaluation_error": True},
           recommendations=["Fix policy configuration"],
-      )
\ No newline at end of file
+      )
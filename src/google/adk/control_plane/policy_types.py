@@ -17,9 +17,22 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Hashable, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+from ._glob_patterns import GlobPatternSet
+
+
+def _freeze(value: Any) -> Any:
+  """Convert nested containers to hashable equivalents."""
+  if isinstance(value, dict):
+    return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+  if isinstance(value, (list, tuple)):
+    return tuple(_freeze(v) for v in value)
+  if isinstance(value, set):
+    return frozenset(_freeze(v) for v in value)
+  return value
 
 
 class PolicyType(str, Enum):
@@ -77,6 +90,13 @@ class Policy(ABC, BaseModel):
   description: Optional[str] = Field(
       default=None, description="Policy description"
   )
+  pure: bool = Field(
+      default=False,
+      description=(
+          "Whether the result only depends on the context fields in"
+          " cache_key, so decisions involving it can be cached"
+      ),
+  )
   
   @abstractmethod
   async def evaluate(self, context: PolicyContext) -> PolicyResult:
@@ -90,6 +110,29 @@ class Policy(ABC, BaseModel):
     """
     pass
   
+  def cache_key(self, context: PolicyContext) -> Optional[Hashable]:
+    """Get the key of the context fields this policy's result depends on.
+    
+    Subclasses narrow this down to the fields they read, which lets
+    contexts differing in other fields share cached decisions.
+    
+    Args:
+        context: The context for policy evaluation
+        
+    Returns:
+        The key, or None if the result can't be cached
+    """
+    if not self.pure:
+      return None
+    return (
+        context.agent_name,
+        context.user_id,
+        context.session_id,
+        context.action,
+        context.resource,
+        _freeze(context.metadata),
+    )
+  
   class Config:
     arbitrary_types_allowed = True
 
@@ -98,6 +141,7 @@ class ResourcePolicy(Policy):
   """Policy for controlling access to resources."""
   
   policy_type: PolicyType = Field(default=PolicyType.RESOURCE)
+  pure: bool = Field(default=True)
   allowed_resources: List[str] = Field(
       default_factory=list, description="List of allowed resource patterns"
   )
@@ -108,6 +152,20 @@ class ResourcePolicy(Policy):
       default=None, description="Maximum resources per session"
   )
   
+  # Compiled from the resource patterns, since matching them one by one
+  # dominates the cost of a check with many patterns. Patterns changed in
+  # place rather than by assignment require calling `_compile_patterns`.
+  _allowed_patterns: GlobPatternSet = PrivateAttr()
+  _denied_patterns: GlobPatternSet = PrivateAttr()
+  
+  def model_post_init(self, __context: Any) -> None:
+    self._compile_patterns()
+  
+  def __setattr__(self, name: str, value: Any) -> None:
+    super().__setattr__(name, value)
+    if name in ("allowed_resources", "denied_resources"):
+      self._compile_patterns()
+  
   async def evaluate(self, context: PolicyContext) -> PolicyResult:
     """Evaluate resource access policy."""
     if not context.resource:
@@ -119,29 +177,29 @@ class ResourcePolicy(Policy):
       )
     
     # Check denied resources first
-    for pattern in self.denied_resources:
-      if self._matches_pattern(context.resource, pattern):
+    pattern = self._denied_patterns.match(context.resource)
+    if pattern is not None:
+      return PolicyResult(
+          allowed=False,
+          policy_name=self.name,
+          policy_type=self.policy_type,
+          reason=f"Resource {context.resource} matches denied pattern {pattern}",
+          recommendations=[
+              "Request access to a different resource",
+              "Contact administrator for exceptions",
+          ],
+      )
+    
+    # Check allowed resources
+    if self.allowed_resources:
+      pattern = self._allowed_patterns.match(context.resource)
+      if pattern is not None:
         return PolicyResult(
-            allowed=False,
+            allowed=True,
             policy_name=self.name,
             policy_type=self.policy_type,
-            reason=f"Resource {context.resource} matches denied pattern {pattern}",
-            recommendations=[
-                "Request access to a different resource",
-                "Contact administrator for exceptions",
-            ],
+            reason=f"Resource {context.resource} matches allowed pattern {pattern}",
         )
-    
-    # Check allowed resources
-    if self.allowed_resources:
-      for pattern in self.allowed_resources:
-        if self._matches_pattern(context.resource, pattern):
-          return PolicyResult(
-              allowed=True,
-              policy_name=self.name,
-              policy_type=self.policy_type,
-              reason=f"Resource {context.resource} matches allowed pattern {pattern}",
-          )
       
       # If allowed list exists but no match, deny
       return PolicyResult(
@@ -160,16 +218,21 @@ class ResourcePolicy(Policy):
         reason="No resource restrictions configured",
     )
   
-  def _matches_pattern(self, resource: str, pattern: str) -> bool:
-    """Check if resource matches pattern (supports wildcards)."""
-    import fnmatch
-    return fnmatch.fnmatch(resource, pattern)
+  def cache_key(self, context: PolicyContext) -> Optional[Hashable]:
+    if not self.pure:
+      return None
+    return context.resource
+  
+  def _compile_patterns(self) -> None:
+    self._allowed_patterns = GlobPatternSet(self.allowed_resources)
+    self._denied_patterns = GlobPatternSet(self.denied_resources)
 
 
 class SecurityPolicy(Policy):
   """Policy for security controls."""
   
   policy_type: PolicyType = Field(default=PolicyType.SECURITY)
+  pure: bool = Field(default=True)
   require_authentication: bool = Field(
       default=True, description="Require user authentication"
   )
@@ -233,12 +296,22 @@ class SecurityPolicy(Policy):
         policy_type=self.policy_type,
         reason="Security checks passed",
     )
+  
+  def cache_key(self, context: PolicyContext) -> Optional[Hashable]:
+    if not self.pure:
+      return None
+    return (
+        context.action,
+        bool(context.metadata.get("authenticated")),
+        bool(context.metadata.get("encrypted")),
+    )
 
 
 class CompliancePolicy(Policy):
   """Policy for regulatory compliance."""
   
   policy_type: PolicyType = Field(default=PolicyType.COMPLIANCE)
+  pure: bool = Field(default=True)
   data_retention_days: Optional[int] = Field(
       default=None, description="Data retention period in days"
   )
@@ -301,4 +374,19 @@ class CompliancePolicy(Policy):
             "data_retention_days": self.data_retention_days,
             "audit_enabled": self.require_audit_trail,
         },
-    )
\ No newline at end of file
+    )
+  
+  def cache_key(self, context: PolicyContext) -> Optional[Hashable]:
+    if not self.pure:
+      return None
+    metadata = context.metadata
+    return (
+        bool(metadata.get("audit_enabled")),
+        _freeze(metadata.get("region", "unknown")),
+        bool(metadata.get("contains_pii")),
+        _freeze(metadata.get("pii_type", "unknown")),
+        tuple(
+            bool(metadata.get(requirement))
+            for requirement in sorted(set(self.pii_handling.values()))
+        ),
+    )
@@ -17,6 +17,7 @@ from __future__ import annotations
 from .base_event_bus import BaseEventBus, EventMessage, EventSubscription
 from .kafka_event_bus import KafkaEventBus
 from .in_memory_event_bus import InMemoryEventBus
+from .log_event_bus import LocalLogEventBus
 from .event_bus_agent import EventBusAgent
 
 __all__ = [
@@ -25,5 +26,6 @@ __all__ = [
     "EventSubscription",
     "KafkaEventBus",
     "InMemoryEventBus",
+    "LocalLogEventBus",
     "EventBusAgent",
 ]
\ No newline at end of file
@@ -0,0 +1,181 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Union
+
+from .base_event_bus import EventMessage
+
+# Compact index lists once this many leading entries were evicted.
+_MIN_COMPACTION = 64
+
+
+class _SequenceIndex:
+  """Ascending sequence numbers of the events with one field value.
+
+  Works like a deque that also supports O(1) random access, which bisect
+  needs. Evicted sequence numbers are dropped lazily from the front.
+  """
+
+  __slots__ = ("seqs", "start")
+
+  def __init__(self):
+    self.seqs: List[int] = []
+    self.start = 0
+
+  def __len__(self) -> int:
+    return len(self.seqs) - self.start
+
+  def append(self, seq: int):
+    self.seqs.append(seq)
+
+  def popleft(self):
+    self.start += 1
+    if self.start >= _MIN_COMPACTION and self.start * 2 >= len(self.seqs):
+      del self.seqs[: self.start]
+      self.start = 0
+
+
+class EventHistory:
+  """Fixed-capacity ring buffer of published events.
+
+  Events get consecutive sequence numbers and live at `seq % capacity` until
+  overwritten. Each topic, source and event type has an index of the
+  sequence numbers of its events, so filtered queries only visit the
+  candidates of the most selective filter. Since the bus timestamps events
+  when they are published, every index is also ordered by time and time
+  ranges are found with a binary search.
+  """
+
+  def __init__(self, capacity: int):
+    if capacity < 1:
+      raise ValueError("History capacity must be at least 1.")
+    self.capacity = capacity
+    self._events: List[Optional[EventMessage]] = [None] * capacity
+    self._next_seq = 0
+    self._by_topic: Dict[str, _SequenceIndex] = {}
+    self._by_source: Dict[str, _SequenceIndex] = {}
+    self._by_event_type: Dict[str, _SequenceIndex] = {}
+
+  def __len__(self) -> int:
+    return min(self._next_seq, self.capacity)
+
+  def append(self, event: EventMessage):
+    """Add an event, evicting the oldest one if the buffer is full."""
+    slot = self._next_seq % self.capacity
+    evicted = self._events[slot]
+    if evicted is not None:
+      # The evicted event is the oldest one, i.e. first in its indexes.
+      self._evict(self._by_topic, evicted.topic)
+      self._evict(self._by_source, evicted.source)
+      self._evict(self._by_event_type, evicted.event_type)
+
+    self._events[slot] = event
+    for indexes, key in (
+        (self._by_topic, event.topic),
+        (self._by_source, event.source),
+        (self._by_event_type, event.event_type),
+    ):
+      index = indexes.get(key)
+      if index is None:
+        index = indexes[key] = _SequenceIndex()
+      index.append(self._next_seq)
+    self._next_seq += 1
+
+  def clear(self):
+    """Remove all events."""
+    self._events = [None] * self.capacity
+    self._next_seq = 0
+    self._by_topic.clear()
+    self._by_source.clear()
+    self._by_event_type.clear()
+
+  def query(
+      self,
+      topic: Optional[str] = None,
+      event_type: Optional[str] = None,
+      source: Optional[str] = None,
+      correlation_id: Optional[str] = None,
+      start_time: Optional[datetime] = None,
+      end_time: Optional[datetime] = None,
+      limit: Optional[int] = None,
+  ) -> List[EventMessage]:
+    """Get the matching events, newest first.
+
+    Filters that are not set (or empty) match every event.
+    """
+    events: List[EventMessage] = []
+    candidates: Union[range, List[int]] = range(
+        self._next_seq - len(self), self._next_seq
+    )
+    lo, hi = 0, len(candidates)
+    for indexes, key in (
+        (self._by_topic, topic),
+        (self._by_source, source),
+        (self._by_event_type, event_type),
+    ):
+      if not key:
+        continue
+      index = indexes.get(key)
+      if index is None:
+        return events
+      if len(index) < hi - lo:
+        candidates, lo, hi = index.seqs, index.start, len(index.seqs)
+
+    if start_time:
+      lo = self._bisect(candidates, lo, hi, start_time, right=False)
+    if end_time:
+      hi = self._bisect(candidates, lo, hi, end_time, right=True)
+
+    for i in range(hi - 1, lo - 1, -1):
+      if limit is not None and len(events) >= limit:
+        break
+      event = self._events[candidates[i] % self.capacity]
+      if topic and event.topic != topic:
+        continue
+      if event_type and event.event_type != event_type:
+        continue
+      if source and event.source != source:
+        continue
+      if correlation_id and event.correlation_id != correlation_id:
+        continue
+      events.append(event)
+    return events
+
+  def _bisect(
+      self,
+      seqs: Sequence[int],
+      lo: int,
+      hi: int,
+      timestamp: datetime,
+      right: bool,
+  ) -> int:
+    """Find the insertion point of the timestamp in `seqs[lo:hi]`."""
+    while lo < hi:
+      mid = (lo + hi) // 2
+      mid_timestamp = self._events[seqs[mid] % self.capacity].timestamp
+      if mid_timestamp < timestamp or (right and mid_timestamp == timestamp):
+        lo = mid + 1
+      else:
+        hi = mid
+    return lo
+
+  @staticmethod
+  def _evict(indexes: Dict[str, _SequenceIndex], key: str):
+    index = indexes[key]
+    index.popleft()
+    if not index:
+      del indexes[key]
@@ -0,0 +1,113 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+from .base_event_bus import EventMessage, EventSubscription
+
+logger = logging.getLogger(__name__)
+
+# Waiters are indexed by the topic and correlation ID they wait for.
+_WaiterKey = Tuple[str, Optional[str]]
+
+
+class EventWaiters:
+  """Futures of `wait_for_event` calls waiting for a published event."""
+
+  def __init__(self):
+    # Maps each waiter's future to its event type filter.
+    self._waiters: Dict[
+        _WaiterKey, Dict[asyncio.Future, Optional[str]]
+    ] = {}
+
+  def __len__(self) -> int:
+    return sum(len(waiters) for waiters in self._waiters.values())
+
+  async def wait(
+      self,
+      topic: str,
+      event_type: Optional[str] = None,
+      correlation_id: Optional[str] = None,
+      timeout: Optional[float] = None,
+  ) -> Optional[EventMessage]:
+    """Wait for the next matching event, or None after the timeout."""
+    future = asyncio.get_running_loop().create_future()
+    key = (topic, correlation_id)
+    waiters = self._waiters.setdefault(key, {})
+    waiters[future] = event_type
+
+    try:
+      return await asyncio.wait_for(future, timeout=timeout)
+    except asyncio.TimeoutError:
+      return None
+    finally:
+      waiters.pop(future, None)
+      if not waiters and self._waiters.get(key) is waiters:
+        del self._waiters[key]
+
+  def resolve(self, event: EventMessage):
+    """Resolve the waiters matching this event."""
+    keys = [(event.topic, None)]
+    if event.correlation_id:
+      keys.append((event.topic, event.correlation_id))
+
+    for key in keys:
+      waiters = self._waiters.get(key)
+      if not waiters:
+        continue
+      for future, event_type in list(waiters.items()):
+        if future.done():
+          del waiters[future]
+        elif not event_type or event.event_type == event_type:
+          future.set_result(event)
+          del waiters[future]
+      if not waiters:
+        del self._waiters[key]
+
+  def clear(self):
+    self._waiters.clear()
+
+
+def matches_filters(
+    subscription: EventSubscription, event: EventMessage
+) -> bool:
+  """Whether an event passes the event type and priority filters."""
+  if (
+      subscription.event_types
+      and event.event_type not in subscription.event_types
+  ):
+    return False
+  if (
+      subscription.priority_filter
+      and event.priority not in subscription.priority_filter
+  ):
+    return False
+  return True
+
+
+async def call_handler(
+    subscription: EventSubscription, event: EventMessage
+):
+  """Call the handler of a subscription, logging its errors."""
+  try:
+    if asyncio.iscoroutinefunction(subscription.handler):
+      await subscription.handler(event)
+    else:
+      subscription.handler(event)
+  except Exception as e:
+    logger.error(f"Error in handler for {subscription.subscriber_id}: {e}")
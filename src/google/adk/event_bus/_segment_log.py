@@ -0,0 +1,292 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from array import array
+import bisect
+import json
+import logging
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, List, Optional, Tuple
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# Record header: payload length, CRC32 of the payload, append time.
+_HEADER = struct.Struct("<IId")
+_SEGMENT_SUFFIX = ".log"
+
+
+class _Segment:
+  """Append-only, memory-mapped file holding consecutive records of a log.
+
+  The active segment is preallocated to its capacity and written through the
+  memory map. A zero length marks the end of its records, and records torn
+  by a crash fail their CRC and are truncated away when the segment is
+  opened again. Sealed segments are trimmed to their records and mapped
+  read-only.
+  """
+
+  def __init__(self, path: str, base_offset: int, capacity: int = 0):
+    self.path = path
+    self.base_offset = base_offset
+    self.positions = array("Q")
+    """Position of each record in the file, by offset - base_offset."""
+    self.size = 0
+    self.last_append_time = 0.0
+
+    if not os.path.exists(path):
+      open(path, "wb").close()
+    self._file = open(path, "r+b")
+    file_size = os.fstat(self._file.fileno()).st_size
+    self.writable = capacity > 0
+    self._capacity = max(capacity, file_size)
+    if self._capacity > file_size:
+      self._file.truncate(self._capacity)
+    self._mmap = mmap.mmap(
+        self._file.fileno(),
+        self._capacity,
+        access=mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ,
+    )
+    self._recover()
+
+  def __len__(self) -> int:
+    return len(self.positions)
+
+  def _recover(self):
+    """Index the valid records, dropping a record torn by a crash."""
+    position = 0
+    while position + _HEADER.size <= self._capacity:
+      length, crc, append_time = _HEADER.unpack_from(self._mmap, position)
+      end = position + _HEADER.size + length
+      if length == 0:
+        break
+      if (
+          end > self._capacity
+          or zlib.crc32(self._mmap[position + _HEADER.size : end]) != crc
+      ):
+        logger.warning(
+            f"Truncating torn record at {position} of segment {self.path}"
+        )
+        if self.writable:
+          torn_end = min(end, self._capacity)
+          self._mmap[position:torn_end] = bytes(torn_end - position)
+        break
+      self.positions.append(position)
+      self.last_append_time = append_time
+      position = end
+    self.size = position
+
+  def has_room(self, payload_size: int) -> bool:
+    return self.size + _HEADER.size + payload_size <= self._capacity
+
+  def append(self, payload: bytes, append_time: float):
+    position = self.size
+    start = position + _HEADER.size
+    # The payload goes first, the header makes the record visible.
+    self._mmap[start : start + len(payload)] = payload
+    _HEADER.pack_into(
+        self._mmap, position, len(payload), zlib.crc32(payload), append_time
+    )
+    self.positions.append(position)
+    self.size = start + len(payload)
+    self.last_append_time = append_time
+
+  def read(self, index: int) -> bytes:
+    position = self.positions[index]
+    length = _HEADER.unpack_from(self._mmap, position)[0]
+    start = position + _HEADER.size
+    return self._mmap[start : start + length]
+
+  def flush(self):
+    if self.writable:
+      self._mmap.flush()
+
+  def seal(self):
+    """Trim the segment to its records and make it read-only."""
+    self.close()
+    self._file = open(self.path, "r+b")
+    self.writable = False
+    self._capacity = self.size
+    self._mmap = mmap.mmap(
+        self._file.fileno(), self._capacity, access=mmap.ACCESS_READ
+    )
+
+  def close(self):
+    self.flush()
+    self._mmap.close()
+    if self.writable:
+      self._file.truncate(self.size)
+    self._file.close()
+
+  def delete(self):
+    self.close()
+    os.remove(self.path)
+
+
+class TopicLog:
+  """Log of one topic, split into segment files named by their base offset."""
+
+  def __init__(self, directory: str, segment_bytes: int):
+    self.directory = directory
+    self.segment_bytes = segment_bytes
+    os.makedirs(directory, exist_ok=True)
+
+    base_offsets = sorted(
+        int(name[: -len(_SEGMENT_SUFFIX)])
+        for name in os.listdir(directory)
+        if name.endswith(_SEGMENT_SUFFIX)
+    )
+    self._segments: List[_Segment] = []
+    for i, base_offset in enumerate(base_offsets):
+      is_active = i == len(base_offsets) - 1
+      path = self._segment_path(base_offset)
+      if not is_active and os.path.getsize(path) == 0:
+        os.remove(path)
+        continue
+      self._segments.append(
+          _Segment(path, base_offset, segment_bytes if is_active else 0)
+      )
+    if not self._segments:
+      self._segments.append(
+          _Segment(self._segment_path(0), 0, segment_bytes)
+      )
+    self._base_offsets = [s.base_offset for s in self._segments]
+
+  @property
+  def start_offset(self) -> int:
+    """The offset of the oldest retained record."""
+    return self._segments[0].base_offset
+
+  @property
+  def end_offset(self) -> int:
+    """The offset the next record will get."""
+    active = self._segments[-1]
+    return active.base_offset + len(active)
+
+  @property
+  def num_segments(self) -> int:
+    return len(self._segments)
+
+  @property
+  def size_bytes(self) -> int:
+    return sum(segment.size for segment in self._segments)
+
+  def _segment_path(self, base_offset: int) -> str:
+    return os.path.join(
+        self.directory, f"{base_offset:020d}{_SEGMENT_SUFFIX}"
+    )
+
+  def append(self, payload: bytes, append_time: float) -> int:
+    """Append a record, returning its offset."""
+    active = self._segments[-1]
+    if not active.has_room(len(payload)):
+      offset = self.end_offset
+      capacity = max(self.segment_bytes, _HEADER.size + len(payload))
+      if len(active):
+        active.seal()
+      else:
+        # Too small for the record even when empty.
+        active.delete()
+        self._segments.pop()
+        self._base_offsets.pop()
+      active = _Segment(self._segment_path(offset), offset, capacity)
+      self._segments.append(active)
+      self._base_offsets.append(offset)
+
+    offset = self.end_offset
+    active.append(payload, append_time)
+    return offset
+
+  def read(
+      self, offset: int, max_records: int
+  ) -> List[Tuple[int, bytes]]:
+    """Read up to `max_records` records from the offset on."""
+    offset = max(offset, self.start_offset)
+    records = []
+    index = bisect.bisect_right(self._base_offsets, offset) - 1
+    while index < len(self._segments) and len(records) < max_records:
+      segment = self._segments[index]
+      for i in range(offset - segment.base_offset, len(segment)):
+        if len(records) >= max_records:
+          break
+        records.append((segment.base_offset + i, segment.read(i)))
+      offset = segment.base_offset + len(segment)
+      index += 1
+    return records
+
+  def read_reversed(self) -> Iterator[Tuple[int, bytes]]:
+    """Iterate over the records, newest first."""
+    for segment in reversed(self._segments):
+      for i in range(len(segment) - 1, -1, -1):
+        yield segment.base_offset + i, segment.read(i)
+
+  def enforce_retention(
+      self,
+      retention_bytes: Optional[int],
+      retention_seconds: Optional[float],
+      now: float,
+  ):
+    """Delete the oldest sealed segments exceeding the retention limits."""
+    size_bytes = self.size_bytes
+    while len(self._segments) > 1:
+      oldest = self._segments[0]
+      too_big = retention_bytes is not None and size_bytes > retention_bytes
+      too_old = (
+          retention_seconds is not None
+          and oldest.last_append_time < now - retention_seconds
+      )
+      if not too_big and not too_old:
+        break
+      size_bytes -= oldest.size
+      oldest.delete()
+      self._segments.pop(0)
+      self._base_offsets.pop(0)
+
+  def flush(self):
+    self._segments[-1].flush()
+
+  def close(self):
+    for segment in self._segments:
+      segment.close()
+
+
+class OffsetStore:
+  """Committed offsets of consumer groups, persisted in a JSON file."""
+
+  def __init__(self, path: str):
+    self.path = path
+    self._offsets: Dict[str, Dict[str, int]] = {}
+    if os.path.exists(path):
+      with open(path, "r", encoding="utf-8") as f:
+        self._offsets = json.load(f)
+
+  def get(self, group_id: str, topic: str) -> Optional[int]:
+    return self._offsets.get(group_id, {}).get(topic)
+
+  def items(self) -> Iterator[Tuple[str, str, int]]:
+    for group_id, offsets in self._offsets.items():
+      for topic, offset in offsets.items():
+        yield group_id, topic, offset
+
+  def commit(self, group_id: str, topic: str, offset: int):
+    """Store the offset of the next record the group will consume."""
+    self._offsets.setdefault(group_id, {})[topic] = offset
+    tmp_path = self.path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+      json.dump(self._offsets, f)
+    os.replace(tmp_path, self.path)
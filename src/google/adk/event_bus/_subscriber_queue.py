@@ -0,0 +1,114 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import time
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .base_event_bus import EventMessage, EventPriority, OverflowPolicy
+
+# Queues hand out events in this order of priority.
+_PRIORITY_RANKS = {
+    EventPriority.CRITICAL: 0,
+    EventPriority.HIGH: 1,
+    EventPriority.NORMAL: 2,
+    EventPriority.LOW: 3,
+}
+
+# A queued event with the time it was enqueued.
+_QueueItem = Tuple[float, EventMessage]
+
+
+class _PriorityDeques:
+  """One FIFO per priority, sized like a single container."""
+
+  __slots__ = ("deques",)
+
+  def __init__(self):
+    self.deques: List[Deque[_QueueItem]] = [
+        deque() for _ in _PRIORITY_RANKS
+    ]
+
+  def __len__(self) -> int:
+    return sum(len(d) for d in self.deques)
+
+
+class SubscriberQueue(asyncio.Queue):
+  """Bounded queue of the events of one subscriber.
+
+  Hands out higher priority events first and events of the same priority in
+  publish order. Also keeps the delivery metrics of the subscriber.
+  """
+
+  def __init__(self, maxsize: int):
+    super().__init__(maxsize)
+    self.delivered = 0
+    self.dropped = 0
+    self.total_lag = 0.0
+    self.max_lag = 0.0
+    self.worker: Optional[asyncio.Task] = None
+
+  # The hooks below replace the FIFO storage of asyncio.Queue, like
+  # asyncio.PriorityQueue does.
+  def _init(self, maxsize: int):
+    self._queue = _PriorityDeques()
+
+  def _put(self, item: _QueueItem):
+    self._queue.deques[_PRIORITY_RANKS[item[1].priority]].append(item)
+
+  def _get(self) -> _QueueItem:
+    for items in self._queue.deques:
+      if items:
+        return items.popleft()
+    raise asyncio.QueueEmpty
+
+  async def put_event(
+      self, event: EventMessage, overflow_policy: OverflowPolicy
+  ):
+    """Queue an event, applying the overflow policy if the queue is full."""
+    item = (time.time(), event)
+    if not self.full() or overflow_policy == OverflowPolicy.BLOCK:
+      await self.put(item)
+      return
+
+    self.dropped += 1
+    if overflow_policy == OverflowPolicy.DROP_NEWEST:
+      return
+    for items in reversed(self._queue.deques):
+      if items:
+        items.popleft()
+        # Keeps join() consistent, the event will never be processed.
+        self.task_done()
+        break
+    self.put_nowait(item)
+
+  def record_delivery(self, enqueue_time: float):
+    lag = max(time.time() - enqueue_time, 0.0)
+    self.delivered += 1
+    self.total_lag += lag
+    self.max_lag = max(self.max_lag, lag)
+
+  def get_metrics(self) -> Dict[str, Any]:
+    return {
+        "queued_events": self.qsize(),
+        "delivered_events": self.delivered,
+        "dropped_events": self.dropped,
+        "average_lag": (
+            self.total_lag / self.delivered if self.delivered else 0.0
+        ),
+        "max_lag": self.max_lag,
+    }
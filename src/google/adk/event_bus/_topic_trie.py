@@ -0,0 +1,102 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from typing import Dict, List, Set
+
+TOPIC_SEPARATOR = "."
+SINGLE_LEVEL_WILDCARD = "*"
+MULTI_LEVEL_WILDCARD = "#"
+
+
+class _TrieNode:
+  __slots__ = ("children", "values")
+
+  def __init__(self):
+    self.children: Dict[str, _TrieNode] = {}
+    self.values: Set[str] = set()
+
+
+class TopicTrie:
+  """Index from hierarchical topic patterns to the values subscribed to them.
+
+  Topics are dot separated, e.g. `pillar.finance.invoices`. In a pattern,
+  `*` matches exactly one segment and `#` matches zero or more segments, so
+  `pillar.finance.*` matches `pillar.finance.invoices` and `alerts.#` matches
+  `alerts` as well as `alerts.security.critical`. Matching a topic costs
+  O(segments) for patterns without `#`, independent of the number of patterns.
+  """
+
+  def __init__(self):
+    self._root = _TrieNode()
+
+  def add(self, pattern: str, value: str):
+    """Add a value under the pattern."""
+    node = self._root
+    for segment in pattern.split(TOPIC_SEPARATOR):
+      child = node.children.get(segment)
+      if child is None:
+        child = node.children[segment] = _TrieNode()
+      node = child
+    node.values.add(value)
+
+  def remove(self, pattern: str, value: str):
+    """Remove a value from the pattern, pruning nodes left empty."""
+    path: List[tuple[_TrieNode, str]] = []
+    node = self._root
+    for segment in pattern.split(TOPIC_SEPARATOR):
+      child = node.children.get(segment)
+      if child is None:
+        return
+      path.append((node, segment))
+      node = child
+    node.values.discard(value)
+
+    for parent, segment in reversed(path):
+      child = parent.children[segment]
+      if child.values or child.children:
+        break
+      del parent.children[segment]
+
+  def match(self, topic: str) -> Set[str]:
+    """Get the values of all patterns matching the topic."""
+    result: Set[str] = set()
+    self._match(self._root, topic.split(TOPIC_SEPARATOR), 0, result)
+    return result
+
+  def _match(
+      self,
+      node: _TrieNode,
+      segments: List[str],
+      index: int,
+      result: Set[str],
+  ):
+    multi_level = node.children.get(MULTI_LEVEL_WILDCARD)
+    if multi_level is not None:
+      # `#` swallows any number of the remaining segments.
+      for next_index in range(index, len(segments) + 1):
+        self._match(multi_level, segments, next_index, result)
+
+    if index == len(segments):
+      result.update(node.values)
+      return
+
+    exact = node.children.get(segments[index])
+    if exact is not None:
+      self._match(exact, segments, index + 1, result)
+
+    single_level = node.children.get(SINGLE_LEVEL_WILDCARD)
+    if single_level is not None:
+      self._match(single_level, segments, index + 1, result)
@@ -32,6 +32,17 @@ class EventPriority(str, Enum):
   CRITICAL = "critical"
 
 
+class OverflowPolicy(str, Enum):
+  """What a bounded subscriber queue does with an event when it is full."""
+  
+  BLOCK = "block"
+  """Wait in publish until the subscriber made room."""
+  DROP_OLDEST = "drop_oldest"
+  """Drop the oldest queued event of the lowest queued priority."""
+  DROP_NEWEST = "drop_newest"
+  """Drop the event being published."""
+
+
 class EventMessage(BaseModel):
   """Message sent through the event bus."""
   
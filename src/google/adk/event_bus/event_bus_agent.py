@@ -25,7 +25,6 @@ from pydantic import Field
 from ..agents.invocation_context import InvocationContext
 from ..agents.llm_agent import LlmAgent
 from ..events.event import Event
-from ..models import types
 from ..tools.function_tool import FunctionTool
 from .base_event_bus import BaseEventBus, EventMessage, EventPriority
 
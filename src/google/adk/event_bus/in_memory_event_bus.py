@@ -20,30 +20,60 @@ from collections import defaultdict
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional, Set
 
+from ._event_history import EventHistory
+from ._event_waiters import call_handler, EventWaiters, matches_filters
+from ._subscriber_queue import SubscriberQueue
+from ._topic_trie import TopicTrie
 from .base_event_bus import (
     BaseEventBus,
     EventMessage,
     EventPriority,
     EventSubscription,
+    OverflowPolicy,
 )
 
 logger = logging.getLogger(__name__)
 
 
 class InMemoryEventBus(BaseEventBus):
-  """In-memory event bus implementation for development and testing."""
+  """In-memory event bus implementation for development and testing.
+
+  Subscriptions may use hierarchical topic patterns: `*` matches one
+  dot-separated segment and `#` matches any number of segments, e.g.
+  `pillar.finance.*` or `alerts.#`.
+
+  By default `publish` calls the handlers of the subscribers one after the
+  other before it returns. With a `queue_size`, every subscription gets a
+  bounded queue and a worker task instead, so a slow handler only delays its
+  own subscriber. Queued events are delivered by priority, then in publish
+  order, and `overflow_policy` decides what happens when a queue is full.
+  """
   
-  def __init__(self, max_history: int = 1000):
+  def __init__(
+      self,
+      max_history: int = 1000,
+      queue_size: Optional[int] = None,
+      overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+  ):
     """Initialize in-memory event bus.
     
     Args:
         max_history: Maximum number of events to keep in history
+        queue_size: Capacity of each subscriber queue, or None to deliver
+          events inline in publish
+        overflow_policy: What to do with an event for a full queue
     """
+    if queue_size is not None and queue_size < 1:
+      raise ValueError("queue_size must be at least 1.")
     self.max_history = max_history
-    self._event_history: List[EventMessage] = []
+    self.queue_size = queue_size
+    self.overflow_policy = overflow_policy
+    self._event_history = EventHistory(max_history)
     self._subscriptions: Dict[str, EventSubscription] = {}
     self._topic_subscriptions: Dict[str, Set[str]] = defaultdict(set)
-    self._waiting_futures: List[tuple] = []  # (future, filters)
+    self._topic_trie = TopicTrie()
+    self._subscriber_queues: Dict[str, SubscriberQueue] = {}
+    self._waiters = EventWaiters()
   
   async def publish(
       self,
@@ -66,18 +96,14 @@ class InMemoryEventBus(BaseEventBus):
         reply_to=reply_to,
     )
     
-    # Add to history
+    # Add to history, evicting the oldest event if full
     self._event_history.append(event)
     
-    # Trim history if needed
-    if len(self._event_history) > self.max_history:
-      self._event_history = self._event_history[-self.max_history :]
-    
     # Notify subscribers
     await self._notify_subscribers(event)
     
-    # Check waiting futures
-    await self._check_waiting_futures(event)
+    # Resolve waiting futures
+    self._waiters.resolve(event)
     
     logger.debug(f"Published event: {event.event_type} to {topic}")
     
@@ -106,6 +132,12 @@ class InMemoryEventBus(BaseEventBus):
     # Update topic index
     for topic in topics:
       self._topic_subscriptions[topic].add(subscription.id)
+      self._topic_trie.add(topic, subscription.id)
+    
+    if self.queue_size is not None:
+      queue = SubscriberQueue(self.queue_size)
+      queue.worker = asyncio.create_task(self._deliver(subscription, queue))
+      self._subscriber_queues[subscription.id] = queue
     
     logger.debug(
         f"Subscriber {subscriber_id} subscribed to: {', '.join(topics)}"
@@ -123,11 +155,15 @@ class InMemoryEventBus(BaseEventBus):
     # Remove from topic index
     for topic in subscription.topics:
       self._topic_subscriptions[topic].discard(subscription_id)
+      self._topic_trie.remove(topic, subscription_id)
       if not self._topic_subscriptions[topic]:
         del self._topic_subscriptions[topic]
     
-    # Remove subscription
+    # Remove subscription, dropping its undelivered events
     del self._subscriptions[subscription_id]
+    queue = self._subscriber_queues.pop(subscription_id, None)
+    if queue and queue.worker:
+      queue.worker.cancel()
     
     logger.debug(f"Unsubscribed: {subscription_id}")
     return True
@@ -142,27 +178,14 @@ class InMemoryEventBus(BaseEventBus):
       limit: int = 100,
   ) -> List[EventMessage]:
     """Get historical events."""
-    filtered_events = []
-    
-    for event in reversed(self._event_history):
-      # Apply filters
-      if topic and event.topic != topic:
-        continue
-      if event_type and event.event_type != event_type:
-        continue
-      if source and event.source != source:
-        continue
-      if start_time and event.timestamp < start_time:
-        continue
-      if end_time and event.timestamp > end_time:
-        continue
-      
-      filtered_events.append(event)
-      
-      if len(filtered_events) >= limit:
-        break
-    
-    return filtered_events
+    return self._event_history.query(
+        topic=topic,
+        event_type=event_type,
+        source=source,
+        start_time=start_time,
+        end_time=end_time,
+        limit=limit,
+    )
   
   async def wait_for_event(
       self,
@@ -173,42 +196,23 @@ class InMemoryEventBus(BaseEventBus):
   ) -> Optional[EventMessage]:
     """Wait for a specific event."""
     # Check history first
-    for event in reversed(self._event_history):
-      if event.topic == topic:
-        if event_type and event.event_type != event_type:
-          continue
-        if correlation_id and event.correlation_id != correlation_id:
-          continue
-        return event
-    
-    # Create future to wait on
-    future = asyncio.Future()
-    filters = {
-        "topic": topic,
-        "event_type": event_type,
-        "correlation_id": correlation_id,
-    }
-    
-    self._waiting_futures.append((future, filters))
+    history = self._event_history.query(
+        topic=topic,
+        event_type=event_type,
+        correlation_id=correlation_id,
+        limit=1,
+    )
+    if history:
+      return history[0]
     
-    try:
-      # Wait with timeout
-      event = await asyncio.wait_for(future, timeout=timeout)
-      return event
-    except asyncio.TimeoutError:
-      return None
-    finally:
-      # Clean up
-      self._waiting_futures = [
-          (f, filt)
-          for f, filt in self._waiting_futures
-          if f != future
-      ]
+    return await self._waiters.wait(
+        topic, event_type, correlation_id, timeout
+    )
   
   async def _notify_subscribers(self, event: EventMessage):
     """Notify all relevant subscribers of an event."""
-    # Get subscription IDs for this topic
-    subscription_ids = self._topic_subscriptions.get(event.topic, set())
+    # Get subscription IDs of all patterns matching this topic
+    subscription_ids = self._topic_trie.match(event.topic)
     
     for sub_id in subscription_ids:
       subscription = self._subscriptions.get(sub_id)
@@ -216,69 +220,43 @@ class InMemoryEventBus(BaseEventBus):
         continue
       
       # Check filters
-      if (
-          subscription.event_types
-          and event.event_type not in subscription.event_types
-      ):
+      if not matches_filters(subscription, event):
         continue
       
-      if (
-          subscription.priority_filter
-          and event.priority not in subscription.priority_filter
-      ):
-        continue
-      
-      # Call handler
+      queue = self._subscriber_queues.get(sub_id)
+      if queue:
+        await queue.put_event(event, self.overflow_policy)
+      else:
+        await call_handler(subscription, event)
+  
+  async def _deliver(
+      self, subscription: EventSubscription, queue: SubscriberQueue
+  ):
+    """Worker delivering the queued events of a subscription."""
+    while True:
+      enqueue_time, event = await queue.get()
       try:
-        if asyncio.iscoroutinefunction(subscription.handler):
-          await subscription.handler(event)
-        else:
-          subscription.handler(event)
-      except Exception as e:
-        logger.error(
-            f"Error in handler for {subscription.subscriber_id}: {e}"
-        )
+        queue.record_delivery(enqueue_time)
+        await call_handler(subscription, event)
+      finally:
+        queue.task_done()
   
-  async def _check_waiting_futures(self, event: EventMessage):
-    """Check if any waiting futures match this event."""
-    completed_futures = []
-    
-    for future, filters in self._waiting_futures:
-      if future.done():
-        completed_futures.append((future, filters))
-        continue
-      
-      # Check filters
-      if filters.get("topic") and event.topic != filters["topic"]:
-        continue
-      
-      if (
-          filters.get("event_type")
-          and event.event_type != filters["event_type"]
-      ):
-        continue
-      
-      if (
-          filters.get("correlation_id")
-          and event.correlation_id != filters["correlation_id"]
-      ):
-        continue
-      
-      # Match found
-      future.set_result(event)
-      completed_futures.append((future, filters))
-    
-    # Remove completed futures
-    for completed in completed_futures:
-      if completed in self._waiting_futures:
-        self._waiting_futures.remove(completed)
+  async def drain(self):
+    """Wait until all queued events were handled."""
+    for queue in list(self._subscriber_queues.values()):
+      await queue.join()
   
   def clear(self):
     """Clear all data (for testing)."""
     self._event_history.clear()
     self._subscriptions.clear()
     self._topic_subscriptions.clear()
-    self._waiting_futures.clear()
+    self._topic_trie = TopicTrie()
+    for queue in self._subscriber_queues.values():
+      if queue.worker:
+        queue.worker.cancel()
+    self._subscriber_queues.clear()
+    self._waiters.clear()
   
   def get_metrics(self) -> Dict[str, Any]:
     """Get event bus metrics."""
@@ -286,6 +264,16 @@ class InMemoryEventBus(BaseEventBus):
         "total_events": len(self._event_history),
         "active_subscriptions": len(self._subscriptions),
         "monitored_topics": len(self._topic_subscriptions),
-        "waiting_futures": len(self._waiting_futures),
+        "waiting_futures": len(self._waiters),
         "topics": list(self._topic_subscriptions.keys()),
+        "queued_events": sum(
+            queue.qsize() for queue in self._subscriber_queues.values()
+        ),
+        "dropped_events": sum(
+            queue.dropped for queue in self._subscriber_queues.values()
+        ),
+        "subscriber_queues": {
+            sub_id: queue.get_metrics()
+            for sub_id, queue in self._subscriber_queues.items()
+        },
     }
\ No newline at end of file
@@ -15,11 +15,15 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import importlib
 import logging
+import time
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
 
+from ._event_codec import decode_event, encode_event
+from ._event_history import EventHistory
 from .base_event_bus import (
     BaseEventBus,
     EventMessage,
@@ -29,76 +33,147 @@ from .base_event_bus import (
 
 logger = logging.getLogger(__name__)
 
-# Note: In a real implementation, you would import and use actual Kafka libraries
-# like aiokafka. This is a simplified implementation for demonstration.
+# Like the default metadata.max.age.ms of Kafka clients.
+_PARTITIONS_REFRESH_SECONDS = 300.0
+_MIN_RETRY_DELAY_SECONDS = 0.1
+_MAX_RETRY_DELAY_SECONDS = 30.0
 
 
 class KafkaEventBus(BaseEventBus):
-  """Kafka-based event bus implementation.
-  
-  This is a simplified implementation that demonstrates the pattern.
-  In production, you would use actual Kafka client libraries like aiokafka.
+  """Kafka-based event bus implementation using aiokafka.
+
+  Events are serialized in a compact binary format and keyed by their
+  `correlation_id`, so the events of one conversation land in the same
+  partition and keep their order. The producer batches events, trading up to
+  `linger_ms` of latency for throughput.
+
+  Each subscribed topic gets a consumer in the bus's consumer group, so the
+  partitions of a topic are balanced across all processes using the same
+  `group_id`. The records of each partition are handled by their own task,
+  in order, and offsets are committed once a poll's records were handled.
+
+  `wait_for_event` and `request_reply` use a separate listener per topic
+  outside the consumer group, so every process sees all replies. Listeners
+  are assigned all partitions of their topic and pick up partitions added
+  later within five minutes, like the group's consumers. Replies of
+  `request_reply` go to a `reply.<source>` topic shared by all requests of a
+  source.
+
+  Failed polls are retried with exponential backoff.
+
+  `get_event_history` only covers the events this process published, in a
+  ring buffer of `max_history` events.
   """
-  
+
   def __init__(
       self,
       bootstrap_servers: str = "localhost:9092",
       client_id: str = "adk-event-bus",
       group_id: str = "adk-agents",
+      linger_ms: int = 5,
+      max_batch_size: int = 16384,
+      compression_type: Optional[str] = None,
+      max_poll_records: int = 500,
+      max_history: int = 1000,
+      kafka_client: Any = None,
   ):
     """Initialize Kafka event bus.
-    
+
     Args:
         bootstrap_servers: Kafka bootstrap servers
         client_id: Client ID for Kafka
         group_id: Consumer group ID
+        linger_ms: How long the producer waits to fill a batch
+        max_batch_size: Maximum size of a producer batch in bytes
+        compression_type: Compression of producer batches, e.g. "lz4"
+        max_poll_records: Maximum number of records handled per poll
+        max_history: Maximum number of events to keep in local history
+        kafka_client: Module providing `AIOKafkaProducer`,
+          `AIOKafkaConsumer` and `TopicPartition`. Defaults to `aiokafka`.
     """
     self.bootstrap_servers = bootstrap_servers
     self.client_id = client_id
     self.group_id = group_id
-    
-    # In production, initialize Kafka producer and consumer here
-    self._producer = None  # Would be aiokafka.AIOKafkaProducer
+    self.linger_ms = linger_ms
+    self.max_batch_size = max_batch_size
+    self.compression_type = compression_type
+    self.max_poll_records = max_poll_records
+    self._kafka = kafka_client
+
+    self._producer = None
+    self._start_lock: Optional[asyncio.Lock] = None
     self._consumers: Dict[str, Any] = {}  # Topic -> Consumer mapping
+    self._listeners: Dict[str, Any] = {}  # Topic -> Listener mapping
+    # Topic -> Partitions assigned to its listener
+    self._listener_partitions: Dict[str, Set[int]] = {}
     self._subscriptions: Dict[str, EventSubscription] = {}
     self._running = False
-    self._consumer_tasks: List[asyncio.Task] = []
-    
-    # For demo purposes, we'll use in-memory storage
-    self._event_store: List[EventMessage] = []
-    self._topic_handlers: Dict[str, Set[EventSubscription]] = {}
-  
+    self._consumer_tasks: Dict[str, asyncio.Task] = {}
+
+    self._event_history = EventHistory(max_history)
+    self._topic_handlers: Dict[str, Set[str]] = {}
+    # Maps each waiter's future to its event type filter.
+    self._waiting_futures: Dict[
+        Tuple[str, Optional[str]], Dict[asyncio.Future, Optional[str]]
+    ] = {}
+
   async def start(self):
     """Start the event bus."""
     if self._running:
       return
-    
-    self._running = True
-    logger.info(f"Starting Kafka event bus: {self.bootstrap_servers}")
-    
-    # In production:
-    # - Initialize Kafka producer
-    # - Start consumer tasks
-    # - Connect to Kafka cluster
-  
+    if self._start_lock is None:
+      self._start_lock = asyncio.Lock()
+    async with self._start_lock:
+      if self._running:
+        return
+
+      if self._kafka is None:
+        try:
+          self._kafka = importlib.import_module("aiokafka")
+        except ImportError as e:
+          raise ImportError(
+              "KafkaEventBus requires aiokafka. Install it with"
+              " `pip install aiokafka`."
+          ) from e
+
+      logger.info(f"Starting Kafka event bus: {self.bootstrap_servers}")
+      self._producer = self._kafka.AIOKafkaProducer(
+          bootstrap_servers=self.bootstrap_servers,
+          client_id=self.client_id,
+          linger_ms=self.linger_ms,
+          max_batch_size=self.max_batch_size,
+          compression_type=self.compression_type,
+      )
+      await self._producer.start()
+      self._running = True
+
   async def stop(self):
-    """Stop the event bus."""
+    """Stop the event bus, delivering pending events first."""
     self._running = False
-    
+
     # Cancel consumer tasks
-    for task in self._consumer_tasks:
+    for task in self._consumer_tasks.values():
       task.cancel()
-    
+
     # Wait for tasks to complete
     if self._consumer_tasks:
-      await asyncio.gather(*self._consumer_tasks, return_exceptions=True)
-    
-    # In production:
-    # - Close Kafka connections
-    # - Clean up resources
-    
+      await asyncio.gather(
+          *self._consumer_tasks.values(), return_exceptions=True
+      )
+    self._consumer_tasks.clear()
+
+    for consumer in [*self._consumers.values(), *self._listeners.values()]:
+      await consumer.stop()
+    self._consumers.clear()
+    self._listeners.clear()
+    self._listener_partitions.clear()
+
+    if self._producer:
+      await self._producer.stop()
+      self._producer = None
+
     logger.info("Kafka event bus stopped")
-  
+
   async def publish(
       self,
       topic: str,
@@ -109,7 +184,13 @@ class KafkaEventBus(BaseEventBus):
       correlation_id: Optional[str] = None,
       reply_to: Optional[str] = None,
   ) -> EventMessage:
-    """Publish an event to Kafka."""
+    """Publish an event to Kafka.
+
+    Returns once the event is in the producer's batch. Use `flush` to wait
+    until the pending events were delivered.
+    """
+    await self.start()
+
     # Create event message
     event = EventMessage(
         topic=topic,
@@ -120,21 +201,26 @@ class KafkaEventBus(BaseEventBus):
         correlation_id=correlation_id,
         reply_to=reply_to,
     )
-    
-    # In production, serialize and send to Kafka
-    # await self._producer.send(topic, value=event.to_dict())
-    
-    # For demo, store in memory and notify handlers
-    self._event_store.append(event)
-    await self._notify_handlers(event)
-    
-    logger.info(
+
+    await self._producer.send(
+        topic,
+        value=encode_event(event),
+        key=correlation_id.encode() if correlation_id else None,
+    )
+    self._event_history.append(event)
+
+    logger.debug(
         f"Published event: {event.event_type} to {topic} "
         f"(priority: {priority.value})"
     )
-    
+
     return event
-  
+
+  async def flush(self):
+    """Wait until all published events were delivered to Kafka."""
+    if self._producer:
+      await self._producer.flush()
+
   async def subscribe(
       self,
       subscriber_id: str,
@@ -144,6 +230,8 @@ class KafkaEventBus(BaseEventBus):
       priority_filter: Optional[List[EventPriority]] = None,
   ) -> EventSubscription:
     """Subscribe to Kafka topics."""
+    await self.start()
+
     subscription = EventSubscription(
         subscriber_id=subscriber_id,
         topics=topics,
@@ -151,48 +239,47 @@ class KafkaEventBus(BaseEventBus):
         priority_filter=priority_filter,
         handler=handler,
     )
-    
+
     # Store subscription
     self._subscriptions[subscription.id] = subscription
-    
+
     # Register with topics
     for topic in topics:
       if topic not in self._topic_handlers:
         self._topic_handlers[topic] = set()
-        # In production, create Kafka consumer for this topic
         await self._create_consumer(topic)
-      
-      self._topic_handlers[topic].add(subscription)
-    
+
+      self._topic_handlers[topic].add(subscription.id)
+
     logger.info(
         f"Subscriber {subscriber_id} subscribed to topics: {', '.join(topics)}"
     )
-    
+
     return subscription
-  
+
   async def unsubscribe(self, subscription_id: str) -> bool:
     """Unsubscribe from topics."""
     if subscription_id not in self._subscriptions:
       return False
-    
+
     subscription = self._subscriptions[subscription_id]
-    
+
     # Remove from topic handlers
     for topic in subscription.topics:
       if topic in self._topic_handlers:
-        self._topic_handlers[topic].discard(subscription)
-        
+        self._topic_handlers[topic].discard(subscription_id)
+
         # If no more subscribers, stop consumer
         if not self._topic_handlers[topic]:
           await self._stop_consumer(topic)
           del self._topic_handlers[topic]
-    
+
     # Remove subscription
     del self._subscriptions[subscription_id]
-    
+
     logger.info(f"Unsubscribed: {subscription_id}")
     return True
-  
+
   async def get_event_history(
       self,
       topic: Optional[str] = None,
@@ -202,31 +289,16 @@ class KafkaEventBus(BaseEventBus):
       end_time: Optional[datetime] = None,
       limit: int = 100,
   ) -> List[EventMessage]:
-    """Get historical events from Kafka."""
-    # In production, this would query Kafka or a separate event store
-    
-    # Filter events
-    filtered_events = []
-    for event in reversed(self._event_store):  # Most recent first
-      # Apply filters
-      if topic and event.topic != topic:
-        continue
-      if event_type and event.event_type != event_type:
-        continue
-      if source and event.source != source:
-        continue
-      if start_time and event.timestamp < start_time:
-        continue
-      if end_time and event.timestamp > end_time:
-        continue
-      
-      filtered_events.append(event)
-      
-      if len(filtered_events) >= limit:
-        break
-    
-    return filtered_events
-  
+    """Get the events published by this process."""
+    return self._event_history.query(
+        topic=topic,
+        event_type=event_type,
+        source=source,
+        start_time=start_time,
+        end_time=end_time,
+        limit=limit,
+    )
+
   async def wait_for_event(
       self,
       topic: str,
@@ -234,108 +306,233 @@ class KafkaEventBus(BaseEventBus):
       correlation_id: Optional[str] = None,
       timeout: Optional[float] = None,
   ) -> Optional[EventMessage]:
-    """Wait for a specific event."""
-    # Create a future to wait on
-    future = asyncio.Future()
-    
-    # Create temporary subscription
-    async def event_handler(event: EventMessage):
-      # Check if this is the event we're waiting for
-      if event_type and event.event_type != event_type:
-        return
-      if correlation_id and event.correlation_id != correlation_id:
-        return
-      
-      # Found the event
-      if not future.done():
-        future.set_result(event)
-    
-    # Subscribe
-    subscription = await self.subscribe(
-        subscriber_id=f"wait_{topic}_{correlation_id}",
-        topics=[topic],
-        handler=event_handler,
+    """Wait for a specific event published after the call."""
+    future = await self._add_waiter(topic, event_type, correlation_id)
+    return await self._wait(topic, correlation_id, future, timeout)
+
+  async def request_reply(
+      self,
+      topic: str,
+      event_type: str,
+      source: str,
+      payload: Dict[str, Any],
+      reply_timeout: float = 30.0,
+  ) -> Optional[EventMessage]:
+    """Send an event and wait for a reply on the source's reply topic."""
+    correlation_id = str(uuid4())
+    reply_topic = f"reply.{source}"
+
+    # Listen before publishing, so the reply can't be missed
+    future = await self._add_waiter(reply_topic, None, correlation_id)
+    await self.publish(
+        topic=topic,
+        event_type=event_type,
+        source=source,
+        payload=payload,
+        correlation_id=correlation_id,
+        reply_to=reply_topic,
+    )
+    return await self._wait(
+        reply_topic, correlation_id, future, reply_timeout
+    )
+
+  async def _add_waiter(
+      self,
+      topic: str,
+      event_type: Optional[str],
+      correlation_id: Optional[str],
+  ) -> asyncio.Future:
+    """Register a waiter, listening to the topic from its current end."""
+    await self.start()
+    future = asyncio.get_running_loop().create_future()
+    self._waiting_futures.setdefault((topic, correlation_id), {})[
+        future
+    ] = event_type
+    if topic not in self._listeners:
+      # Without a group, so all processes see the events of the topic.
+      listener = self._kafka.AIOKafkaConsumer(
+          bootstrap_servers=self.bootstrap_servers,
+          client_id=f"{self.client_id}-listener-{topic}",
+          group_id=None,
+          enable_auto_commit=False,
+      )
+      self._listeners[topic] = listener
+      await listener.start()
+      partitions = await self._producer.partitions_for(topic)
+      topic_partitions = [
+          self._kafka.TopicPartition(topic, partition)
+          for partition in sorted(partitions)
+      ]
+      listener.assign(topic_partitions)
+      self._listener_partitions[topic] = set(partitions)
+      await listener.seek_to_end(*topic_partitions)
+      # Resolves the end offsets now rather than on the first poll.
+      for topic_partition in topic_partitions:
+        await listener.position(topic_partition)
+      self._consumer_tasks[f"listener:{topic}"] = asyncio.create_task(
+          self._consume_messages(
+              topic, listener, commit=False, refresh_partitions=True
+          )
+      )
+    return future
+
+  async def _assign_new_partitions(self, topic: str, listener):
+    """Assign the partitions added to a topic to its listener."""
+    partitions = await self._producer.partitions_for(topic)
+    assigned = self._listener_partitions[topic]
+    if not partitions - assigned:
+      return
+    positions = {}
+    for partition in assigned:
+      topic_partition = self._kafka.TopicPartition(topic, partition)
+      positions[topic_partition] = await listener.position(topic_partition)
+    new_topic_partitions = [
+        self._kafka.TopicPartition(topic, partition)
+        for partition in sorted(partitions - assigned)
+    ]
+    # Replaces the assignment, so the positions are restored afterwards.
+    listener.assign([*positions, *new_topic_partitions])
+    for topic_partition, offset in positions.items():
+      listener.seek(topic_partition, offset)
+    # New partitions only have events published since they were added.
+    await listener.seek_to_beginning(*new_topic_partitions)
+    self._listener_partitions[topic] = assigned | set(partitions)
+    logger.info(
+        f"Assigned new partitions of topic {topic}:"
+        f" {sorted(partitions - assigned)}"
     )
-    
+
+  async def _wait(
+      self,
+      topic: str,
+      correlation_id: Optional[str],
+      future: asyncio.Future,
+      timeout: Optional[float],
+  ) -> Optional[EventMessage]:
+    key = (topic, correlation_id)
     try:
-      # Wait for event with timeout
-      event = await asyncio.wait_for(future, timeout=timeout)
-      return event
+      return await asyncio.wait_for(future, timeout=timeout)
     except asyncio.TimeoutError:
       logger.debug(f"Timeout waiting for event on {topic}")
       return None
     finally:
-      # Clean up subscription
-      await self.unsubscribe(subscription.id)
-  
+      waiters = self._waiting_futures.get(key)
+      if waiters is not None:
+        waiters.pop(future, None)
+        if not waiters:
+          del self._waiting_futures[key]
+
   async def _create_consumer(self, topic: str):
-    """Create a Kafka consumer for a topic."""
-    # In production:
-    # consumer = aiokafka.AIOKafkaConsumer(
-    #     topic,
-    #     bootstrap_servers=self.bootstrap_servers,
-    #     group_id=self.group_id,
-    #     client_id=f"{self.client_id}-{topic}",
-    # )
-    # await consumer.start()
-    # self._consumers[topic] = consumer
-    #
-    # # Start consumer task
-    # task = asyncio.create_task(self._consume_messages(topic, consumer))
-    # self._consumer_tasks.append(task)
-    
+    """Create a consumer in the bus's consumer group for a topic."""
+    consumer = self._kafka.AIOKafkaConsumer(
+        topic,
+        bootstrap_servers=self.bootstrap_servers,
+        group_id=self.group_id,
+        client_id=f"{self.client_id}-{topic}",
+        enable_auto_commit=False,
+        auto_offset_reset="latest",
+    )
+    await consumer.start()
+    self._consumers[topic] = consumer
+
+    # Start consumer task
+    self._consumer_tasks[topic] = asyncio.create_task(
+        self._consume_messages(topic, consumer, commit=True)
+    )
+
     logger.info(f"Created consumer for topic: {topic}")
-  
+
   async def _stop_consumer(self, topic: str):
     """Stop a Kafka consumer."""
-    # In production:
-    # if topic in self._consumers:
-    #     consumer = self._consumers[topic]
-    #     await consumer.stop()
-    #     del self._consumers[topic]
-    
+    task = self._consumer_tasks.pop(topic, None)
+    if task:
+      task.cancel()
+      await asyncio.gather(task, return_exceptions=True)
+    consumer = self._consumers.pop(topic, None)
+    if consumer:
+      await consumer.stop()
+
     logger.info(f"Stopped consumer for topic: {topic}")
-  
-  async def _consume_messages(self, topic: str, consumer):
-    """Consume messages from Kafka (production implementation)."""
-    # In production:
-    # try:
-    #     async for msg in consumer:
-    #         # Deserialize message
-    #         event_data = json.loads(msg.value.decode())
-    #         event = EventMessage.from_dict(event_data)
-    #         
-    #         # Notify handlers
-    #         await self._notify_handlers(event)
-    # except Exception as e:
-    #     logger.error(f"Error consuming from {topic}: {e}")
-    pass
-  
+
+  async def _consume_messages(
+      self,
+      topic: str,
+      consumer,
+      commit: bool,
+      refresh_partitions: bool = False,
+  ):
+    """Consume messages from Kafka, one task per partition of each poll."""
+    retry_delay = _MIN_RETRY_DELAY_SECONDS
+    next_refresh = time.monotonic() + _PARTITIONS_REFRESH_SECONDS
+    while True:
+      try:
+        if refresh_partitions and time.monotonic() >= next_refresh:
+          next_refresh = time.monotonic() + _PARTITIONS_REFRESH_SECONDS
+          await self._assign_new_partitions(topic, consumer)
+        batches = await consumer.getmany(
+            timeout_ms=1000, max_records=self.max_poll_records
+        )
+        if batches:
+          await asyncio.gather(*(
+              self._handle_records(records, from_group=commit)
+              for records in batches.values()
+          ))
+          if commit:
+            await consumer.commit()
+        retry_delay = _MIN_RETRY_DELAY_SECONDS
+      except asyncio.CancelledError:
+        raise
+      except Exception as e:
+        logger.error(
+            f"Error consuming from {topic}, retrying in {retry_delay}s: {e}"
+        )
+        await asyncio.sleep(retry_delay)
+        retry_delay = min(retry_delay * 2, _MAX_RETRY_DELAY_SECONDS)
+
+  async def _handle_records(self, records: List[Any], from_group: bool):
+    """Handle the records of one partition in order."""
+    for record in records:
+      event = decode_event(record.value)
+      if from_group:
+        await self._notify_handlers(event)
+      else:
+        self._check_waiting_futures(event)
+
+  def _check_waiting_futures(self, event: EventMessage):
+    """Resolve the waiters matching this event."""
+    keys = [(event.topic, None)]
+    if event.correlation_id:
+      keys.append((event.topic, event.correlation_id))
+
+    for key in keys:
+      for future, event_type in self._waiting_futures.get(key, {}).items():
+        if future.done():
+          continue
+        if event_type and event.event_type != event_type:
+          continue
+        future.set_result(event)
+
   async def _notify_handlers(self, event: EventMessage):
     """Notify subscribed handlers of an event."""
     if event.topic not in self._topic_handlers:
       return
-    
+
     # Get relevant subscriptions
-    subscriptions = self._topic_handlers[event.topic]
-    
-    for subscription in subscriptions:
+    for sub_id in list(self._topic_handlers[event.topic]):
+      subscription = self._subscriptions.get(sub_id)
+      if not subscription:
+        continue
+
       # Check filters
       if subscription.event_types and event.event_type not in subscription.event_types:
         continue
       if subscription.priority_filter and event.priority not in subscription.priority_filter:
         continue
-      
+
       # Call handler
       if subscription.handler:
-        try:
-          # Run handler in background to avoid blocking
-          asyncio.create_task(self._run_handler(subscription.handler, event))
-        except Exception as e:
-          logger.error(
-              f"Error calling handler for {subscription.subscriber_id}: {e}"
-          )
-  
+        await self._run_handler(subscription.handler, event)
+
   async def _run_handler(self, handler: Callable, event: EventMessage):
     """Run an event handler safely."""
     try:
@@ -345,15 +542,18 @@ class KafkaEventBus(BaseEventBus):
         handler(event)
     except Exception as e:
       logger.error(f"Handler error for event {event.id}: {e}")
-  
+
   def get_metrics(self) -> Dict[str, Any]:
     """Get event bus metrics."""
     return {
-        "total_events": len(self._event_store),
+        "total_events": len(self._event_history),
         "active_subscriptions": len(self._subscriptions),
         "monitored_topics": len(self._topic_handlers),
         "topics": list(self._topic_handlers.keys()),
         "subscriber_count": len(
             set(sub.subscriber_id for sub in self._subscriptions.values())
         ),
-    }
\ No newline at end of file
+        "waiting_futures": sum(
+            len(waiters) for waiters in self._waiting_futures.values()
+        ),
+    }
@@ -0,0 +1,416 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+import heapq
+import itertools
+import logging
+import os
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+from urllib.parse import quote, unquote
+
+from ._event_codec import decode_event, encode_event
+from ._event_waiters import call_handler, EventWaiters, matches_filters
+from ._segment_log import OffsetStore, TopicLog
+from .base_event_bus import (
+    BaseEventBus,
+    EventMessage,
+    EventPriority,
+    EventSubscription,
+)
+
+logger = logging.getLogger(__name__)
+
+_TOPICS_DIR = "topics"
+_OFFSETS_FILE = "consumer_offsets.json"
+
+
+class LocalLogEventBus(BaseEventBus):
+  """Durable event bus storing events in local, log-structured files.
+
+  Every topic is an append-only log of memory-mapped segment files under
+  `log_dir`, so events survive restarts without running a broker. Each
+  event gets the next offset of its topic.
+
+  The `subscriber_id` of a subscription is its consumer group: the offset
+  of the next event to deliver is committed after each delivered batch, and
+  a subscription of the same group resumes from there, e.g. after a
+  restart. Subscriptions of a group share its offsets and take turns, so
+  each batch is delivered to one of them. Delivery is therefore at least
+  once. A group without committed offsets starts at the end of the log, or
+  at its start with `auto_offset_reset="earliest"`. Use `seek` to replay a
+  group from an offset, or `replay` to read a topic directly.
+
+  Topics are matched exactly. Segments beyond `retention_bytes` per topic or
+  older than `retention_seconds` are deleted once a newer segment exists.
+  """
+
+  def __init__(
+      self,
+      log_dir: str,
+      segment_bytes: int = 64 * 1024 * 1024,
+      retention_bytes: Optional[int] = None,
+      retention_seconds: Optional[float] = None,
+      auto_offset_reset: str = "latest",
+      fsync: bool = False,
+      max_batch_size: int = 500,
+  ):
+    """Initialize local log event bus.
+
+    Args:
+        log_dir: Directory for the topic logs and consumer offsets
+        segment_bytes: Size of a segment file before a new one is started
+        retention_bytes: Maximum size of a topic log, or None for no limit
+        retention_seconds: Maximum age of a segment, or None for no limit
+        auto_offset_reset: Where a new consumer group starts, "latest" or
+          "earliest"
+        fsync: Whether to flush each event to disk before publish returns,
+          protecting against power loss and not only process crashes
+        max_batch_size: Maximum number of events delivered per offset commit
+    """
+    if segment_bytes <= 0:
+      raise ValueError("segment_bytes must be positive.")
+    if auto_offset_reset not in ("latest", "earliest"):
+      raise ValueError(
+          f"Invalid auto_offset_reset: {auto_offset_reset}"
+      )
+    self.log_dir = log_dir
+    self.segment_bytes = segment_bytes
+    self.retention_bytes = retention_bytes
+    self.retention_seconds = retention_seconds
+    self.auto_offset_reset = auto_offset_reset
+    self.fsync = fsync
+    self.max_batch_size = max_batch_size
+
+    topics_dir = os.path.join(log_dir, _TOPICS_DIR)
+    os.makedirs(topics_dir, exist_ok=True)
+    self._topics: Dict[str, TopicLog] = {
+        unquote(name): TopicLog(
+            os.path.join(topics_dir, name), segment_bytes
+        )
+        for name in os.listdir(topics_dir)
+    }
+    self._offsets = OffsetStore(os.path.join(log_dir, _OFFSETS_FILE))
+    self._subscriptions: Dict[str, EventSubscription] = {}
+    self._topic_subscriptions: Dict[str, Set[str]] = defaultdict(set)
+    self._wakeups: Dict[str, asyncio.Event] = {}
+    self._consumer_tasks: Dict[str, asyncio.Task] = {}
+    # Created in _consume since locks bind to the running loop in Python 3.9.
+    self._group_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+    self._waiters = EventWaiters()
+
+  async def publish(
+      self,
+      topic: str,
+      event_type: str,
+      source: str,
+      payload: Dict[str, Any],
+      priority: EventPriority = EventPriority.NORMAL,
+      correlation_id: Optional[str] = None,
+      reply_to: Optional[str] = None,
+  ) -> EventMessage:
+    """Publish an event by appending it to the log of its topic."""
+    event = EventMessage(
+        topic=topic,
+        event_type=event_type,
+        source=source,
+        payload=payload,
+        priority=priority,
+        correlation_id=correlation_id,
+        reply_to=reply_to,
+    )
+
+    log = self._get_topic_log(topic)
+    num_segments = log.num_segments
+    log.append(encode_event(event), time.time())
+    if self.fsync:
+      log.flush()
+    if log.num_segments != num_segments:
+      log.enforce_retention(
+          self.retention_bytes, self.retention_seconds, time.time()
+      )
+
+    # Wake up the consumers of the topic
+    for sub_id in self._topic_subscriptions.get(topic, ()):
+      self._wakeups[sub_id].set()
+
+    self._waiters.resolve(event)
+
+    logger.debug(f"Published event: {event.event_type} to {topic}")
+
+    return event
+
+  async def subscribe(
+      self,
+      subscriber_id: str,
+      topics: List[str],
+      handler: Callable[[EventMessage], None],
+      event_types: Optional[List[str]] = None,
+      priority_filter: Optional[List[EventPriority]] = None,
+  ) -> EventSubscription:
+    """Subscribe to events, resuming from the group's committed offsets."""
+    subscription = EventSubscription(
+        subscriber_id=subscriber_id,
+        topics=topics,
+        event_types=event_types,
+        priority_filter=priority_filter,
+        handler=handler,
+    )
+
+    for topic in topics:
+      if self._offsets.get(subscriber_id, topic) is None:
+        log = self._get_topic_log(topic)
+        self._offsets.commit(
+            subscriber_id,
+            topic,
+            log.end_offset
+            if self.auto_offset_reset == "latest"
+            else log.start_offset,
+        )
+      self._topic_subscriptions[topic].add(subscription.id)
+
+    self._subscriptions[subscription.id] = subscription
+    self._wakeups[subscription.id] = asyncio.Event()
+    self._wakeups[subscription.id].set()
+    self._consumer_tasks[subscription.id] = asyncio.create_task(
+        self._consume(subscription)
+    )
+
+    logger.debug(
+        f"Subscriber {subscriber_id} subscribed to: {', '.join(topics)}"
+    )
+
+    return subscription
+
+  async def unsubscribe(self, subscription_id: str) -> bool:
+    """Unsubscribe from events, keeping the group's committed offsets."""
+    subscription = self._subscriptions.pop(subscription_id, None)
+    if not subscription:
+      return False
+
+    for topic in subscription.topics:
+      self._topic_subscriptions[topic].discard(subscription_id)
+      if not self._topic_subscriptions[topic]:
+        del self._topic_subscriptions[topic]
+
+    del self._wakeups[subscription_id]
+    task = self._consumer_tasks.pop(subscription_id)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    logger.debug(f"Unsubscribed: {subscription_id}")
+    return True
+
+  async def get_event_history(
+      self,
+      topic: Optional[str] = None,
+      event_type: Optional[str] = None,
+      source: Optional[str] = None,
+      start_time: Optional[datetime] = None,
+      end_time: Optional[datetime] = None,
+      limit: int = 100,
+  ) -> List[EventMessage]:
+    """Get historical events, newest first."""
+    topics = [topic] if topic else list(self._topics)
+    per_topic = []
+    for name in topics:
+      log = self._topics.get(name)
+      if not log:
+        continue
+      events = []
+      for _, payload in log.read_reversed():
+        if len(events) >= limit:
+          break
+        event = decode_event(payload)
+        if start_time and event.timestamp < start_time:
+          # Older events of the topic are out of range too.
+          break
+        if end_time and event.timestamp > end_time:
+          continue
+        if event_type and event.event_type != event_type:
+          continue
+        if source and event.source != source:
+          continue
+        events.append(event)
+      per_topic.append(events)
+
+    merged = heapq.merge(
+        *per_topic, key=lambda event: event.timestamp, reverse=True
+    )
+    return [event for _, event in zip(range(limit), merged)]
+
+  async def wait_for_event(
+      self,
+      topic: str,
+      event_type: Optional[str] = None,
+      correlation_id: Optional[str] = None,
+      timeout: Optional[float] = None,
+  ) -> Optional[EventMessage]:
+    """Wait for a specific event.
+
+    Only the latest `max_batch_size` events of the topic are checked before
+    waiting for new ones.
+    """
+    log = self._topics.get(topic)
+    if log:
+      for _, payload in itertools.islice(
+          log.read_reversed(), self.max_batch_size
+      ):
+        event = decode_event(payload)
+        if event_type and event.event_type != event_type:
+          continue
+        if correlation_id and event.correlation_id != correlation_id:
+          continue
+        return event
+
+    return await self._waiters.wait(
+        topic, event_type, correlation_id, timeout
+    )
+
+  async def replay(
+      self, topic: str, offset: int = 0
+  ) -> AsyncIterator[Tuple[int, EventMessage]]:
+    """Iterate over the events of a topic from an offset on.
+
+    Args:
+        topic: Topic to replay
+        offset: First offset to read, older ones are clamped to the start of
+          the retained log
+
+    Yields:
+        The offset and event of each record
+    """
+    log = self._topics.get(topic)
+    if not log:
+      return
+    while True:
+      records = log.read(offset, self.max_batch_size)
+      if not records:
+        return
+      for record_offset, payload in records:
+        yield record_offset, decode_event(payload)
+      offset = records[-1][0] + 1
+      # Let publishers make progress during long replays.
+      await asyncio.sleep(0)
+
+  def get_committed_offset(
+      self, subscriber_id: str, topic: str
+  ) -> Optional[int]:
+    """Get the offset of the next event the group will consume."""
+    return self._offsets.get(subscriber_id, topic)
+
+  def seek(self, subscriber_id: str, topic: str, offset: int):
+    """Make a consumer group continue from an offset of a topic."""
+    self._offsets.commit(subscriber_id, topic, offset)
+    for sub_id in self._topic_subscriptions.get(topic, ()):
+      if self._subscriptions[sub_id].subscriber_id == subscriber_id:
+        self._wakeups[sub_id].set()
+
+  def enforce_retention(self):
+    """Delete segments beyond the retention limits of all topics."""
+    now = time.time()
+    for log in self._topics.values():
+      log.enforce_retention(
+          self.retention_bytes, self.retention_seconds, now
+      )
+
+  async def close(self):
+    """Stop the consumers and close the log files."""
+    for subscription_id in list(self._subscriptions):
+      await self.unsubscribe(subscription_id)
+    for log in self._topics.values():
+      log.close()
+    self._topics.clear()
+
+  def _get_topic_log(self, topic: str) -> TopicLog:
+    log = self._topics.get(topic)
+    if log is None:
+      log = self._topics[topic] = TopicLog(
+          os.path.join(self.log_dir, _TOPICS_DIR, quote(topic, safe="")),
+          self.segment_bytes,
+      )
+    return log
+
+  async def _consume(self, subscription: EventSubscription):
+    """Deliver the events of a subscription, committing its offsets."""
+    group_id = subscription.subscriber_id
+    wakeup = self._wakeups[subscription.id]
+    while True:
+      await wakeup.wait()
+      wakeup.clear()
+      for topic in subscription.topics:
+        log = self._topics.get(topic)
+        if not log:
+          continue
+        lock = self._group_locks.get((group_id, topic))
+        if lock is None:
+          lock = self._group_locks[(group_id, topic)] = asyncio.Lock()
+        while True:
+          # The group's other subscriptions continue after this batch.
+          async with lock:
+            offset = self._offsets.get(group_id, topic)
+            records = log.read(offset, self.max_batch_size)
+            if not records:
+              break
+            for _, payload in records:
+              event = decode_event(payload)
+              if subscription.handler and matches_filters(
+                  subscription, event
+              ):
+                await call_handler(subscription, event)
+            # Unless the group was moved meanwhile with seek.
+            if self._offsets.get(group_id, topic) == offset:
+              self._offsets.commit(group_id, topic, records[-1][0] + 1)
+
+  def get_metrics(self) -> Dict[str, Any]:
+    """Get event bus metrics."""
+    consumer_lag = {}
+    for group_id, topic, offset in self._offsets.items():
+      log = self._topics.get(topic)
+      if log:
+        consumer_lag.setdefault(group_id, {})[topic] = max(
+            log.end_offset - max(offset, log.start_offset), 0
+        )
+    return {
+        "total_events": sum(
+            log.end_offset - log.start_offset
+            for log in self._topics.values()
+        ),
+        "active_subscriptions": len(self._subscriptions),
+        "monitored_topics": len(self._topic_subscriptions),
+        "topics": {
+            topic: {
+                "start_offset": log.start_offset,
+                "end_offset": log.end_offset,
+                "size_bytes": log.size_bytes,
+                "segments": log.num_segments,
+            }
+            for topic, log in self._topics.items()
+        },
+        "consumer_lag": consumer_lag,
+    }
@@ -42,6 +42,8 @@ from ...models.llm_response import LlmResponse
 from ...telemetry import trace_call_llm
 from ...telemetry import trace_send_data
 from ...telemetry import tracer
+from ...tools.base_tool import _find_tool_with_function_declarations
+from ...tools.base_tool import BaseTool
 from ...tools.tool_context import ToolContext
 
 if TYPE_CHECKING:
@@ -339,9 +341,12 @@ class BaseLlmFlow(ABC):
         yield event
 
     # Run processors for tools.
-    for tool in await agent.canonical_tools(
-        ReadonlyContext(invocation_context)
-    ):
+    tools = await agent.canonical_tools(ReadonlyContext(invocation_context))
+    declarations = _get_function_declarations(invocation_context, tools)
+    if declarations is not None:
+      _append_function_declarations(llm_request, declarations)
+      return
+    for tool in tools:
       tool_context = ToolContext(invocation_context)
       await tool.process_llm_request(
           tool_context=tool_context, llm_request=llm_request
@@ -640,3 +645,60 @@ class BaseLlmFlow(ABC):
     from ...agents.llm_agent import LlmAgent
 
     return cast(LlmAgent, invocation_context.agent).canonical_model
+
+
+def _get_function_declarations(
+    invocation_context: InvocationContext, tools: list[BaseTool]
+) -> Optional[list[tuple[BaseTool, types.FunctionDeclaration]]]:
+  """Gets the function declarations of the tools, once per invocation.
+
+  Args:
+    invocation_context: The invocation context.
+    tools: The tools of the agent.
+
+  Returns:
+    The tools with a declaration and their declarations, or None if a tool
+    processes LLM requests differently than adding its declaration.
+  """
+  key = tuple(tools)
+  declarations = invocation_context._function_declarations.get(key)
+  if declarations is not None:
+    return declarations
+
+  if any(
+      type(tool).process_llm_request is not BaseTool.process_llm_request
+      for tool in tools
+  ):
+    return None
+  declarations = [
+      (tool, declaration)
+      for tool in tools
+      if (declaration := tool._get_declaration()) is not None
+  ]
+  invocation_context._function_declarations[key] = declarations
+  return declarations
+
+
+def _append_function_declarations(
+    llm_request: LlmRequest,
+    declarations: list[tuple[BaseTool, types.FunctionDeclaration]],
+) -> None:
+  """Adds the tools to the request, like BaseTool.process_llm_request."""
+  if not declarations:
+    return
+  for tool, _ in declarations:
+    llm_request.tools_dict[tool.name] = tool
+
+  function_declarations = [declaration for _, declaration in declarations]
+  if tool_with_function_declarations := _find_tool_with_function_declarations(
+      llm_request
+  ):
+    tool_with_function_declarations.function_declarations.extend(
+        function_declarations
+    )
+  else:
+    llm_request.config = llm_request.config or types.GenerateContentConfig()
+    llm_request.config.tools = llm_request.config.tools or []
+    llm_request.config.tools.append(
+        types.Tool(function_declarations=function_declarations)
+    )
@@ -15,6 +15,7 @@
 from __future__ import annotations
 
 import copy
+import dataclasses
 from typing import AsyncGenerator
 from typing import Generator
 from typing import Optional
@@ -22,9 +23,11 @@ from typing import Optional
 from google.genai import types
 from typing_extensions import override
 
+from ...agents.context_window_config import ContextWindowConfig
 from ...agents.invocation_context import InvocationContext
 from ...events.event import Event
 from ...models.llm_request import LlmRequest
+from ...sessions.session import Session
 from ._base_llm_processor import BaseLlmRequestProcessor
 from .functions import remove_client_function_call_id
 from .functions import REQUEST_EUC_FUNCTION_CALL_NAME
@@ -43,19 +46,26 @@ class _ContentLlmRequestProcessor(BaseLlmRequestProcessor):
     if not isinstance(agent, LlmAgent):
       return
 
+    session = invocation_context.session
+    key = (invocation_context.branch, agent.name, agent.include_contents)
+    builder = invocation_context._contents_builders.get(key)
+    if builder is None:
+      builder = invocation_context._contents_builders[key] = _ContentsBuilder(
+          invocation_context.branch, agent.name
+      )
     if agent.include_contents == 'default':
       # Include full conversation history
-      llm_request.contents = _get_contents(
-          invocation_context.branch,
-          invocation_context.session.events,
-          agent.name,
+      llm_request.contents = await _build_history_contents(
+          session, builder, agent.context_window
       )
     else:
       # Include current turn context only (no conversation history)
-      llm_request.contents = _get_current_turn_contents(
-          invocation_context.branch,
-          invocation_context.session.events,
-          agent.name,
+      await _load_current_turn_events(session, agent.name)
+      start = _find_current_turn_start(session.events, agent.name)
+      llm_request.contents = (
+          []
+          if start is None
+          else builder.build(session.events[start:], agent.context_window)
       )
 
     # Maintain async generator behavior
@@ -65,6 +75,18 @@ class _ContentLlmRequestProcessor(BaseLlmRequestProcessor):
 
 request_processor = _ContentLlmRequestProcessor()
 
+_CURRENT_TURN_PAGE_SIZE = 10
+"""The number of older events to page in at a time to find the current turn."""
+
+_HISTORY_PAGE_SIZE = 100
+"""The number of older events to page in first to fill a context window."""
+
+_CHARS_PER_TOKEN = 4
+"""The average number of characters of a token, to estimate token counts."""
+
+_TOKENS_PER_MEDIA_PART = 258
+"""The estimated number of tokens of an image or other media part."""
+
 
 def _rearrange_events_for_async_function_responses_in_history(
     events: list[Event],
@@ -208,10 +230,115 @@ def _get_contents(
   Returns:
     A list of processed contents.
   """
-  filtered_events = []
-  # Parse the events, leaving the contents and the function calls and
-  # responses from the current agent.
-  for event in events:
+  return _ContentsBuilder(current_branch, agent_name).build(events)
+
+
+@dataclasses.dataclass
+class _Entry:
+  """An event included in the contents, with its cleaned up content."""
+
+  event: Event
+  content: types.Content
+  num_tokens: Optional[int] = None
+
+  def get_num_tokens(self) -> int:
+    if self.num_tokens is None:
+      self.num_tokens = _estimate_tokens(self.content)
+    return self.num_tokens
+
+
+class _ContentsBuilder:
+  """Builds the contents for the LLM requests of an agent incrementally.
+
+  The events seen by a previous build are not processed again when they are
+  still at the start of the events. Each event's content is copied and cleaned
+  up once, and later requests share the data of its parts.
+
+  Events are rearranged to pair function calls with their responses only once
+  an event may need it. Until then, every function response directly follows
+  its function call and the rearrangement would not change anything.
+  """
+
+  def __init__(self, current_branch: Optional[str], agent_name: str = ''):
+    self._current_branch = current_branch
+    self._agent_name = agent_name
+    self._reset()
+
+  def _reset(self) -> None:
+    self._first_event: Optional[Event] = None
+    self._last_event: Optional[Event] = None
+    self._num_events = 0
+    self._entries: list[_Entry] = []
+    """The included events, with replies of other agents converted."""
+    self._function_call_ids: set[str] = set()
+    self._function_response_ids: set[str] = set()
+    self._needs_rearrangement = False
+    self.is_context_window_full = False
+    """Whether the last build left out events to fit in the context window."""
+
+  def build(
+      self,
+      events: list[Event],
+      context_window: Optional[ContextWindowConfig] = None,
+  ) -> list[types.Content]:
+    """Gets the contents for the LLM request.
+
+    Args:
+      events: Events to process. Should start with the events of the previous
+        build, otherwise all events are processed again.
+      context_window: Limits the contents to the most recent ones.
+
+    Returns:
+      A list of processed contents.
+    """
+    if not self._is_continued_by(events):
+      self._reset()
+    for event in events[self._num_events :]:
+      self._add_event(event)
+    self._num_events = len(events)
+    self._first_event = events[0] if events else None
+    self._last_event = events[-1] if events else None
+
+    entries = self._entries
+    if self._needs_rearrangement:
+      entries = self._rearrange_entries()
+    self.is_context_window_full = False
+    if context_window:
+      selected_entries = _select_context_window(entries, context_window)
+      self.is_context_window_full = len(selected_entries) < len(entries)
+      entries = selected_entries
+    return [_copy_content(entry.content) for entry in entries]
+
+  def _rearrange_entries(self) -> list[_Entry]:
+    """Rearranges the events for proper function call/response pairing."""
+    events = [entry.event for entry in self._entries]
+    result_events = _rearrange_events_for_latest_function_response(events)
+    result_events = _rearrange_events_for_async_function_responses_in_history(
+        result_events
+    )
+    entries_by_event = {id(entry.event): entry for entry in self._entries}
+    entries = []
+    for event in result_events:
+      entry = entries_by_event.get(id(event))
+      if entry is None:
+        # A merged function response event.
+        content = copy.deepcopy(event.content)
+        remove_client_function_call_id(content)
+        entry = _Entry(event, content)
+      entries.append(entry)
+    return entries
+
+  def _is_continued_by(self, events: list[Event]) -> bool:
+    """Whether the events start with the events of the previous build."""
+    if not self._num_events:
+      return True
+    return (
+        len(events) >= self._num_events
+        and events[0] is self._first_event
+        and events[self._num_events - 1] is self._last_event
+    )
+
+  def _add_event(self, event: Event) -> None:
     if (
         not event.content
         or not event.content.role
@@ -221,35 +348,167 @@ def _get_contents(
       # Skip events without content, or generated neither by user nor by model
       # or has empty text.
       # E.g. events purely for mutating session states.
-
-      continue
-    if not _is_event_belongs_to_branch(current_branch, event):
+      return
+    if not _is_event_belongs_to_branch(self._current_branch, event):
       # Skip events not belong to current branch.
-      continue
+      return
     if _is_auth_event(event):
       # Skip auth events.
-      continue
-    filtered_events.append(
-        _convert_foreign_event(event)
-        if _is_other_agent_reply(agent_name, event)
-        else event
-    )
-
-  # Rearrange events for proper function call/response pairing
-  result_events = _rearrange_events_for_latest_function_response(
-      filtered_events
-  )
-  result_events = _rearrange_events_for_async_function_responses_in_history(
-      result_events
-  )
+      return
+    if _is_other_agent_reply(self._agent_name, event):
+      event = _convert_foreign_event(event)
 
-  # Convert events to contents
-  contents = []
-  for event in result_events:
+    if not self._needs_rearrangement:
+      self._needs_rearrangement = not self._pairs_function_responses(event)
     content = copy.deepcopy(event.content)
     remove_client_function_call_id(content)
-    contents.append(content)
-  return contents
+    self._entries.append(_Entry(event, content))
+
+  def _pairs_function_responses(self, event: Event) -> bool:
+    """Whether the event's function responses directly follow their calls.
+
+    Also requires unique function call ids, which the rearrangement relies on.
+
+    Args:
+      event: The event to be added next.
+
+    Returns:
+      Whether the events still don't need to be rearranged with the event.
+    """
+    function_calls = event.get_function_calls()
+    function_responses = event.get_function_responses()
+    if function_calls and function_responses:
+      return False
+
+    if function_responses:
+      previous_calls = (
+          self._entries[-1].event.get_function_calls() if self._entries else []
+      )
+      previous_call_ids = {function_call.id for function_call in previous_calls}
+      for function_response in function_responses:
+        if (
+            not function_response.id
+            or function_response.id not in previous_call_ids
+            or function_response.id in self._function_response_ids
+        ):
+          return False
+        self._function_response_ids.add(function_response.id)
+
+    for function_call in function_calls:
+      if not function_call.id or function_call.id in self._function_call_ids:
+        return False
+      self._function_call_ids.add(function_call.id)
+    return True
+
+
+def _copy_content(content: types.Content) -> types.Content:
+  """Copies the content and its parts, sharing the data held by the parts.
+
+  Request processors may replace parts or set their fields, which must not
+  change the contents of later requests.
+  """
+  return content.model_copy(
+      update={'parts': [part.model_copy() for part in content.parts or []]}
+  )
+
+
+def _select_context_window(
+    entries: list[_Entry], context_window: ContextWindowConfig
+) -> list[_Entry]:
+  """Selects the most recent entries that fit in the context window.
+
+  Args:
+    entries: The entries, with function responses directly following their
+      function calls.
+    context_window: The limits of the context window.
+
+  Returns:
+    The selected entries, followed by the older pinned ones, in their original
+    order. The selected entries start with a user turn: leading model turns,
+    e.g. function calls, are left out, and if only model turns fit, the
+    preceding user turn is kept with them.
+  """
+  # Keep function calls and their responses together.
+  groups: list[list[_Entry]] = []
+  for entry in entries:
+    if (
+        groups
+        and entry.event.get_function_responses()
+        and groups[-1][-1].event.get_function_calls()
+    ):
+      groups[-1].append(entry)
+    else:
+      groups.append([entry])
+
+  num_events = 0
+  num_tokens = 0
+  for index in range(len(groups) - 1, -1, -1):
+    group = groups[index]
+    num_events += len(group)
+    if context_window.max_tokens is not None:
+      num_tokens += sum(entry.get_num_tokens() for entry in group)
+    # The latest group is always kept.
+    if index < len(groups) - 1 and (
+        (
+            context_window.max_events is not None
+            and num_events > context_window.max_events
+        )
+        or (
+            context_window.max_tokens is not None
+            and num_tokens > context_window.max_tokens
+        )
+    ):
+      break
+  else:
+    return entries
+
+  # The first group that fits, unless it's a model turn.
+  start = index + 1
+  while start < len(groups) - 1 and _is_model_turn(groups[start]):
+    start += 1
+  request_index = None
+  if _is_model_turn(groups[start]):
+    request_index = next(
+        (i for i in range(start - 1, -1, -1) if not _is_model_turn(groups[i])),
+        None,
+    )
+  kept_groups = [
+      group
+      for i, group in enumerate(groups[:start])
+      if i == request_index
+      or (
+          context_window.pinned
+          and any(context_window.pinned(entry.event) for entry in group)
+      )
+  ]
+  kept_groups.extend(groups[start:])
+  return [entry for group in kept_groups for entry in group]
+
+
+def _is_model_turn(group: list[_Entry]) -> bool:
+  return group[0].content.role == 'model'
+
+
+def _estimate_tokens(content: types.Content) -> int:
+  """Estimates the number of tokens of the content from its size."""
+  num_chars = 0
+  num_tokens = 0
+  for part in content.parts or []:
+    if part.text:
+      num_chars += len(part.text)
+    elif part.function_call:
+      num_chars += len(part.function_call.name or '')
+      num_chars += len(str(part.function_call.args or ''))
+    elif part.function_response:
+      num_chars += len(part.function_response.name or '')
+      num_chars += len(str(part.function_response.response or ''))
+    elif part.executable_code:
+      num_chars += len(part.executable_code.code or '')
+    elif part.code_execution_result:
+      num_chars += len(part.code_execution_result.output or '')
+    elif part.inline_data or part.file_data:
+      num_tokens += _TOKENS_PER_MEDIA_PART
+  return num_tokens + (num_chars + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
 
 
 def _get_current_turn_contents(
@@ -275,12 +534,54 @@ def _get_current_turn_contents(
     for proper tool execution while excluding conversation history.
   """
   # Find the latest event that starts the current turn and process from there
+  start = _find_current_turn_start(events, agent_name)
+  if start is None:
+    return []
+  return _get_contents(current_branch, events[start:], agent_name)
+
+
+def _find_current_turn_start(
+    events: list[Event], agent_name: str = ''
+) -> Optional[int]:
+  """Finds the index of the latest event that starts the current turn."""
   for i in range(len(events) - 1, -1, -1):
     event = events[i]
     if event.author == 'user' or _is_other_agent_reply(agent_name, event):
-      return _get_contents(current_branch, events[i:], agent_name)
+      return i
+  return None
 
-  return []
+
+async def _build_history_contents(
+    session: Session,
+    builder: _ContentsBuilder,
+    context_window: Optional[ContextWindowConfig],
+) -> list[types.Content]:
+  """Builds the contents of the conversation history.
+
+  Older session events are only paged in while they may fit in the context
+  window. Without a context window, or with pinned events, which may be
+  anywhere in the history, all of them are loaded.
+  """
+  if not context_window or context_window.pinned:
+    await session.load_older_events()
+    return builder.build(session.events, context_window)
+  page_size = _HISTORY_PAGE_SIZE
+  while True:
+    request_contents = builder.build(session.events, context_window)
+    if builder.is_context_window_full or not session.has_older_events:
+      return request_contents
+    await session.load_older_events(page_size)
+    # The contents are rebuilt from scratch after loading older events.
+    page_size *= 2
+
+
+async def _load_current_turn_events(session: Session, agent_name: str) -> None:
+  """Loads older session events until the start of the current turn."""
+  if not session.has_older_events:
+    return
+  async for event in session.iter_events_reversed(_CURRENT_TURN_PAGE_SIZE):
+    if event.author == 'user' or _is_other_agent_reply(agent_name, event):
+      return
 
 
 def _is_other_agent_reply(current_agent_name: str, event: Event) -> bool:
@@ -21,8 +21,11 @@ import inspect
 import logging
 from typing import Any
 from typing import AsyncGenerator
+from typing import Awaitable
 from typing import cast
 from typing import Optional
+from typing import TYPE_CHECKING
+from typing import TypeVar
 import uuid
 
 from google.genai import types
@@ -38,11 +41,16 @@ from ...telemetry import tracer
 from ...tools.base_tool import BaseTool
 from ...tools.tool_context import ToolContext
 
+if TYPE_CHECKING:
+  from ...agents.llm_agent import LlmAgent
+
 AF_FUNCTION_CALL_ID_PREFIX = 'adk-'
 REQUEST_EUC_FUNCTION_CALL_NAME = 'adk_request_credential'
 
 logger = logging.getLogger('google_adk.' + __name__)
 
+_T = TypeVar('_T')
+
 
 def generate_client_function_call_id() -> str:
   return f'{AF_FUNCTION_CALL_ID_PREFIX}{uuid.uuid4()}'
@@ -136,67 +144,33 @@ async def handle_function_calls_async(
   if not isinstance(agent, LlmAgent):
     return
 
-  function_calls = function_call_event.get_function_calls()
-
-  function_response_events: list[Event] = []
-  for function_call in function_calls:
-    if filters and function_call.id not in filters:
-      continue
-    tool, tool_context = _get_tool_and_context(
-        invocation_context,
-        function_call_event,
-        function_call,
-        tools_dict,
-    )
-
-    with tracer.start_as_current_span(f'execute_tool {tool.name}'):
-      # do not use "args" as the variable name, because it is a reserved keyword
-      # in python debugger.
-      function_args = function_call.args or {}
-      function_response: Optional[dict] = None
-
-      for callback in agent.canonical_before_tool_callbacks:
-        function_response = callback(
-            tool=tool, args=function_args, tool_context=tool_context
-        )
-        if inspect.isawaitable(function_response):
-          function_response = await function_response
-        if function_response:
-          break
-
-      if not function_response:
-        function_response = await __call_tool_async(
-            tool, args=function_args, tool_context=tool_context
-        )
-
-      for callback in agent.canonical_after_tool_callbacks:
-        altered_function_response = callback(
-            tool=tool,
-            args=function_args,
-            tool_context=tool_context,
-            tool_response=function_response,
-        )
-        if inspect.isawaitable(altered_function_response):
-          altered_function_response = await altered_function_response
-        if altered_function_response is not None:
-          function_response = altered_function_response
-          break
-
-      if tool.is_long_running:
-        # Allow long running function to return None to not provide function response.
-        if not function_response:
-          continue
-
-      # Builds the function response event.
-      function_response_event = __build_response_event(
-          tool, function_response, tool_context, invocation_context
+  function_calls = [
+      function_call
+      for function_call in function_call_event.get_function_calls()
+      if not filters or function_call.id in filters
+  ]
+
+  # Runs the function calls concurrently and keeps the responses in the order
+  # of the calls.
+  function_response_events = [
+      function_response_event
+      for function_response_event in await _gather_with_concurrency_limit(
+          [
+              _execute_function_call_async(
+                  invocation_context,
+                  function_call_event,
+                  function_call,
+                  tools_dict,
+                  agent,
+              )
+              for function_call in function_calls
+          ],
+          invocation_context.run_config.max_concurrent_function_calls
+          if invocation_context.run_config
+          else None,
       )
-      trace_tool_call(
-          tool=tool,
-          args=function_args,
-          function_response_event=function_response_event,
-      )
-      function_response_events.append(function_response_event)
+      if function_response_event
+  ]
 
   if not function_response_events:
     return None
@@ -216,6 +190,100 @@ async def handle_function_calls_async(
   return merged_event
 
 
+async def _execute_function_call_async(
+    invocation_context: InvocationContext,
+    function_call_event: Event,
+    function_call: types.FunctionCall,
+    tools_dict: dict[str, BaseTool],
+    agent: LlmAgent,
+) -> Optional[Event]:
+  """Calls a function with the tool callbacks and returns its response event."""
+  tool, tool_context = _get_tool_and_context(
+      invocation_context,
+      function_call_event,
+      function_call,
+      tools_dict,
+  )
+
+  with tracer.start_as_current_span(f'execute_tool {tool.name}'):
+    # do not use "args" as the variable name, because it is a reserved keyword
+    # in python debugger.
+    function_args = function_call.args or {}
+    function_response: Optional[dict] = None
+
+    for callback in agent.canonical_before_tool_callbacks:
+      function_response = callback(
+          tool=tool, args=function_args, tool_context=tool_context
+      )
+      if inspect.isawaitable(function_response):
+        function_response = await function_response
+      if function_response:
+        break
+
+    if not function_response:
+      function_response = await __call_tool_async(
+          tool, args=function_args, tool_context=tool_context
+      )
+
+    for callback in agent.canonical_after_tool_callbacks:
+      altered_function_response = callback(
+          tool=tool,
+          args=function_args,
+          tool_context=tool_context,
+          tool_response=function_response,
+      )
+      if inspect.isawaitable(altered_function_response):
+        altered_function_response = await altered_function_response
+      if altered_function_response is not None:
+        function_response = altered_function_response
+        break
+
+    if tool.is_long_running:
+      # Allow long running function to return None to not provide function response.
+      if not function_response:
+        return None
+
+    # Builds the function response event.
+    function_response_event = __build_response_event(
+        tool, function_response, tool_context, invocation_context
+    )
+    trace_tool_call(
+        tool=tool,
+        args=function_args,
+        function_response_event=function_response_event,
+    )
+    return function_response_event
+
+
+async def _gather_with_concurrency_limit(
+    coroutines: list[Awaitable[_T]], limit: Optional[int]
+) -> list[_T]:
+  """Awaits the coroutines concurrently, returning results in their order.
+
+  At most `limit` coroutines run at a time if set. If any coroutine fails, the
+  others are cancelled and the error is raised.
+  """
+  if len(coroutines) == 1:
+    return [await coroutines[0]]
+
+  semaphore = asyncio.Semaphore(limit) if limit is not None else None
+
+  async def run(coroutine: Awaitable[_T]) -> _T:
+    if semaphore is None:
+      return await coroutine
+    async with semaphore:
+      return await coroutine
+
+  tasks = [asyncio.ensure_future(run(coroutine)) for coroutine in coroutines]
+  try:
+    return await asyncio.gather(*tasks)
+  except BaseException:
+    for task in tasks:
+      task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    raise
+
+
 async def handle_function_calls_live(
     invocation_context: InvocationContext,
     function_call_event: Event,
@@ -15,18 +15,27 @@
 
 from __future__ import annotations
 
+import asyncio
+import collections
 import contextlib
+import dataclasses
 from functools import cached_property
+import hashlib
 import logging
 import os
 import sys
+import time
 from typing import AsyncGenerator
 from typing import cast
+from typing import Optional
 from typing import TYPE_CHECKING
 from typing import Union
 
 from google.genai import Client
+from google.genai import errors
 from google.genai import types
+from pydantic import Field
+from pydantic import PrivateAttr
 from typing_extensions import override
 
 from .. import version
@@ -46,6 +55,27 @@ _EXCLUDED_PART_FIELD = {'inline_data': {'data'}}
 _AGENT_ENGINE_TELEMETRY_TAG = 'remote_reasoning_engine'
 _AGENT_ENGINE_TELEMETRY_ENV_VARIABLE_NAME = 'GOOGLE_CLOUD_AGENT_ENGINE_ID'
 
+_MIN_CONTEXT_CACHE_TOKENS = 1024
+"""The fewest tokens the API caches, estimated at four characters a token."""
+
+_MAX_CONTEXT_CACHES = 256
+"""The maximum number of context caches a model keeps track of."""
+
+_CONTEXT_CACHE_EXPIRY_MARGIN_SECONDS = 10
+"""Context caches expiring sooner are not used anymore."""
+
+_CONTEXT_CACHE_NOT_FOUND_CODE = 404
+"""The error code of requests using a deleted or expired context cache."""
+
+
+@dataclasses.dataclass
+class _ContextCache:
+  """A context cache created for a system instruction and tools."""
+
+  name: str
+  expire_time: float
+  """The expiry time as seconds since the epoch."""
+
 
 class Gemini(BaseLlm):
   """Integration for Gemini models.
@@ -56,6 +86,27 @@ class Gemini(BaseLlm):
 
   model: str = 'gemini-1.5-flash'
 
+  context_cache_ttl: Optional[int] = Field(default=None, gt=0)
+  """If set, the system instruction and tools of requests are cached with the
+  API for this many seconds, and reused by requests with the same ones.
+
+  Caches are refreshed while in use. Requests whose system instruction and
+  tools are too small to be cached, or whose caches can't be created, are sent
+  without a cache.
+  """
+
+  _context_caches: collections.OrderedDict[str, Optional[_ContextCache]] = (
+      PrivateAttr(default_factory=collections.OrderedDict)
+  )
+  """The context caches by the hash of what they cache, None if they couldn't
+  be created."""
+
+  _context_cache_updates: dict[str, asyncio.Future[Optional[_ContextCache]]] = (
+      PrivateAttr(default_factory=dict)
+  )
+  """The pending creations or refreshes of context caches by their key, shared
+  by concurrent requests with the same system instruction and tools."""
+
   @staticmethod
   @override
   def supported_models() -> list[str]:
@@ -102,12 +153,9 @@ class Gemini(BaseLlm):
         llm_request.config.http_options.headers = {}
       llm_request.config.http_options.headers.update(self._tracking_headers)
 
+    config, cache_key = await self._get_cached_config(llm_request)
     if stream:
-      responses = await self.api_client.aio.models.generate_content_stream(
-          model=llm_request.model,
-          contents=llm_request.contents,
-          config=llm_request.config,
-      )
+      responses = self._generate_content_stream(llm_request, config, cache_key)
       response = None
       thought_text = ''
       text = ''
@@ -167,13 +215,201 @@ class Gemini(BaseLlm):
         )
 
     else:
-      response = await self.api_client.aio.models.generate_content(
+      try:
+        response = await self.api_client.aio.models.generate_content(
+            model=llm_request.model,
+            contents=llm_request.contents,
+            config=config,
+        )
+      except errors.APIError as e:
+        if not self._is_context_cache_missing(e, cache_key):
+          raise
+        response = await self.api_client.aio.models.generate_content(
+            model=llm_request.model,
+            contents=llm_request.contents,
+            config=llm_request.config,
+        )
+      logger.info(_build_response_log(response))
+      yield LlmResponse.create(response)
+
+  async def _generate_content_stream(
+      self,
+      llm_request: LlmRequest,
+      config: Optional[types.GenerateContentConfig],
+      cache_key: Optional[str],
+  ) -> AsyncGenerator[types.GenerateContentResponse, None]:
+    """Streams the responses, without the context cache if it's missing.
+
+    The request is only sent when the first response is fetched, so that is
+    where a missing context cache fails.
+    """
+    try:
+      responses = await self.api_client.aio.models.generate_content_stream(
+          model=llm_request.model,
+          contents=llm_request.contents,
+          config=config,
+      )
+      first_response = await responses.__anext__()
+    except StopAsyncIteration:
+      return
+    except errors.APIError as e:
+      if not self._is_context_cache_missing(e, cache_key):
+        raise
+      responses = await self.api_client.aio.models.generate_content_stream(
           model=llm_request.model,
           contents=llm_request.contents,
           config=llm_request.config,
       )
-      logger.info(_build_response_log(response))
-      yield LlmResponse.create(response)
+      try:
+        first_response = await responses.__anext__()
+      except StopAsyncIteration:
+        return
+    yield first_response
+    async for response in responses:
+      yield response
+
+  async def _get_cached_config(
+      self, llm_request: LlmRequest
+  ) -> tuple[Optional[types.GenerateContentConfig], Optional[str]]:
+    """Gets the request config using a context cache, if enabled.
+
+    Args:
+      llm_request: The request to send.
+
+    Returns:
+      The config to send, and the key of its context cache if it uses one.
+    """
+    config = llm_request.config
+    if (
+        not self.context_cache_ttl
+        or not config
+        or config.cached_content
+        or not (config.system_instruction or config.tools)
+    ):
+      return config, None
+
+    cache_config = types.CreateCachedContentConfig(
+        system_instruction=config.system_instruction,
+        tools=config.tools,
+        tool_config=config.tool_config,
+    )
+    serialized = cache_config.model_dump_json(exclude_none=True)
+    if len(serialized) < _MIN_CONTEXT_CACHE_TOKENS * 4:
+      return config, None
+    key = hashlib.sha256(
+        f'{llm_request.model}\n{serialized}'.encode()
+    ).hexdigest()
+
+    cache = await self._get_context_cache(key, llm_request.model, cache_config)
+    if cache is None:
+      return config, None
+    return (
+        config.model_copy(
+            update={
+                'cached_content': cache.name,
+                'system_instruction': None,
+                'tools': None,
+                'tool_config': None,
+            }
+        ),
+        key,
+    )
+
+  async def _get_context_cache(
+      self,
+      key: str,
+      model: str,
+      cache_config: types.CreateCachedContentConfig,
+  ) -> Optional[_ContextCache]:
+    """Gets a usable context cache, creating or refreshing it as needed."""
+    if key in self._context_caches:
+      self._context_caches.move_to_end(key)
+      cache = self._context_caches[key]
+      if cache is None:
+        return None
+      if cache.expire_time - time.time() > self.context_cache_ttl / 2:
+        return cache
+    update = self._context_cache_updates.get(key)
+    if update is None:
+      update = asyncio.ensure_future(
+          self._update_context_cache(key, model, cache_config)
+      )
+      self._context_cache_updates[key] = update
+      update.add_done_callback(
+          lambda _: self._context_cache_updates.pop(key, None)
+      )
+    # Other requests still share the update if this one is cancelled.
+    return await asyncio.shield(update)
+
+  async def _update_context_cache(
+      self,
+      key: str,
+      model: str,
+      cache_config: types.CreateCachedContentConfig,
+  ) -> Optional[_ContextCache]:
+    """Refreshes the context cache of a key, or creates a new one."""
+    ttl = f'{self.context_cache_ttl}s'
+    now = time.time()
+    cache = self._context_caches.get(key)
+    if cache is not None:
+      remaining = cache.expire_time - now
+      if remaining > _CONTEXT_CACHE_EXPIRY_MARGIN_SECONDS:
+        try:
+          cached_content = await self.api_client.aio.caches.update(
+              name=cache.name,
+              config=types.UpdateCachedContentConfig(ttl=ttl),
+          )
+          cache.expire_time = _get_expire_time(
+              cached_content, now, self.context_cache_ttl
+          )
+          return cache
+        except errors.APIError as e:
+          logger.warning(
+              'Failed to refresh context cache %s: %s', cache.name, e
+          )
+
+    try:
+      cached_content = await self.api_client.aio.caches.create(
+          model=model, config=cache_config.model_copy(update={'ttl': ttl})
+      )
+      cache = _ContextCache(
+          name=cached_content.name,
+          expire_time=_get_expire_time(
+              cached_content, now, self.context_cache_ttl
+          ),
+      )
+    except errors.ClientError as e:
+      # E.g. the model doesn't support caching or the content is too small,
+      # which retrying won't change.
+      logger.warning('Failed to create context cache: %s', e)
+      cache = None
+    except errors.APIError as e:
+      logger.warning('Failed to create context cache: %s', e)
+      return None
+    self._context_caches[key] = cache
+    while len(self._context_caches) > _MAX_CONTEXT_CACHES:
+      self._context_caches.popitem(last=False)
+    return cache
+
+  def _is_context_cache_missing(
+      self, error: errors.APIError, cache_key: Optional[str]
+  ) -> bool:
+    """Whether a request failed since its context cache no longer exists.
+
+    Forgets the context cache if so, so that a new one is created next time.
+    The Gemini API reports missing caches as not found, or as permission
+    denied with a message about the cached content.
+    """
+    if cache_key is None:
+      return False
+    if error.code != _CONTEXT_CACHE_NOT_FOUND_CODE and not (
+        error.code == 403
+        and 'cachedcontent' in (error.message or '').lower()
+    ):
+      return False
+    logger.warning('Context cache is unavailable, retrying without: %s', error)
+    self._context_caches.pop(cache_key, None)
+    return True
 
   @cached_property
   def api_client(self) -> Client:
@@ -278,6 +514,15 @@ class Gemini(BaseLlm):
             _remove_display_name_if_present(part.file_data)
 
 
+def _get_expire_time(
+    cached_content: types.CachedContent, now: float, ttl: int
+) -> float:
+  """Gets the expiry time of a context cache as seconds since the epoch."""
+  if cached_content.expire_time:
+    return cached_content.expire_time.timestamp()
+  return now + ttl
+
+
 def _build_function_declaration_log(
     func_decl: types.FunctionDeclaration,
 ) -> str:
@@ -41,6 +41,7 @@ from .memory.base_memory_service import BaseMemoryService
 from .memory.in_memory_memory_service import InMemoryMemoryService
 from .platform.thread import create_thread
 from .sessions.base_session_service import BaseSessionService
+from .sessions.base_session_service import GetSessionConfig
 from .sessions.in_memory_session_service import InMemorySessionService
 from .sessions.session import Session
 from .telemetry import tracer
@@ -179,7 +180,14 @@ class Runner:
     """
     with tracer.start_as_current_span('invocation'):
       session = await self.session_service.get_session(
-          app_name=self.app_name, user_id=user_id, session_id=session_id
+          app_name=self.app_name,
+          user_id=user_id,
+          session_id=session_id,
+          config=GetSessionConfig(
+              num_recent_events=run_config.session_events_page_size
+          )
+          if run_config.session_events_page_size
+          else None,
       )
       if not session:
         raise ValueError(f'Session not found: {session_id}')
@@ -199,11 +207,28 @@ class Runner:
             run_config.save_input_blobs_as_artifacts,
         )
 
-      invocation_context.agent = self._find_agent_to_run(session, root_agent)
-      async for event in invocation_context.agent.run_async(invocation_context):
-        if not event.partial:
-          await self.session_service.append_event(session=session, event=event)
-        yield event
+      agent_to_run = self._find_agent_to_run_in_loaded_events(
+          session, root_agent
+      )
+      while agent_to_run is None and session.has_older_events:
+        # Doubles the loaded events each time to keep the scans linear.
+        await session.load_older_events(max(len(session.events), 1))
+        agent_to_run = self._find_agent_to_run_in_loaded_events(
+            session, root_agent
+        )
+      invocation_context.agent = agent_to_run or root_agent
+      try:
+        async for event in invocation_context.agent.run_async(
+            invocation_context
+        ):
+          if not event.partial:
+            await self.session_service.append_event(
+                session=session, event=event
+            )
+          yield event
+      finally:
+        # E.g. group commits the events buffered during this invocation.
+        await self.session_service.flush(session)
 
   async def _append_new_message_to_session(
       self,
@@ -368,6 +393,20 @@ class Runner:
     Returns:
       The agent of the last message in the session or the root agent.
     """
+    # Falls back to root agent if no suitable agents are found in the session.
+    return (
+        self._find_agent_to_run_in_loaded_events(session, root_agent)
+        or root_agent
+    )
+
+  def _find_agent_to_run_in_loaded_events(
+      self, session: Session, root_agent: BaseAgent
+  ) -> Optional[BaseAgent]:
+    """Finds the agent to run based on the events loaded in the session.
+
+    Returns None if the loaded events do not determine the agent, in which
+    case older events may, if the session has any.
+    """
     # If the last event is a function response, should send this response to
     # the agent that returned the corressponding function call regardless the
     # type of the agent. e.g. a remote a2a agent may surface a credential
@@ -375,6 +414,13 @@ class Runner:
     event = find_matching_function_call(session.events)
     if event and event.author:
       return root_agent.find_agent(event.author)
+    if (
+        session.has_older_events
+        and session.events
+        and session.events[-1].get_function_responses()
+    ):
+      # The matching function call is in the events not loaded yet.
+      return None
     for event in filter(lambda e: e.author != 'user', reversed(session.events)):
       if event.author == root_agent.name:
         # Found root agent.
@@ -389,8 +435,7 @@ class Runner:
         continue
       if self._is_transferable_across_agent_tree(agent):
         return agent
-    # Falls back to root agent if no suitable agents are found in the session.
-    return root_agent
+    return None
 
   def _is_transferable_across_agent_tree(self, agent_to_run: BaseAgent) -> bool:
     """Whether the agent to run can transfer to any other agent in the agent tree.
@@ -18,6 +18,7 @@ from .in_memory_session_service import InMemorySessionService
 from .session import Session
 from .state import State
 from .vertex_ai_session_service import VertexAiSessionService
+from .write_behind_session_service import WriteBehindSessionService
 
 logger = logging.getLogger('google_adk.' + __name__)
 
@@ -28,6 +29,7 @@ __all__ = [
     'Session',
     'State',
     'VertexAiSessionService',
+    'WriteBehindSessionService',
 ]
 
 try:
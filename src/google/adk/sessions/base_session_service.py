@@ -28,7 +28,11 @@ class GetSessionConfig(BaseModel):
   """The configuration of getting a session."""
 
   num_recent_events: Optional[int] = None
+  """If set, only loads the most recent events. Services that support paging
+  let the caller load older events on demand through
+  `Session.load_older_events`, unless `after_timestamp` is also set."""
   after_timestamp: Optional[float] = None
+  """If set, only loads the events at or after this timestamp."""
 
 
 class ListSessionsResponse(BaseModel):
@@ -99,6 +103,25 @@ class BaseSessionService(abc.ABC):
     session.events.append(event)
     return event
 
+  async def append_events(
+      self, session: Session, events: list[Event]
+  ) -> list[Event]:
+    """Appends events to a session object in order.
+
+    Services that can persist several events in one write override this to
+    group them into a single commit.
+    """
+    for event in events:
+      await self.append_event(session=session, event=event)
+    return events
+
+  async def flush(self, session: Session) -> None:
+    """Persists the pending writes of a session, if the service has any.
+
+    `Runner` calls this when an invocation ends. Services that write
+    immediately don't need to override it.
+    """
+
   def __update_session_state(self, session: Session, event: Event) -> None:
     """Updates the session state based on the event."""
     if not event.actions or not event.actions.state_delta:
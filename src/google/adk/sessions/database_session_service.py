@@ -13,27 +13,42 @@
 # limitations under the License.
 from __future__ import annotations
 
+import asyncio
 import copy
 from datetime import datetime
 from datetime import timezone
 import json
 import logging
 from typing import Any
+from typing import Awaitable
+from typing import Callable
 from typing import Optional
+from typing import TypeVar
+from typing import Union
 import uuid
 
 from google.genai import types
+from sqlalchemy import and_
 from sqlalchemy import Boolean
 from sqlalchemy import delete
 from sqlalchemy import Dialect
 from sqlalchemy import ForeignKeyConstraint
 from sqlalchemy import func
+from sqlalchemy import or_
+from sqlalchemy import select
 from sqlalchemy import Text
+from sqlalchemy import type_coerce
+from sqlalchemy import update
 from sqlalchemy.dialects import mysql
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.engine import create_engine
 from sqlalchemy.engine import Engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import ArgumentError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import DeclarativeBase
@@ -42,6 +57,7 @@ from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import Session as DatabaseSessionFactory
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.schema import MetaData
 from sqlalchemy.types import DateTime
 from sqlalchemy.types import PickleType
@@ -63,11 +79,14 @@ logger = logging.getLogger("google_adk." + __name__)
 DEFAULT_MAX_KEY_LENGTH = 128
 DEFAULT_MAX_VARCHAR_LENGTH = 256
 
+_T = TypeVar("_T")
+
 
 class DynamicJSON(TypeDecorator):
   """A JSON-like type that uses JSONB on PostgreSQL and TEXT with JSON serialization for other databases."""
 
   impl = Text  # Default implementation is TEXT
+  cache_ok = True
 
   def load_dialect_impl(self, dialect: Dialect):
     if dialect.name == "postgresql":
@@ -153,12 +172,7 @@ class StorageSession(Base):
   @property
   def update_timestamp_tz(self) -> datetime:
     """Returns the time zone aware update timestamp."""
-    if self._dialect_name == "sqlite":
-      # SQLite does not support timezone. SQLAlchemy returns a naive datetime
-      # object without timezone information. We need to convert it to UTC
-      # manually.
-      return self.update_time.replace(tzinfo=timezone.utc).timestamp()
-    return self.update_time.timestamp()
+    return _to_timestamp_tz(self.update_time, self._dialect_name)
 
 
 class StorageEvent(Base):
@@ -318,16 +332,37 @@ class StorageUserState(Base):
 
 
 class DatabaseSessionService(BaseSessionService):
-  """A session service that uses a database for storage."""
+  """A session service that uses a database for storage.
+
+  The service runs on a synchronous SQLAlchemy engine by default. When the
+  database URL names an asyncio driver, e.g. ``sqlite+aiosqlite://`` or
+  ``postgresql+asyncpg://``, it runs on an ``AsyncEngine`` instead so that
+  database round trips do not block the event loop. Both modes share the same
+  storage schema.
+
+  Databases with a single shared connection, e.g. in-memory SQLite, run one
+  database session at a time in async mode.
+  """
 
   def __init__(self, db_url: str, **kwargs: Any):
-    """Initializes the database session service with a database URL."""
+    """Initializes the database session service with a database URL.
+
+    Args:
+      db_url: The database URL.
+      **kwargs: Extra arguments forwarded to the engine factory, e.g.
+        `pool_size`, `max_overflow` and `pool_timeout` to size the connection
+        pool.
+    """
     # 1. Create DB engine for db connection
     # 2. Create all tables based on schema
     # 3. Initialize all properties
 
     try:
-      db_engine = create_engine(db_url, **kwargs)
+      is_async = make_url(db_url).get_dialect().is_async
+      if is_async:
+        db_engine = create_async_engine(db_url, **kwargs)
+      else:
+        db_engine = create_engine(db_url, **kwargs)
     except Exception as e:
       if isinstance(e, ArgumentError):
         raise ValueError(
@@ -345,8 +380,25 @@ class DatabaseSessionService(BaseSessionService):
     local_timezone = get_localzone()
     logger.info(f"Local timezone: {local_timezone}")
 
-    self.db_engine: Engine = db_engine
+    self.db_engine: Union[Engine, AsyncEngine] = db_engine
     self.metadata: MetaData = MetaData()
+    self._is_async = is_async
+
+    if is_async:
+      # Inspecting an async engine requires a running event loop, and the
+      # tables are created on first use for the same reason.
+      self.inspector = None
+      self.async_session_factory: async_sessionmaker[AsyncSession] = (
+          async_sessionmaker(bind=self.db_engine)
+      )
+      self._tables_created = False
+      self._tables_lock: Optional[asyncio.Lock] = None
+      # A StaticPool, e.g. of an in-memory SQLite database, has one connection
+      # that concurrent database sessions would interleave statements on.
+      self._serialize_sessions = isinstance(self.db_engine.pool, StaticPool)
+      self._sessions_lock: Optional[asyncio.Lock] = None
+      return
+
     self.inspector = inspect(self.db_engine)
 
     # DB session factory method
@@ -358,6 +410,44 @@ class DatabaseSessionService(BaseSessionService):
     # Base.metadata.drop_all(self.db_engine)
     Base.metadata.create_all(self.db_engine)
 
+  async def _prepare_tables(self) -> None:
+    """Creates all tables on the async engine if not done yet."""
+    if self._tables_created:
+      return
+    if self._tables_lock is None:
+      self._tables_lock = asyncio.Lock()
+    async with self._tables_lock:
+      if self._tables_created:
+        return
+      async with self.db_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+      self._tables_created = True
+
+  async def _run_in_database_session(
+      self, fn: Callable[..., _T], *args: Any
+  ) -> _T:
+    """Runs `fn(database_session, *args)` within a new database session.
+
+    In async mode `fn` runs through `AsyncSession.run_sync`, so its ORM calls
+    are executed by the asyncio driver without blocking the event loop.
+    """
+    if self._is_async:
+      await self._prepare_tables()
+      if not self._serialize_sessions:
+        return await self._run_in_async_session(fn, *args)
+      if self._sessions_lock is None:
+        self._sessions_lock = asyncio.Lock()
+      async with self._sessions_lock:
+        return await self._run_in_async_session(fn, *args)
+    with self.database_session_factory() as session_factory:
+      return fn(session_factory, *args)
+
+  async def _run_in_async_session(
+      self, fn: Callable[..., _T], *args: Any
+  ) -> _T:
+    async with self.async_session_factory() as session_factory:
+      return await session_factory.run_sync(fn, *args)
+
   @override
   async def create_session(
       self,
@@ -366,6 +456,18 @@ class DatabaseSessionService(BaseSessionService):
       user_id: str,
       state: Optional[dict[str, Any]] = None,
       session_id: Optional[str] = None,
+  ) -> Session:
+    return await self._run_in_database_session(
+        self._create_session_sync, app_name, user_id, state, session_id
+    )
+
+  def _create_session_sync(
+      self,
+      session_factory: DatabaseSessionFactory,
+      app_name: str,
+      user_id: str,
+      state: Optional[dict[str, Any]],
+      session_id: Optional[str],
   ) -> Session:
     # 1. Populate states.
     # 2. Build storage session object
@@ -373,64 +475,62 @@ class DatabaseSessionService(BaseSessionService):
     # 4. Build the session object with generated id
     # 5. Return the session
 
-    with self.database_session_factory() as session_factory:
-
-      # Fetch app and user states from storage
-      storage_app_state = session_factory.get(StorageAppState, (app_name))
-      storage_user_state = session_factory.get(
-          StorageUserState, (app_name, user_id)
-      )
-
-      app_state = storage_app_state.state if storage_app_state else {}
-      user_state = storage_user_state.state if storage_user_state else {}
-
-      # Create state tables if not exist
-      if not storage_app_state:
-        storage_app_state = StorageAppState(app_name=app_name, state={})
-        session_factory.add(storage_app_state)
-      if not storage_user_state:
-        storage_user_state = StorageUserState(
-            app_name=app_name, user_id=user_id, state={}
-        )
-        session_factory.add(storage_user_state)
-
-      # Extract state deltas
-      app_state_delta, user_state_delta, session_state = _extract_state_delta(
-          state
-      )
-
-      # Apply state delta
-      app_state.update(app_state_delta)
-      user_state.update(user_state_delta)
+    # Fetch app and user states from storage
+    storage_app_state = session_factory.get(StorageAppState, (app_name))
+    storage_user_state = session_factory.get(
+        StorageUserState, (app_name, user_id)
+    )
 
-      # Store app and user state
-      if app_state_delta:
-        storage_app_state.state = app_state
-      if user_state_delta:
-        storage_user_state.state = user_state
+    app_state = storage_app_state.state if storage_app_state else {}
+    user_state = storage_user_state.state if storage_user_state else {}
 
-      # Store the session
-      storage_session = StorageSession(
-          app_name=app_name,
-          user_id=user_id,
-          id=session_id,
-          state=session_state,
+    # Create state tables if not exist
+    if not storage_app_state:
+      storage_app_state = StorageAppState(app_name=app_name, state={})
+      session_factory.add(storage_app_state)
+    if not storage_user_state:
+      storage_user_state = StorageUserState(
+          app_name=app_name, user_id=user_id, state={}
       )
-      session_factory.add(storage_session)
-      session_factory.commit()
+      session_factory.add(storage_user_state)
 
-      session_factory.refresh(storage_session)
+    # Extract state deltas
+    app_state_delta, user_state_delta, session_state = _extract_state_delta(
+        state
+    )
 
-      # Merge states for response
-      merged_state = _merge_state(app_state, user_state, session_state)
-      session = Session(
-          app_name=str(storage_session.app_name),
-          user_id=str(storage_session.user_id),
-          id=str(storage_session.id),
-          state=merged_state,
-          last_update_time=storage_session.update_timestamp_tz,
-      )
-      return session
+    # Apply state delta
+    app_state.update(app_state_delta)
+    user_state.update(user_state_delta)
+
+    # Store app and user state
+    if app_state_delta:
+      storage_app_state.state = app_state
+    if user_state_delta:
+      storage_user_state.state = user_state
+
+    # Store the session
+    storage_session = StorageSession(
+        app_name=app_name,
+        user_id=user_id,
+        id=session_id,
+        state=session_state,
+    )
+    session_factory.add(storage_session)
+    session_factory.commit()
+
+    session_factory.refresh(storage_session)
+
+    # Merge states for response
+    merged_state = _merge_state(app_state, user_state, session_state)
+    session = Session(
+        app_name=str(storage_session.app_name),
+        user_id=str(storage_session.user_id),
+        id=str(storage_session.id),
+        state=merged_state,
+        last_update_time=storage_session.update_timestamp_tz,
+    )
+    return session
 
   @override
   async def get_session(
@@ -440,97 +540,159 @@ class DatabaseSessionService(BaseSessionService):
       user_id: str,
       session_id: str,
       config: Optional[GetSessionConfig] = None,
+  ) -> Optional[Session]:
+    return await self._run_in_database_session(
+        self._get_session_sync, app_name, user_id, session_id, config
+    )
+
+  def _get_session_sync(
+      self,
+      session_factory: DatabaseSessionFactory,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      config: Optional[GetSessionConfig],
   ) -> Optional[Session]:
     # 1. Get the storage session entry from session table
     # 2. Get all the events based on session id and filtering config
     # 3. Convert and return the session
-    with self.database_session_factory() as session_factory:
-      storage_session = session_factory.get(
-          StorageSession, (app_name, user_id, session_id)
-      )
-      if storage_session is None:
-        return None
+    storage_session = session_factory.get(
+        StorageSession, (app_name, user_id, session_id)
+    )
+    if storage_session is None:
+      return None
+
+    after_timestamp = config.after_timestamp if config else None
+    num_recent_events = config.num_recent_events if config else None
+    storage_events = _query_events(
+        session_factory,
+        app_name,
+        user_id,
+        session_id,
+        after_timestamp=after_timestamp,
+        # One extra row tells whether older events remain.
+        limit=num_recent_events + 1 if num_recent_events else None,
+    )
+    has_older_events = False
+    if num_recent_events and len(storage_events) > num_recent_events:
+      storage_events = storage_events[:num_recent_events]
+      has_older_events = not after_timestamp
+
+    # Fetch states from storage
+    storage_app_state = session_factory.get(StorageAppState, (app_name))
+    storage_user_state = session_factory.get(
+        StorageUserState, (app_name, user_id)
+    )
 
-      if config and config.after_timestamp:
-        after_dt = datetime.fromtimestamp(config.after_timestamp)
-        timestamp_filter = StorageEvent.timestamp >= after_dt
-      else:
-        timestamp_filter = True
-
-      storage_events = (
-          session_factory.query(StorageEvent)
-          .filter(StorageEvent.app_name == app_name)
-          .filter(StorageEvent.session_id == storage_session.id)
-          .filter(StorageEvent.user_id == user_id)
-          .filter(timestamp_filter)
-          .order_by(StorageEvent.timestamp.desc())
-          .limit(
-              config.num_recent_events
-              if config and config.num_recent_events
-              else None
-          )
-          .all()
+    app_state = storage_app_state.state if storage_app_state else {}
+    user_state = storage_user_state.state if storage_user_state else {}
+    session_state = storage_session.state
+
+    # Merge states
+    merged_state = _merge_state(app_state, user_state, session_state)
+
+    # Convert storage session to session
+    session = Session(
+        app_name=app_name,
+        user_id=user_id,
+        id=session_id,
+        state=merged_state,
+        last_update_time=storage_session.update_timestamp_tz,
+    )
+    session.events = [e.to_event() for e in reversed(storage_events)]
+    if has_older_events:
+      oldest_event = storage_events[-1]
+      session._older_events_loader = self._make_older_events_loader(
+          app_name,
+          user_id,
+          session_id,
+          (oldest_event.timestamp, oldest_event.id),
       )
+    return session
 
-      # Fetch states from storage
-      storage_app_state = session_factory.get(StorageAppState, (app_name))
-      storage_user_state = session_factory.get(
-          StorageUserState, (app_name, user_id)
+  def _make_older_events_loader(
+      self,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      cursor: tuple[datetime, str],
+  ) -> Callable[[Optional[int]], Awaitable[tuple[list[Event], bool]]]:
+    """Returns a loader paging through the events before `cursor`."""
+
+    async def load(num_events: Optional[int]) -> tuple[list[Event], bool]:
+      nonlocal cursor
+      storage_events = await self._run_in_database_session(
+          _query_events,
+          app_name,
+          user_id,
+          session_id,
+          None,
+          cursor,
+          num_events + 1 if num_events else None,
       )
+      has_more = bool(num_events) and len(storage_events) > num_events
+      if has_more:
+        storage_events = storage_events[:num_events]
+      if storage_events:
+        cursor = (storage_events[-1].timestamp, storage_events[-1].id)
+      return [e.to_event() for e in reversed(storage_events)], has_more
 
-      app_state = storage_app_state.state if storage_app_state else {}
-      user_state = storage_user_state.state if storage_user_state else {}
-      session_state = storage_session.state
+    return load
 
-      # Merge states
-      merged_state = _merge_state(app_state, user_state, session_state)
+  @override
+  async def list_sessions(
+      self, *, app_name: str, user_id: str
+  ) -> ListSessionsResponse:
+    return await self._run_in_database_session(
+        self._list_sessions_sync, app_name, user_id
+    )
 
-      # Convert storage session to session
+  def _list_sessions_sync(
+      self,
+      session_factory: DatabaseSessionFactory,
+      app_name: str,
+      user_id: str,
+  ) -> ListSessionsResponse:
+    results = (
+        session_factory.query(StorageSession)
+        .filter(StorageSession.app_name == app_name)
+        .filter(StorageSession.user_id == user_id)
+        .all()
+    )
+    sessions = []
+    for storage_session in results:
       session = Session(
           app_name=app_name,
           user_id=user_id,
-          id=session_id,
-          state=merged_state,
+          id=storage_session.id,
+          state={},
           last_update_time=storage_session.update_timestamp_tz,
       )
-      session.events = [e.to_event() for e in reversed(storage_events)]
-    return session
-
-  @override
-  async def list_sessions(
-      self, *, app_name: str, user_id: str
-  ) -> ListSessionsResponse:
-    with self.database_session_factory() as session_factory:
-      results = (
-          session_factory.query(StorageSession)
-          .filter(StorageSession.app_name == app_name)
-          .filter(StorageSession.user_id == user_id)
-          .all()
-      )
-      sessions = []
-      for storage_session in results:
-        session = Session(
-            app_name=app_name,
-            user_id=user_id,
-            id=storage_session.id,
-            state={},
-            last_update_time=storage_session.update_timestamp_tz,
-        )
-        sessions.append(session)
-      return ListSessionsResponse(sessions=sessions)
+      sessions.append(session)
+    return ListSessionsResponse(sessions=sessions)
 
   @override
   async def delete_session(
       self, app_name: str, user_id: str, session_id: str
   ) -> None:
-    with self.database_session_factory() as session_factory:
-      stmt = delete(StorageSession).where(
-          StorageSession.app_name == app_name,
-          StorageSession.user_id == user_id,
-          StorageSession.id == session_id,
-      )
-      session_factory.execute(stmt)
-      session_factory.commit()
+    await self._run_in_database_session(
+        self._delete_session_sync, app_name, user_id, session_id
+    )
+
+  def _delete_session_sync(
+      self,
+      session_factory: DatabaseSessionFactory,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+  ) -> None:
+    stmt = delete(StorageSession).where(
+        StorageSession.app_name == app_name,
+        StorageSession.user_id == user_id,
+        StorageSession.id == session_id,
+    )
+    session_factory.execute(stmt)
+    session_factory.commit()
 
   @override
   async def append_event(self, session: Session, event: Event) -> Event:
@@ -539,67 +701,273 @@ class DatabaseSessionService(BaseSessionService):
     if event.partial:
       return event
 
+    # Update timestamp with commit time
+    session.last_update_time = await self._run_in_database_session(
+        self._append_events_sync, session, [event]
+    )
+
+    # Also update the in-memory session
+    await super().append_event(session=session, event=event)
+    return event
+
+  @override
+  async def append_events(
+      self, session: Session, events: list[Event]
+  ) -> list[Event]:
+    events = [event for event in events if not event.partial]
+    if not events:
+      return events
+    logger.info(f"Append {len(events)} events to session {session.id}")
+
+    # All events are stored in a single transaction.
+    session.last_update_time = await self._run_in_database_session(
+        self._append_events_sync, session, events
+    )
+
+    for event in events:
+      await super().append_event(session=session, event=event)
+    return events
+
+  def _append_events_sync(
+      self,
+      session_factory: DatabaseSessionFactory,
+      session: Session,
+      events: list[Event],
+  ) -> float:
+    """Stores the events and their state deltas, returning the update time.
+
+    The session, app state and user state rows are read in one query and
+    state deltas are written as targeted updates, so an event without state
+    delta costs a single SELECT and INSERT.
+    """
     # 1. Check if timestamp is stale
     # 2. Update session attributes based on event config
     # 3. Store event to table
-    with self.database_session_factory() as session_factory:
-      storage_session = session_factory.get(
-          StorageSession, (session.app_name, session.user_id, session.id)
-      )
-
-      if storage_session.update_timestamp_tz > session.last_update_time:
-        raise ValueError(
-            "The last_update_time provided in the session object"
-            f" {datetime.fromtimestamp(session.last_update_time):'%Y-%m-%d %H:%M:%S'} is"
-            " earlier than the update_time in the storage_session"
-            f" {datetime.fromtimestamp(storage_session.update_timestamp_tz):'%Y-%m-%d %H:%M:%S'}."
-            " Please check if it is a stale session."
+    dialect = session_factory.bind.dialect
+    (
+        session_state,
+        update_time,
+        app_state_name,
+        app_state,
+        user_state_id,
+        user_state,
+    ) = session_factory.execute(
+        select(
+            StorageSession.state,
+            StorageSession.update_time,
+            StorageAppState.app_name,
+            StorageAppState.state,
+            StorageUserState.user_id,
+            StorageUserState.state,
+        )
+        .outerjoin(
+            StorageAppState,
+            StorageAppState.app_name == StorageSession.app_name,
+        )
+        .outerjoin(
+            StorageUserState,
+            and_(
+                StorageUserState.app_name == StorageSession.app_name,
+                StorageUserState.user_id == StorageSession.user_id,
+            ),
+        )
+        .where(
+            StorageSession.app_name == session.app_name,
+            StorageSession.user_id == session.user_id,
+            StorageSession.id == session.id,
         )
+    ).one()
 
-      # Fetch states from storage
-      storage_app_state = session_factory.get(
-          StorageAppState, (session.app_name)
-      )
-      storage_user_state = session_factory.get(
-          StorageUserState, (session.app_name, session.user_id)
+    storage_update_timestamp = _to_timestamp_tz(update_time, dialect.name)
+    if storage_update_timestamp > session.last_update_time:
+      raise ValueError(
+          "The last_update_time provided in the session object"
+          f" {datetime.fromtimestamp(session.last_update_time):'%Y-%m-%d %H:%M:%S'} is"
+          " earlier than the update_time in the storage_session"
+          f" {datetime.fromtimestamp(storage_update_timestamp):'%Y-%m-%d %H:%M:%S'}."
+          " Please check if it is a stale session."
       )
 
-      app_state = storage_app_state.state if storage_app_state else {}
-      user_state = storage_user_state.state if storage_user_state else {}
-      session_state = storage_session.state
-
-      # Extract state delta
-      app_state_delta = {}
-      user_state_delta = {}
-      session_state_delta = {}
-      if event.actions:
-        if event.actions.state_delta:
-          app_state_delta, user_state_delta, session_state_delta = (
-              _extract_state_delta(event.actions.state_delta)
-          )
-
-      # Merge state and update storage
-      if app_state_delta:
-        app_state.update(app_state_delta)
-        storage_app_state.state = app_state
-      if user_state_delta:
-        user_state.update(user_state_delta)
-        storage_user_state.state = user_state
-      if session_state_delta:
-        session_state.update(session_state_delta)
-        storage_session.state = session_state
+    # Extract state delta, later events overriding earlier ones
+    app_state_delta = {}
+    user_state_delta = {}
+    session_state_delta = {}
+    for event in events:
+      if event.actions and event.actions.state_delta:
+        app_delta, user_delta, session_delta = _extract_state_delta(
+            event.actions.state_delta
+        )
+        app_state_delta.update(app_delta)
+        user_state_delta.update(user_delta)
+        session_state_delta.update(session_delta)
+
+    # Apply state deltas to storage
+    if app_state_delta:
+      if app_state_name is None:
+        session_factory.add(
+            StorageAppState(app_name=session.app_name, state=app_state_delta)
+        )
+      else:
+        session_factory.execute(
+            update(StorageAppState)
+            .where(StorageAppState.app_name == session.app_name)
+            .values(
+                state=_patch_state(
+                    StorageAppState.state,
+                    app_state,
+                    app_state_delta,
+                    dialect.name,
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+    if user_state_delta:
+      if user_state_id is None:
+        session_factory.add(
+            StorageUserState(
+                app_name=session.app_name,
+                user_id=session.user_id,
+                state=user_state_delta,
+            )
+        )
+      else:
+        session_factory.execute(
+            update(StorageUserState)
+            .where(
+                StorageUserState.app_name == session.app_name,
+                StorageUserState.user_id == session.user_id,
+            )
+            .values(
+                state=_patch_state(
+                    StorageUserState.state,
+                    user_state,
+                    user_state_delta,
+                    dialect.name,
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
 
-      session_factory.add(StorageEvent.from_event(session, event))
+    session_factory.add_all(
+        [StorageEvent.from_event(session, event) for event in events]
+    )
 
-      session_factory.commit()
-      session_factory.refresh(storage_session)
+    if session_state_delta:
+      # The update time only moves when the session row itself changes.
+      stmt = (
+          update(StorageSession)
+          .where(
+              StorageSession.app_name == session.app_name,
+              StorageSession.user_id == session.user_id,
+              StorageSession.id == session.id,
+          )
+          .values(
+              state=_patch_state(
+                  StorageSession.state,
+                  session_state,
+                  session_state_delta,
+                  dialect.name,
+              )
+          )
+          .execution_options(synchronize_session=False)
+      )
+      if dialect.update_returning:
+        update_time = session_factory.execute(
+            stmt.returning(StorageSession.update_time)
+        ).scalar_one()
+      else:
+        session_factory.execute(stmt)
+        update_time = session_factory.execute(
+            select(StorageSession.update_time).where(
+                StorageSession.app_name == session.app_name,
+                StorageSession.user_id == session.user_id,
+                StorageSession.id == session.id,
+            )
+        ).scalar_one()
+
+    session_factory.commit()
+    return _to_timestamp_tz(update_time, dialect.name)
+
+
+def _query_events(
+    session_factory: DatabaseSessionFactory,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    after_timestamp: Optional[float] = None,
+    before: Optional[tuple[datetime, str]] = None,
+    limit: Optional[int] = None,
+) -> list[StorageEvent]:
+  """Queries the events of a session, newest first.
+
+  Args:
+    session_factory: The database session.
+    app_name: The name of the app.
+    user_id: The id of the user.
+    session_id: The id of the session.
+    after_timestamp: If set, only returns events at or after this timestamp.
+    before: If set, only returns events ordered before this (timestamp, id)
+      cursor.
+    limit: The maximum number of events to return.
+  """
+  query = (
+      session_factory.query(StorageEvent)
+      .filter(StorageEvent.app_name == app_name)
+      .filter(StorageEvent.session_id == session_id)
+      .filter(StorageEvent.user_id == user_id)
+  )
+  if after_timestamp:
+    query = query.filter(
+        StorageEvent.timestamp >= datetime.fromtimestamp(after_timestamp)
+    )
+  if before:
+    before_timestamp, before_id = before
+    query = query.filter(
+        or_(
+            StorageEvent.timestamp < before_timestamp,
+            and_(
+                StorageEvent.timestamp == before_timestamp,
+                StorageEvent.id < before_id,
+            ),
+        )
+    )
+  return (
+      query.order_by(StorageEvent.timestamp.desc(), StorageEvent.id.desc())
+      .limit(limit)
+      .all()
+  )
 
-      # Update timestamp with commit time
-      session.last_update_time = storage_session.update_timestamp_tz
 
-    # Also update the in-memory session
-    await super().append_event(session=session, event=event)
-    return event
+def _to_timestamp_tz(update_time: datetime, dialect_name: Optional[str]):
+  """Converts an update time read from storage to a POSIX timestamp."""
+  if dialect_name == "sqlite":
+    # SQLite does not support timezone. SQLAlchemy returns a naive datetime
+    # object without timezone information. We need to convert it to UTC
+    # manually.
+    return update_time.replace(tzinfo=timezone.utc).timestamp()
+  return update_time.timestamp()
+
+
+def _patch_state(
+    column: Any,
+    current_state: Optional[dict[str, Any]],
+    state_delta: dict[str, Any],
+    dialect_name: str,
+) -> Any:
+  """Returns the value that applies `state_delta` to a JSON state column.
+
+  PostgreSQL and SQLite update only the keys in the delta on the server side.
+  Other dialects fall back to writing the merged state.
+  """
+  if dialect_name == "postgresql":
+    return column.op("||")(type_coerce(state_delta, postgresql.JSONB))
+  if dialect_name == "sqlite" and not any('"' in key for key in state_delta):
+    path_values = []
+    for key, value in state_delta.items():
+      path_values.append(f'$."{key}"')
+      path_values.append(func.json(json.dumps(value)))
+    return func.json_set(column, *path_values)
+  return {**(current_state or {}), **state_delta}
 
 
 def _extract_state_delta(state: dict[str, Any]):
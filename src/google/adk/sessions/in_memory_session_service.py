@@ -17,6 +17,8 @@ import copy
 import logging
 import time
 from typing import Any
+from typing import Awaitable
+from typing import Callable
 from typing import Optional
 import uuid
 
@@ -107,7 +109,7 @@ class InMemorySessionService(BaseSessionService):
       self.sessions[app_name][user_id] = {}
     self.sessions[app_name][user_id][session_id] = session
 
-    copied_session = copy.deepcopy(session)
+    copied_session = self._copy_session(session, events=[])
     return self._merge_state(app_name, user_id, copied_session)
 
   @override
@@ -158,24 +160,42 @@ class InMemorySessionService(BaseSessionService):
       return None
 
     session = self.sessions[app_name][user_id].get(session_id)
-    copied_session = copy.deepcopy(session)
+    events = session.events
 
     if config:
       if config.num_recent_events:
-        copied_session.events = copied_session.events[
-            -config.num_recent_events :
-        ]
+        events = events[-config.num_recent_events :]
       if config.after_timestamp:
-        i = len(copied_session.events) - 1
+        i = len(events) - 1
         while i >= 0:
-          if copied_session.events[i].timestamp < config.after_timestamp:
+          if events[i].timestamp < config.after_timestamp:
             break
           i -= 1
         if i >= 0:
-          copied_session.events = copied_session.events[i + 1 :]
+          events = events[i + 1 :]
 
+    copied_session = self._copy_session(session, events=list(events))
+    if (
+        config
+        and not config.after_timestamp
+        and len(events) < len(session.events)
+    ):
+      copied_session._older_events_loader = _make_older_events_loader(
+          session.events, len(session.events) - len(events)
+      )
     return self._merge_state(app_name, user_id, copied_session)
 
+  def _copy_session(self, session: Session, *, events: list[Event]) -> Session:
+    """Copies a stored session without deep copying its events.
+
+    Stored events are never modified after being appended, and the appending
+    caller already holds the same objects, so copies share them. Only the
+    event list and the state are private to the copy.
+    """
+    return session.model_copy(
+        update={'state': copy.deepcopy(session.state), 'events': events}
+    )
+
   def _merge_state(
       self, app_name: str, user_id: str, copied_session: Session
   ) -> Session:
@@ -222,10 +242,9 @@ class InMemorySessionService(BaseSessionService):
 
     sessions_without_events = []
     for session in self.sessions[app_name][user_id].values():
-      copied_session = copy.deepcopy(session)
-      copied_session.events = []
-      copied_session.state = {}
-      sessions_without_events.append(copied_session)
+      sessions_without_events.append(
+          session.model_copy(update={'state': {}, 'events': []})
+      )
     return ListSessionsResponse(sessions=sessions_without_events)
 
   @override
@@ -301,3 +320,18 @@ class InMemorySessionService(BaseSessionService):
     storage_session.last_update_time = event.timestamp
 
     return event
+
+
+def _make_older_events_loader(
+    stored_events: list[Event], end: int
+) -> Callable[[Optional[int]], Awaitable[tuple[list[Event], bool]]]:
+  """Returns a loader paging backwards through `stored_events[:end]`."""
+
+  async def load(num_events: Optional[int]) -> tuple[list[Event], bool]:
+    nonlocal end
+    start = max(end - num_events, 0) if num_events else 0
+    events = stored_events[start:end]
+    end = start
+    return events, start > 0
+
+  return load
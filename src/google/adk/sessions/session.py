@@ -13,11 +13,16 @@
 # limitations under the License.
 
 from typing import Any
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
 
 from pydantic import alias_generators
 from pydantic import BaseModel
 from pydantic import ConfigDict
 from pydantic import Field
+from pydantic import PrivateAttr
 
 from ..events.event import Event
 
@@ -56,3 +61,59 @@ class Session(BaseModel):
   call/response, etc."""
   last_update_time: float = 0.0
   """The last update time of the session."""
+
+  _older_events_loader: Optional[
+      Callable[[Optional[int]], Awaitable[tuple[list[Event], bool]]]
+  ] = PrivateAttr(default=None)
+  """Loads up to the given number of stored events older than the loaded
+  ones, oldest first, and whether even older events remain.
+
+  Set by session services when only the most recent events were loaded.
+  """
+
+  @property
+  def has_older_events(self) -> bool:
+    """Whether the storage has events older than the ones in `events`."""
+    return self._older_events_loader is not None
+
+  async def load_older_events(
+      self, num_events: Optional[int] = None
+  ) -> list[Event]:
+    """Loads stored events older than the ones in `events`.
+
+    The loaded events are prepended to `events`.
+
+    Args:
+      num_events: The maximum number of events to load. Loads all remaining
+        events if not set.
+
+    Returns:
+      The loaded events, oldest first.
+    """
+    if self._older_events_loader is None:
+      return []
+    events, has_more = await self._older_events_loader(num_events)
+    if not has_more:
+      self._older_events_loader = None
+    self.events[:0] = events
+    return events
+
+  async def iter_events_reversed(
+      self, page_size: int = 100
+  ) -> AsyncIterator[Event]:
+    """Iterates the events from newest to oldest.
+
+    Older events are loaded from storage page by page as the iteration reaches
+    them.
+
+    Args:
+      page_size: The number of older events to load at a time.
+    """
+    index = len(self.events) - 1
+    while True:
+      while index >= 0:
+        yield self.events[index]
+        index -= 1
+      if not self.has_older_events:
+        return
+      index = len(await self.load_older_events(page_size)) - 1
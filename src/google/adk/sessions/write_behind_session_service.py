@@ -0,0 +1,248 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+from typing import Optional
+
+from typing_extensions import override
+
+from ..events.event import Event
+from .base_session_service import BaseSessionService
+from .base_session_service import GetSessionConfig
+from .base_session_service import ListSessionsResponse
+from .session import Session
+
+logger = logging.getLogger('google_adk.' + __name__)
+
+_SessionKey = tuple[str, str, str]
+
+_MIN_RETRY_INTERVAL = 0.1
+"""The minimum number of seconds before retrying a failed flush."""
+
+_MAX_RETRY_INTERVAL = 60.0
+"""The maximum number of seconds before retrying a failed flush."""
+
+
+class _SessionBuffer:
+  """Events of one session that are not yet persisted."""
+
+  def __init__(self, session: Session):
+    self.session = session
+    """The live session the events were applied to."""
+    self.persisted_session = Session(
+        id=session.id,
+        app_name=session.app_name,
+        user_id=session.user_id,
+        last_update_time=session.last_update_time,
+    )
+    """Tracks the storage side of the session, e.g. its last update time."""
+    self.events: list[Event] = []
+    self.flush_task: Optional[asyncio.Task] = None
+    self.retry_interval: Optional[float] = None
+    """The seconds before the next retry, if the last flush failed."""
+    self.lock = asyncio.Lock()
+
+
+class WriteBehindSessionService(BaseSessionService):
+  """Buffers appended events and persists them in batches.
+
+  Appended events are applied to the in-memory `Session` right away, which
+  stays authoritative for the running invocation, and are written to the
+  wrapped service in a single `append_events` call (one transaction for
+  `DatabaseSessionService`) when any of the following happens:
+
+  * `max_buffered_events` events are pending for the session.
+  * `flush_interval` seconds passed since the first pending event.
+  * `flush` is called. `Runner` does so when an invocation ends.
+  * The session is read back through `get_session`.
+
+  Crash safety: an event is durable once the flush covering it returns.
+  Pending events of a session are written in order and all at once, so the
+  stored session is always a prefix of the live one. A crash loses at most
+  the events buffered since the last flush, i.e. fewer than
+  `max_buffered_events` events, none older than `flush_interval` seconds. If a
+  flush fails, its events stay buffered and are retried with exponential
+  backoff, or by the next flush if that comes first.
+  """
+
+  def __init__(
+      self,
+      session_service: BaseSessionService,
+      *,
+      max_buffered_events: int = 20,
+      flush_interval: float = 0.5,
+  ):
+    """Initializes the write-behind session service.
+
+    Args:
+      session_service: The session service that persists the events.
+      max_buffered_events: The number of pending events of a session that
+        triggers a flush.
+      flush_interval: The maximum number of seconds an event stays pending.
+    """
+    if max_buffered_events < 1:
+      raise ValueError('max_buffered_events must be at least 1.')
+    self.session_service = session_service
+    self.max_buffered_events = max_buffered_events
+    self.flush_interval = flush_interval
+    self._buffers: dict[_SessionKey, _SessionBuffer] = {}
+
+  @override
+  async def create_session(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      state: Optional[dict[str, Any]] = None,
+      session_id: Optional[str] = None,
+  ) -> Session:
+    return await self.session_service.create_session(
+        app_name=app_name,
+        user_id=user_id,
+        state=state,
+        session_id=session_id,
+    )
+
+  @override
+  async def get_session(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      config: Optional[GetSessionConfig] = None,
+  ) -> Optional[Session]:
+    await self._flush_buffer((app_name, user_id, session_id))
+    return await self.session_service.get_session(
+        app_name=app_name,
+        user_id=user_id,
+        session_id=session_id,
+        config=config,
+    )
+
+  @override
+  async def list_sessions(
+      self, *, app_name: str, user_id: str
+  ) -> ListSessionsResponse:
+    return await self.session_service.list_sessions(
+        app_name=app_name, user_id=user_id
+    )
+
+  @override
+  async def delete_session(
+      self, *, app_name: str, user_id: str, session_id: str
+  ) -> None:
+    buffer = self._buffers.pop((app_name, user_id, session_id), None)
+    if buffer and buffer.flush_task:
+      buffer.flush_task.cancel()
+    await self.session_service.delete_session(
+        app_name=app_name, user_id=user_id, session_id=session_id
+    )
+
+  @override
+  async def append_event(self, session: Session, event: Event) -> Event:
+    if event.partial:
+      return event
+    await super().append_event(session=session, event=event)
+
+    key = (session.app_name, session.user_id, session.id)
+    buffer = self._buffers.get(key)
+    if buffer is None:
+      buffer = self._buffers[key] = _SessionBuffer(session)
+    buffer.session = session
+    buffer.events.append(event)
+
+    if len(buffer.events) >= self.max_buffered_events:
+      await self._flush_buffer(key)
+    elif buffer.flush_task is None or buffer.flush_task.done():
+      buffer.flush_task = asyncio.create_task(self._flush_later(key))
+    return event
+
+  @override
+  async def flush(self, session: Optional[Session] = None) -> None:
+    """Persists the pending events.
+
+    Args:
+      session: The session to flush. Flushes all sessions if not provided.
+    """
+    if session:
+      await self._flush_buffer((session.app_name, session.user_id, session.id))
+      return
+    for key in list(self._buffers):
+      await self._flush_buffer(key)
+
+  async def _flush_later(
+      self, key: _SessionKey, delay: Optional[float] = None
+  ) -> None:
+    await asyncio.sleep(self.flush_interval if delay is None else delay)
+    try:
+      await self._flush_buffer(key)
+    except Exception:  # pylint: disable=broad-exception-caught
+      logger.warning(
+          'Failed to flush events of session %s, will retry.',
+          key[2],
+          exc_info=True,
+      )
+
+  def _schedule_retry(self, key: _SessionKey, buffer: _SessionBuffer) -> None:
+    """Schedules a flush of the buffer, backing off exponentially."""
+    buffer.retry_interval = min(
+        max(
+            2 * (buffer.retry_interval or self.flush_interval),
+            _MIN_RETRY_INTERVAL,
+        ),
+        _MAX_RETRY_INTERVAL,
+    )
+    if buffer.flush_task and buffer.flush_task is not asyncio.current_task():
+      buffer.flush_task.cancel()
+    buffer.flush_task = asyncio.create_task(
+        self._flush_later(key, buffer.retry_interval)
+    )
+
+  async def _flush_buffer(self, key: _SessionKey) -> None:
+    buffer = self._buffers.get(key)
+    if buffer is None:
+      return
+    async with buffer.lock:
+      if buffer.events:
+        events = buffer.events
+        buffer.events = []
+        try:
+          await self.session_service.append_events(
+              buffer.persisted_session, events
+          )
+        except Exception:
+          # Keep the events, ahead of any appended meanwhile, for a retry.
+          buffer.events[:0] = events
+          self._schedule_retry(key, buffer)
+          raise
+        finally:
+          buffer.persisted_session.events.clear()
+          buffer.persisted_session.state.clear()
+        buffer.retry_interval = None
+        buffer.session.last_update_time = (
+            buffer.persisted_session.last_update_time
+        )
+
+      if buffer.flush_task and buffer.flush_task is not asyncio.current_task():
+        buffer.flush_task.cancel()
+      buffer.flush_task = None
+      if buffer.events:
+        # Events appended while the flush was in flight.
+        buffer.flush_task = asyncio.create_task(self._flush_later(key))
+      elif self._buffers.get(key) is buffer:
+        del self._buffers[key]
@@ -14,7 +14,6 @@
 
 from __future__ import annotations
 
-import inspect
 import logging
 from typing import Any
 from typing import Callable
@@ -101,7 +100,7 @@ class AuthenticatedFunctionTool(FunctionTool):
       credential: AuthCredential,
   ) -> Any:
     args_to_call = args.copy()
-    signature = inspect.signature(self.func)
+    signature = self._get_signature()
     if "credential" in signature.parameters:
       args_to_call["credential"] = credential
     return await super().run_async(args=args_to_call, tool_context=tool_context)
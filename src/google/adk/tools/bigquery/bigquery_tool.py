@@ -14,7 +14,6 @@
 
 from __future__ import annotations
 
-import inspect
 from typing import Any
 from typing import Callable
 from typing import Optional
@@ -121,7 +120,7 @@ class BigQueryTool(FunctionTool):
         The result of the tool execution
     """
     args_to_call = args.copy()
-    signature = inspect.signature(self.func)
+    signature = self._get_signature()
     if "credentials" in signature.parameters:
       args_to_call["credentials"] = credentials
     if "config" in signature.parameters:
@@ -18,23 +18,41 @@ import inspect
 from typing import Any
 from typing import Callable
 from typing import Optional
+from typing import Tuple
 
 from google.genai import types
 from typing_extensions import override
 
+from ..utils.variant_utils import GoogleLLMVariant
 from ._automatic_function_calling_util import build_function_declaration
 from .base_tool import BaseTool
+from .sync_function_executor import get_default_executor
+from .sync_function_executor import SyncFunctionExecutor
 from .tool_context import ToolContext
 
 
 class FunctionTool(BaseTool):
   """A tool that wraps a user-defined Python function.
 
+  Synchronous functions run in a `SyncFunctionExecutor`, so they don't block
+  the event loop.
+
+  The function declaration of each API variant and the function's signature
+  are computed once and cached. The caches are dropped when `func` or the
+  ignored parameters change.
+
   Attributes:
     func: The function to wrap.
+    executor: The executor for synchronous functions. Defaults to the shared
+      executor returned by `get_default_executor`.
   """
 
-  def __init__(self, func: Callable[..., Any]):
+  def __init__(
+      self,
+      func: Callable[..., Any],
+      *,
+      executor: Optional[SyncFunctionExecutor] = None,
+  ):
     """Extract metadata from a callable object."""
     name = ''
     doc = ''
@@ -59,19 +77,52 @@ class FunctionTool(BaseTool):
 
     super().__init__(name=name, description=doc)
     self.func = func
+    self.executor = executor
     self._ignore_params = ['tool_context', 'input_stream']
+    self._cache_key: Optional[Tuple[Callable[..., Any], Tuple[str, ...]]] = (
+        None
+    )
+    self._declarations: dict[GoogleLLMVariant, types.FunctionDeclaration] = {}
+    self._signature: Optional[inspect.Signature] = None
+    self._mandatory_args: Optional[list[str]] = None
+
+  def _invalidate_caches_if_mutated(self) -> None:
+    """Drops the cached declarations and signature if the tool changed."""
+    func, ignore_params = self._cache_key or (None, None)
+    if func is self.func and ignore_params == tuple(self._ignore_params):
+      return
+    self._cache_key = (self.func, tuple(self._ignore_params))
+    self._declarations.clear()
+    self._signature = None
+    self._mandatory_args = None
+
+  def _get_signature(self) -> inspect.Signature:
+    """Returns the signature of the function."""
+    self._invalidate_caches_if_mutated()
+    if self._signature is None:
+      self._signature = inspect.signature(self.func)
+    return self._signature
 
   @override
   def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
-    function_decl = types.FunctionDeclaration.model_validate(
-        build_function_declaration(
-            func=self.func,
-            # The model doesn't understand the function context.
-            # input_stream is for streaming tool
-            ignore_params=self._ignore_params,
-            variant=self._api_variant,
-        )
-    )
+    """Returns the function declaration, shared by all callers.
+
+    The declaration is cached, so it must not be modified.
+    """
+    self._invalidate_caches_if_mutated()
+    variant = self._api_variant
+    function_decl = self._declarations.get(variant)
+    if function_decl is None:
+      function_decl = types.FunctionDeclaration.model_validate(
+          build_function_declaration(
+              func=self.func,
+              # The model doesn't understand the function context.
+              # input_stream is for streaming tool
+              ignore_params=self._ignore_params,
+              variant=variant,
+          )
+      )
+      self._declarations[variant] = function_decl
 
     return function_decl
 
@@ -80,8 +131,7 @@ class FunctionTool(BaseTool):
       self, *, args: dict[str, Any], tool_context: ToolContext
   ) -> Any:
     args_to_call = args.copy()
-    signature = inspect.signature(self.func)
-    valid_params = {param for param in signature.parameters}
+    valid_params = self._get_signature().parameters
     if 'tool_context' in valid_params:
       args_to_call['tool_context'] = tool_context
 
@@ -114,8 +164,10 @@ You could retry calling this tool, but it is IMPORTANT for you to provide all th
         and inspect.iscoroutinefunction(self.func.__call__)
     ):
       return await self.func(**args_to_call)
-    else:
+    executor = self.executor or get_default_executor()
+    if executor is None:
       return self.func(**args_to_call)
+    return await executor.run(self.func, **args_to_call)
 
   # TODO(hangfei): fix call live for function stream.
   async def _call_live(
@@ -126,7 +178,7 @@ You could retry calling this tool, but it is IMPORTANT for you to provide all th
       invocation_context,
   ) -> Any:
     args_to_call = args.copy()
-    signature = inspect.signature(self.func)
+    signature = self._get_signature()
     if (
         self.name in invocation_context.active_streaming_tools
         and invocation_context.active_streaming_tools[self.name].stream
@@ -147,7 +199,9 @@ You could retry calling this tool, but it is IMPORTANT for you to provide all th
     Returns:
       A list of strings, where each string is the name of a mandatory parameter.
     """
-    signature = inspect.signature(self.func)
+    signature = self._get_signature()
+    if self._mandatory_args is not None:
+      return self._mandatory_args
     mandatory_params = []
 
     for name, param in signature.parameters.items():
@@ -162,4 +216,5 @@ You could retry calling this tool, but it is IMPORTANT for you to provide all th
       ):
         mandatory_params.append(name)
 
+    self._mandatory_args = mandatory_params
     return mandatory_params
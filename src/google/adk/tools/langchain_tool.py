@@ -129,10 +129,10 @@ class LangchainTool(FunctionTool):
       # Need to provide a way to override the function names and descriptions
       # as the original function names are mostly ".run" and the descriptions
       # may not meet users' needs
-      function_decl = super()._get_declaration()
-      function_decl.name = self.name
-      function_decl.description = self.description
-      return function_decl
+      # The declaration of the base class is cached, so it's copied.
+      return super()._get_declaration().model_copy(
+          update={'name': self.name, 'description': self.description}
+      )
 
     except Exception as e:
       raise ValueError(
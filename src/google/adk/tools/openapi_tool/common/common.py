@@ -79,13 +79,16 @@ class ApiParameter(BaseModel):
 
   @model_serializer
   def _serialize(self):
-    return {
+    serialized = {
         'original_name': self.original_name,
         'param_location': self.param_location,
         'param_schema': self.param_schema,
         'description': self.description,
         'py_name': self.py_name,
     }
+    if self.required:
+      serialized['required'] = True
+    return serialized
 
   def __str__(self):
     return f'{self.py_name}: {self.type_hint}'
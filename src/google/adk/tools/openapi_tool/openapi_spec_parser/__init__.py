@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from .http_client import RestApiHttpClient
 from .openapi_spec_parser import OpenApiSpecParser
 from .openapi_spec_parser import OperationEndpoint
 from .openapi_spec_parser import ParsedOperation
@@ -29,6 +30,7 @@ __all__ = [
     'OpenAPIToolset',
     'OperationParser',
     'RestApiTool',
+    'RestApiHttpClient',
     'snake_to_lower_camel',
     'AuthPreparationState',
     'ToolAuthHandler',
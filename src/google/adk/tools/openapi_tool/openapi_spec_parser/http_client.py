@@ -0,0 +1,187 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import Union
+import weakref
+
+import httpx
+
+_HostKey = Tuple[str, str, Optional[int]]
+
+
+class _LoopState:
+  """The client and per-host semaphores used on one event loop."""
+
+  def __init__(self, client: httpx.AsyncClient):
+    self.client = client
+    self.host_semaphores: Dict[_HostKey, asyncio.Semaphore] = {}
+
+
+class RestApiHttpClient:
+  """Pooled async HTTP client shared by RestApiTools.
+
+  Connections are kept alive and reused across tool calls. HTTP/2 is used
+  when the `h2` package is installed, unless disabled. Besides the limit on
+  the total number of connections, the number of concurrent requests to a
+  single host is limited, so one slow API can't take up the whole pool.
+
+  httpx clients are bound to the event loop they are first used on, so a
+  client is created lazily for each event loop.
+
+  Example:
+  ```
+    http_client = RestApiHttpClient(timeout=10, max_connections_per_host=4)
+    toolset = OpenAPIToolset(spec_dict=spec, http_client=http_client)
+    ...
+    await http_client.aclose()
+  ```
+  """
+
+  def __init__(
+      self,
+      *,
+      timeout: Union[float, httpx.Timeout, None] = httpx.Timeout(
+          60.0, connect=10.0
+      ),
+      max_connections: int = 100,
+      max_keepalive_connections: int = 20,
+      max_connections_per_host: Optional[int] = 10,
+      keepalive_expiry: float = 30.0,
+      http2: Optional[bool] = None,
+  ):
+    """Initializes the RestApiHttpClient.
+
+    Args:
+      timeout: Timeout of a request in seconds, or an httpx.Timeout. None
+        disables the timeout.
+      max_connections: Maximum number of connections in the pool.
+      max_keepalive_connections: Maximum number of idle connections kept
+        alive.
+      max_connections_per_host: Maximum number of concurrent requests to a
+        single host. None removes the limit.
+      keepalive_expiry: Seconds an idle connection is kept alive.
+      http2: Whether to use HTTP/2. Defaults to using it if `h2` is
+        installed.
+    """
+    if http2 is None:
+      http2 = importlib.util.find_spec("h2") is not None
+    self.timeout = timeout
+    self.limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    self.max_connections_per_host = max_connections_per_host
+    self.http2 = http2
+    self._loop_states: weakref.WeakKeyDictionary[
+        asyncio.AbstractEventLoop, _LoopState
+    ] = weakref.WeakKeyDictionary()
+
+  def _get_loop_state(self) -> _LoopState:
+    loop = asyncio.get_running_loop()
+    state = self._loop_states.get(loop)
+    if state is None or state.client.is_closed:
+      state = self._loop_states[loop] = _LoopState(
+          httpx.AsyncClient(
+              timeout=self.timeout,
+              limits=self.limits,
+              http2=self.http2,
+              # Like `requests`, which RestApiTool used before.
+              follow_redirects=True,
+          )
+      )
+    return state
+
+  async def request(
+      self,
+      *,
+      method: str,
+      url: str,
+      params: Optional[Dict[str, Any]] = None,
+      headers: Optional[Dict[str, Any]] = None,
+      cookies: Optional[Dict[str, Any]] = None,
+      json: Any = None,
+      data: Any = None,
+      files: Any = None,
+  ) -> httpx.Response:
+    """Sends a request, taking the same parameters as `requests.request`.
+
+    Args:
+      method: The HTTP method.
+      url: The URL of the request.
+      params: The query parameters.
+      headers: The request headers.
+      cookies: The cookies to send with the request.
+      json: A JSON body.
+      data: A form as a dict, or a raw body as str or bytes.
+      files: Files of a multipart form.
+
+    Returns:
+      The response, with its body read.
+    """
+    headers = dict(headers or {})
+    if cookies:
+      # httpx deprecates per-request cookies, they'd be kept in the client.
+      headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in cookies.items())
+    content = None
+    if isinstance(data, (str, bytes)):
+      content, data = data, None
+
+    state = self._get_loop_state()
+    request = state.client.build_request(
+        method.upper(),
+        url,
+        params=params,
+        headers=headers,
+        json=json,
+        data=data,
+        files=files,
+        content=content,
+    )
+    if self.max_connections_per_host is None:
+      return await state.client.send(request)
+
+    host_key = (request.url.scheme, request.url.host, request.url.port)
+    semaphore = state.host_semaphores.get(host_key)
+    if semaphore is None:
+      semaphore = state.host_semaphores[host_key] = asyncio.Semaphore(
+          self.max_connections_per_host
+      )
+    async with semaphore:
+      return await state.client.send(request)
+
+  async def aclose(self):
+    """Closes the client of the current event loop."""
+    state = self._loop_states.pop(asyncio.get_running_loop(), None)
+    if state is not None:
+      await state.client.aclose()
+
+
+_default_http_client: Optional[RestApiHttpClient] = None
+
+
+def get_default_http_client() -> RestApiHttpClient:
+  """Gets the client shared by RestApiTools without their own client."""
+  global _default_http_client
+  if _default_http_client is None:
+    _default_http_client = RestApiHttpClient()
+  return _default_http_client
@@ -14,11 +14,13 @@
 
 from __future__ import annotations
 
-import copy
+import functools
 from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Set
 
 from fastapi.openapi.models import Operation
 from pydantic import BaseModel
@@ -48,6 +50,84 @@ class ParsedOperation(BaseModel):
   additional_context: Optional[Any] = None
 
 
+class LazyParsedOperation:
+  """An operation of a spec, parsed when it's first needed."""
+
+  def __init__(self, name: str, parse: Callable[[], ParsedOperation]):
+    self.name = name
+    self._parse = parse
+    self._parsed: Optional[ParsedOperation] = None
+
+  def get(self) -> ParsedOperation:
+    """Returns the parsed operation, parsing it on the first call."""
+    if self._parsed is None:
+      self._parsed = self._parse()
+      self._parse = None
+    return self._parsed
+
+
+class _ReferenceResolver:
+  """Resolves the $refs of a spec on demand.
+
+  Each referenced node is resolved once and then shared by every place
+  referencing it, so resolved nodes must not be modified.
+  """
+
+  def __init__(self, openapi_spec: Dict[str, Any]):
+    self._spec = openapi_spec
+    self._resolved: Dict[str, Any] = {}
+    self._in_progress: Set[str] = set()
+
+  def _lookup(self, ref_string: str) -> Any:
+    """Looks up the node a $ref string points to."""
+    parts = ref_string.split("/")
+    if parts[0] != "#":
+      raise ValueError(f"External references not supported: {ref_string}")
+
+    current = self._spec
+    for part in parts[1:]:
+      if part in current:
+        current = current[part]
+      else:
+        return None  # Reference not found
+    return current
+
+  def resolve(self, obj: Any) -> Any:
+    """Recursively resolves the references in an object.
+
+    Handles circular references by dropping the $ref that closes the cycle.
+    """
+    if isinstance(obj, dict):
+      ref_string = obj.get("$ref")
+      if not isinstance(ref_string, str):
+        return {key: self.resolve(value) for key, value in obj.items()}
+
+      if ref_string in self._resolved:
+        return self._resolved[ref_string]
+
+      if ref_string in self._in_progress:
+        # Circular reference detected! Return a *copy* of the object,
+        # but *without* the $ref.  This breaks the cycle while
+        # still maintaining the overall structure.
+        return {k: v for k, v in obj.items() if k != "$ref"}
+
+      referenced = self._lookup(ref_string)
+      if referenced is None:
+        return obj  # return original if no resolved value.
+
+      self._in_progress.add(ref_string)
+      try:
+        resolved = self.resolve(referenced)
+      finally:
+        self._in_progress.discard(ref_string)
+      self._resolved[ref_string] = resolved
+      return resolved
+
+    if isinstance(obj, list):
+      return [self.resolve(item) for item in obj]
+    return obj
+
+
 class OpenApiSpecParser:
   """Generates Python code, JSON schema, and callables for an OpenAPI operation.
 
@@ -68,15 +148,27 @@ class OpenApiSpecParser:
     Returns:
         A list of ParsedOperation objects.
     """
+    return [
+        operation.get() for operation in self.parse_lazily(openapi_spec_dict)
+    ]
 
-    openapi_spec_dict = self._resolve_references(openapi_spec_dict)
-    operations = self._collect_operations(openapi_spec_dict)
-    return operations
+  def parse_lazily(
+      self, openapi_spec_dict: Dict[str, Any]
+  ) -> List[LazyParsedOperation]:
+    """Lists the operations of an OpenAPI spec dict without parsing them.
 
-  def _collect_operations(
-      self, openapi_spec: Dict[str, Any]
-  ) -> List[ParsedOperation]:
-    """Collects operations from an OpenAPI spec."""
+    An operation's references are resolved when it's parsed, and referenced
+    nodes are resolved only once for all operations. The spec must not be
+    modified until all operations needed were parsed.
+
+    Args:
+        openapi_spec_dict: A dictionary representing the OpenAPI specification.
+
+    Returns:
+        A LazyParsedOperation for each operation, in the order of the spec.
+    """
+    openapi_spec = openapi_spec_dict
+    resolver = _ReferenceResolver(openapi_spec)
     operations = []
 
     # Taking first server url, or default to empty string if not present
@@ -96,6 +188,8 @@ class OpenApiSpecParser:
     for path, path_item in openapi_spec.get("paths", {}).items():
       if path_item is None:
         continue
+      if "$ref" in path_item:
+        path_item = resolver.resolve(path_item)
 
       for method in (
           "get",
@@ -115,119 +209,59 @@ class OpenApiSpecParser:
         # and method
         if "operationId" not in operation_dict:
           temp_id = _to_snake_case(f"{path}_{method}")
-          operation_dict["operationId"] = temp_id
-
-        url = OperationEndpoint(base_url=base_url, path=path, method=method)
-        operation = Operation.model_validate(operation_dict)
-        operation_parser = OperationParser(operation)
-
-        # Check for operation-specific auth scheme
-        auth_scheme_name = operation_parser.get_auth_scheme_name()
-        auth_scheme_name = (
-            auth_scheme_name if auth_scheme_name else global_scheme_name
-        )
-        auth_scheme = (
-            auth_schemes.get(auth_scheme_name) if auth_scheme_name else None
-        )
-
-        parsed_op = ParsedOperation(
-            name=operation_parser.get_function_name(),
-            description=operation.description or operation.summary or "",
-            endpoint=url,
-            operation=operation,
-            parameters=operation_parser.get_parameters(),
-            return_value=operation_parser.get_return_value(),
-            auth_scheme=auth_scheme,
-            auth_credential=None,  # Placeholder
-            additional_context={},
+          # Copied, since the spec and resolved nodes are not modified.
+          operation_dict = {**operation_dict, "operationId": temp_id}
+
+        operations.append(
+            LazyParsedOperation(
+                # Same as OperationParser.get_function_name.
+                name=_to_snake_case(operation_dict["operationId"])[:60],
+                parse=functools.partial(
+                    self._parse_operation,
+                    resolver,
+                    OperationEndpoint(
+                        base_url=base_url, path=path, method=method
+                    ),
+                    operation_dict,
+                    auth_schemes,
+                    global_scheme_name,
+                ),
+            )
         )
-        operations.append(parsed_op)
 
     return operations
 
-  def _resolve_references(self, openapi_spec: Dict[str, Any]) -> Dict[str, Any]:
-    """Recursively resolves all $ref references in an OpenAPI specification.
-
-    Handles circular references correctly.
-
-    Args:
-        openapi_spec: A dictionary representing the OpenAPI specification.
-
-    Returns:
-        A dictionary representing the OpenAPI specification with all references
-        resolved.
-    """
-
-    openapi_spec = copy.deepcopy(openapi_spec)  # Work on a copy
-    resolved_cache = {}  # Cache resolved references
-
-    def resolve_ref(ref_string, current_doc):
-      """Resolves a single $ref string."""
-      parts = ref_string.split("/")
-      if parts[0] != "#":
-        raise ValueError(f"External references not supported: {ref_string}")
-
-      current = current_doc
-      for part in parts[1:]:
-        if part in current:
-          current = current[part]
-        else:
-          return None  # Reference not found
-      return current
-
-    def recursive_resolve(obj, current_doc, seen_refs=None):
-      """Recursively resolves references, handling circularity.
-
-      Args:
-          obj: The object to traverse.
-          current_doc:  Document to search for refs.
-          seen_refs: A set to track already-visited references (for circularity
-            detection).
-
-      Returns:
-          The resolved object.
-      """
-      if seen_refs is None:
-        seen_refs = set()  # Initialize the set if it's the first call
-
-      if isinstance(obj, dict):
-        if "$ref" in obj and isinstance(obj["$ref"], str):
-          ref_string = obj["$ref"]
-
-          # Check for circularity
-          if ref_string in seen_refs and ref_string not in resolved_cache:
-            # Circular reference detected! Return a *copy* of the object,
-            # but *without* the $ref.  This breaks the cycle while
-            # still maintaining the overall structure.
-            return {k: v for k, v in obj.items() if k != "$ref"}
-
-          seen_refs.add(ref_string)  # Add the reference to the set
-
-          # Check if we have a cached resolved value
-          if ref_string in resolved_cache:
-            return copy.deepcopy(resolved_cache[ref_string])
-
-          resolved_value = resolve_ref(ref_string, current_doc)
-          if resolved_value is not None:
-            # Recursively resolve the *resolved* value,
-            # passing along the 'seen_refs' set
-            resolved_value = recursive_resolve(
-                resolved_value, current_doc, seen_refs
-            )
-            resolved_cache[ref_string] = resolved_value
-            return copy.deepcopy(resolved_value)  # return the cached result
-          else:
-            return obj  # return original if no resolved value.
-
-        else:
-          new_dict = {}
-          for key, value in obj.items():
-            new_dict[key] = recursive_resolve(value, current_doc, seen_refs)
-          return new_dict
-
-      elif isinstance(obj, list):
-        return [recursive_resolve(item, current_doc, seen_refs) for item in obj]
-      else:
-        return obj
-
-    return recursive_resolve(openapi_spec, openapi_spec)
+  def _parse_operation(
+      self,
+      resolver: _ReferenceResolver,
+      url: OperationEndpoint,
+      operation_dict: Dict[str, Any],
+      auth_schemes: Dict[str, Any],
+      global_scheme_name: Optional[str],
+  ) -> ParsedOperation:
+    """Parses a single operation of a spec."""
+    operation = Operation.model_validate(resolver.resolve(operation_dict))
+    operation_parser = OperationParser(operation)
+
+    # Check for operation-specific auth scheme
+    auth_scheme_name = operation_parser.get_auth_scheme_name()
+    auth_scheme_name = (
+        auth_scheme_name if auth_scheme_name else global_scheme_name
+    )
+    auth_scheme = (
+        resolver.resolve(auth_schemes.get(auth_scheme_name))
+        if auth_scheme_name
+        else None
+    )
+
+    return ParsedOperation(
+        name=operation_parser.get_function_name(),
+        description=operation.description or operation.summary or "",
+        endpoint=url,
+        operation=operation,
+        parameters=operation_parser.get_parameters(),
+        return_value=operation_parser.get_return_value(),
+        auth_scheme=auth_scheme,
+        auth_credential=None,  # Placeholder
+        additional_context={},
+    )
@@ -12,8 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
+import hashlib
 import json
 import logging
+import os
+import tempfile
 from typing import Any
 from typing import Dict
 from typing import Final
@@ -28,17 +32,28 @@ import yaml
 from ....agents.readonly_context import ReadonlyContext
 from ....auth.auth_credential import AuthCredential
 from ....auth.auth_schemes import AuthScheme
+from ....version import __version__
+from ..._gemini_schema_util import _to_snake_case
 from ...base_toolset import BaseToolset
 from ...base_toolset import ToolPredicate
+from .http_client import RestApiHttpClient
+from .openapi_spec_parser import LazyParsedOperation
 from .openapi_spec_parser import OpenApiSpecParser
+from .openapi_spec_parser import ParsedOperation
 from .rest_api_tool import RestApiTool
 
 logger = logging.getLogger("google_adk." + __name__)
 
+# Bump when the format of cached operations changes.
+_PARSE_CACHE_FORMAT = 1
+
 
 class OpenAPIToolset(BaseToolset):
   """Class for parsing OpenAPI spec into a list of RestApiTool.
 
+  Operations are parsed, and their tools created, when a tool is first
+  requested, so only the operations actually used are materialized.
+
   Usage:
   ```
     # Initialize OpenAPI toolset from a spec string.
@@ -67,6 +82,8 @@ class OpenAPIToolset(BaseToolset):
       auth_scheme: Optional[AuthScheme] = None,
       auth_credential: Optional[AuthCredential] = None,
       tool_filter: Optional[Union[ToolPredicate, List[str]]] = None,
+      http_client: Optional[RestApiHttpClient] = None,
+      parse_cache_dir: Optional[str] = None,
   ):
     """Initializes the OpenAPIToolset.
 
@@ -102,40 +119,68 @@ class OpenAPIToolset(BaseToolset):
         `google.adk.tools.openapi_tool.auth.auth_helpers`
       tool_filter: The filter used to filter the tools in the toolset. It can be
         either a tool predicate or a list of tool names of the tools to expose.
+      http_client: The client sending the API requests of all tools. Defaults
+        to a pooled client shared by all RestApiTools. The caller remains
+        responsible for closing it.
+      parse_cache_dir: A directory caching the parsed operations of specs,
+        keyed by the hash of the spec. When set, a spec is fully parsed only
+        the first time it's seen, later toolsets of the same spec load the
+        parsed operations from the cache.
     """
     super().__init__(tool_filter=tool_filter)
+    self._http_client = http_client
+    self._auth_scheme = auth_scheme
+    self._auth_credential = auth_credential
     if not spec_dict:
       spec_dict = self._load_spec(spec_str, spec_str_type)
-    self._tools: Final[List[RestApiTool]] = list(self._parse(spec_dict))
-    if auth_scheme or auth_credential:
-      self._configure_auth_all(auth_scheme, auth_credential)
+    self._operations: Final[List[LazyParsedOperation]] = self._parse(
+        spec_dict, parse_cache_dir
+    )
+    self._tool_names: Final[List[str]] = [
+        _to_snake_case(operation.name)[:60] for operation in self._operations
+    ]
+    self._created_tools: Dict[int, RestApiTool] = {}
 
-  def _configure_auth_all(
-      self, auth_scheme: AuthScheme, auth_credential: AuthCredential
-  ):
-    """Configure auth scheme and credential for all tools."""
+  @property
+  def _tools(self) -> List[RestApiTool]:
+    """All tools of the toolset, creating the ones not created yet."""
+    return [self._get_tool_at(i) for i in range(len(self._operations))]
 
-    for tool in self._tools:
-      if auth_scheme:
-        tool.configure_auth_scheme(auth_scheme)
-      if auth_credential:
-        tool.configure_auth_credential(auth_credential)
+  def _get_tool_at(self, index: int) -> RestApiTool:
+    """Gets the tool of the operation at the index, creating it if needed."""
+    tool = self._created_tools.get(index)
+    if tool is None:
+      tool = RestApiTool.from_parsed_operation(
+          self._operations[index].get(), self._http_client
+      )
+      if self._auth_scheme:
+        tool.configure_auth_scheme(self._auth_scheme)
+      if self._auth_credential:
+        tool.configure_auth_credential(self._auth_credential)
+      logger.info("Parsed tool: %s", tool.name)
+      self._created_tools[index] = tool
+    return tool
 
   @override
   async def get_tools(
       self, readonly_context: Optional[ReadonlyContext] = None
   ) -> List[RestApiTool]:
     """Get all tools in the toolset."""
+    indexes = range(len(self._operations))
+    if isinstance(self.tool_filter, list):
+      # Tool names are known without parsing, skip unselected operations.
+      indexes = [i for i in indexes if self._tool_names[i] in self.tool_filter]
     return [
         tool
-        for tool in self._tools
+        for tool in map(self._get_tool_at, indexes)
         if self._is_tool_selected(tool, readonly_context)
     ]
 
   def get_tool(self, tool_name: str) -> Optional[RestApiTool]:
     """Get a tool by name."""
-    matching_tool = filter(lambda t: t.name == tool_name, self._tools)
-    return next(matching_tool, None)
+    if tool_name not in self._tool_names:
+      return None
+    return self._get_tool_at(self._tool_names.index(tool_name))
 
   def _load_spec(
       self, spec_str: str, spec_type: Literal["json", "yaml"]
@@ -148,16 +193,78 @@ class OpenAPIToolset(BaseToolset):
     else:
       raise ValueError(f"Unsupported spec type: {spec_type}")
 
-  def _parse(self, openapi_spec_dict: Dict[str, Any]) -> List[RestApiTool]:
-    """Parse OpenAPI spec into a list of RestApiTool."""
-    operations = OpenApiSpecParser().parse(openapi_spec_dict)
+  def _parse(
+      self,
+      openapi_spec_dict: Dict[str, Any],
+      parse_cache_dir: Optional[str],
+  ) -> List[LazyParsedOperation]:
+    """Parse OpenAPI spec into a list of lazily parsed operations."""
+    if not parse_cache_dir:
+      return OpenApiSpecParser().parse_lazily(openapi_spec_dict)
 
-    tools = []
-    for o in operations:
-      tool = RestApiTool.from_parsed_operation(o)
-      logger.info("Parsed tool: %s", tool.name)
-      tools.append(tool)
-    return tools
+    spec_hash = hashlib.sha256(
+        json.dumps(openapi_spec_dict, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    cache_path = os.path.join(
+        parse_cache_dir,
+        f"openapi-{_PARSE_CACHE_FORMAT}-{__version__}-{spec_hash}.json",
+    )
+    operations = self._load_cached_operations(cache_path)
+    if operations is None:
+      operations = OpenApiSpecParser().parse_lazily(openapi_spec_dict)
+      self._save_cached_operations(cache_path, operations)
+    return operations
+
+  def _load_cached_operations(
+      self, cache_path: str
+  ) -> Optional[List[LazyParsedOperation]]:
+    """Loads the operations cached at the path, or None if not cached."""
+    try:
+      with open(cache_path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+      return [
+          LazyParsedOperation(
+              name=entry["name"],
+              parse=functools.partial(
+                  ParsedOperation.model_validate, entry["parsed"]
+              ),
+          )
+          for entry in entries
+      ]
+    except FileNotFoundError:
+      return None
+    except (OSError, ValueError, TypeError, KeyError) as e:
+      logger.warning("Ignoring invalid parse cache %s: %s", cache_path, e)
+      return None
+
+  def _save_cached_operations(
+      self, cache_path: str, operations: List[LazyParsedOperation]
+  ):
+    """Parses all operations and caches them at the path."""
+    entries = [
+        {
+            "name": operation.name,
+            "parsed": operation.get().model_dump(
+                mode="json", by_alias=True, exclude_none=True
+            ),
+        }
+        for operation in operations
+    ]
+    cache_dir = os.path.dirname(cache_path)
+    try:
+      os.makedirs(cache_dir, exist_ok=True)
+      # Written to a temporary file first, so readers never see a partial
+      # cache.
+      fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+      try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+          json.dump(entries, f)
+        os.replace(tmp_path, cache_path)
+      except BaseException:
+        os.unlink(tmp_path)
+        raise
+    except OSError as e:
+      logger.warning("Failed to write parse cache %s: %s", cache_path, e)
 
   @override
   async def close(self):
@@ -24,7 +24,7 @@ from typing import Union
 
 from fastapi.openapi.models import Operation
 from google.genai.types import FunctionDeclaration
-import requests
+import httpx
 from typing_extensions import override
 
 from ....auth.auth_credential import AuthCredential
@@ -37,6 +37,8 @@ from ..auth.auth_helpers import credential_to_param
 from ..auth.auth_helpers import dict_to_auth_scheme
 from ..auth.credential_exchangers.auto_auth_credential_exchanger import AutoAuthCredentialExchanger
 from ..common.common import ApiParameter
+from .http_client import get_default_http_client
+from .http_client import RestApiHttpClient
 from .openapi_spec_parser import OperationEndpoint
 from .openapi_spec_parser import ParsedOperation
 from .operation_parser import OperationParser
@@ -88,6 +90,7 @@ class RestApiTool(BaseTool):
       auth_scheme: Optional[Union[AuthScheme, str]] = None,
       auth_credential: Optional[Union[AuthCredential, str]] = None,
       should_parse_operation=True,
+      http_client: Optional[RestApiHttpClient] = None,
   ):
     """Initializes the RestApiTool with the given parameters.
 
@@ -115,6 +118,8 @@ class RestApiTool(BaseTool):
           (https://github.com/OAI/OpenAPI-Specification/blob/main/versions/3.1.0.md#security-scheme-object)
         auth_credential: The authentication credential of the tool.
         should_parse_operation: Whether to parse the operation.
+        http_client: The client sending the API requests. Defaults to a pooled
+          client shared by all RestApiTools.
     """
     # Gemini restrict the length of function name to be less than 64 characters
     self.name = name[:60]
@@ -136,15 +141,22 @@ class RestApiTool(BaseTool):
 
     # Private properties
     self.credential_exchanger = AutoAuthCredentialExchanger()
+    self._http_client = http_client
     if should_parse_operation:
       self._operation_parser = OperationParser(self.operation)
 
   @classmethod
-  def from_parsed_operation(cls, parsed: ParsedOperation) -> "RestApiTool":
+  def from_parsed_operation(
+      cls,
+      parsed: ParsedOperation,
+      http_client: Optional[RestApiHttpClient] = None,
+  ) -> "RestApiTool":
     """Initializes the RestApiTool from a ParsedOperation object.
 
     Args:
         parsed: A ParsedOperation object.
+        http_client: The client sending the API requests. Defaults to a pooled
+          client shared by all RestApiTools.
 
     Returns:
         A RestApiTool object.
@@ -163,6 +175,7 @@ class RestApiTool(BaseTool):
         operation=parsed.operation,
         auth_scheme=parsed.auth_scheme,
         auth_credential=parsed.auth_credential,
+        http_client=http_client,
     )
     generated._operation_parser = operation_parser
     return generated
@@ -241,8 +254,8 @@ class RestApiTool(BaseTool):
           caller.
 
     Returns:
-        A dictionary containing the  request parameters for the API call. This
-        initializes a requests.request() call.
+        A dictionary containing the  request parameters for the API call, in
+        the form of requests.request() parameters.
 
     Example:
         self._prepare_request_params({"input_id": "test-id"})
@@ -390,13 +403,14 @@ class RestApiTool(BaseTool):
 
     # Got all parameters. Call the API.
     request_params = self._prepare_request_params(api_params, api_args)
-    response = requests.request(**request_params)
+    http_client = self._http_client or get_default_http_client()
+    response = await http_client.request(**request_params)
 
     # Parse API response
     try:
       response.raise_for_status()  # Raise HTTPError for bad responses
       return response.json()  # Try to decode JSON
-    except requests.exceptions.HTTPError:
+    except httpx.HTTPStatusError:
       error_details = response.content.decode("utf-8")
       return {
           "error": (
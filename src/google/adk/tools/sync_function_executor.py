@@ -0,0 +1,141 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import os
+import time
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+
+def _call_with_start_time(
+    func: Callable[..., Any], kwargs: dict[str, Any]
+) -> tuple[float, Any]:
+  """Calls the function, returning the time it started along with its result."""
+  start_time = time.time()
+  return start_time, func(**kwargs)
+
+
+class SyncFunctionExecutor:
+  """Runs synchronous tool functions outside of the event loop.
+
+  By default the functions run in a bounded thread pool, with the caller's
+  contextvars, e.g. the OpenTelemetry context, propagated to the worker
+  thread. CPU-bound tools can use a process pool instead, in which case the
+  function and its arguments must be picklable and the tool cannot receive a
+  `tool_context`.
+  """
+
+  def __init__(
+      self,
+      max_workers: Optional[int] = None,
+      *,
+      use_process_pool: bool = False,
+  ):
+    """Initializes the executor.
+
+    Args:
+      max_workers: The maximum number of functions running at the same time.
+        Defaults to the defaults of `concurrent.futures`.
+      use_process_pool: Whether to run the functions in worker processes
+        instead of threads.
+    """
+    if use_process_pool:
+      self.max_workers = max_workers or os.cpu_count() or 1
+      self._executor: concurrent.futures.Executor = (
+          concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+      )
+    else:
+      self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+      self._executor = concurrent.futures.ThreadPoolExecutor(
+          max_workers=self.max_workers, thread_name_prefix='adk_tool'
+      )
+    self.use_process_pool = use_process_pool
+
+    self._pending_calls = 0
+    self._completed_calls = 0
+    self._total_wait_time = 0.0
+    self._max_wait_time = 0.0
+
+  async def run(self, func: Callable[..., Any], **kwargs: Any) -> Any:
+    """Runs `func(**kwargs)` in the pool and returns its result."""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(_call_with_start_time, func, kwargs)
+    if not self.use_process_pool:
+      call = functools.partial(contextvars.copy_context().run, call)
+
+    submit_time = time.time()
+    self._pending_calls += 1
+    try:
+      start_time, result = await loop.run_in_executor(self._executor, call)
+    finally:
+      self._pending_calls -= 1
+
+    wait_time = max(start_time - submit_time, 0.0)
+    self._completed_calls += 1
+    self._total_wait_time += wait_time
+    self._max_wait_time = max(self._max_wait_time, wait_time)
+    return result
+
+  def get_metrics(self) -> dict[str, Any]:
+    """Get executor metrics."""
+    return {
+        'max_workers': self.max_workers,
+        'pending_calls': self._pending_calls,
+        'queue_depth': max(self._pending_calls - self.max_workers, 0),
+        'completed_calls': self._completed_calls,
+        'average_wait_time': (
+            self._total_wait_time / self._completed_calls
+            if self._completed_calls
+            else 0.0
+        ),
+        'max_wait_time': self._max_wait_time,
+    }
+
+  def shutdown(self, wait: bool = True) -> None:
+    """Shuts down the underlying pool."""
+    self._executor.shutdown(wait=wait)
+
+
+_default_executor: Optional[SyncFunctionExecutor] = None
+_default_executor_disabled = False
+
+
+def get_default_executor() -> Optional[SyncFunctionExecutor]:
+  """Returns the executor shared by function tools without their own.
+
+  Returns None if offloading was disabled with `set_default_executor(None)`.
+  """
+  global _default_executor
+  if _default_executor is None and not _default_executor_disabled:
+    _default_executor = SyncFunctionExecutor()
+  return _default_executor
+
+
+def set_default_executor(executor: Optional[SyncFunctionExecutor]) -> None:
+  """Sets the executor shared by function tools without their own.
+
+  Args:
+    executor: The executor to use, or None to call synchronous functions
+      directly on the event loop.
+  """
+  global _default_executor, _default_executor_disabled
+  _default_executor = executor
+  _default_executor_disabled = executor is None
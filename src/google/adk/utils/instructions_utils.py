@@ -12,7 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import functools
 import re
+from typing import Union
 
 from ..agents.readonly_context import ReadonlyContext
 from ..sessions.state import State
@@ -21,6 +27,23 @@ __all__ = [
     'inject_session_state',
 ]
 
+_PLACEHOLDER_PATTERN = re.compile(r'{+[^{}]*}+')
+
+_MAX_COMPILED_TEMPLATES = 256
+"""The maximum number of parsed instruction templates kept for reuse."""
+
+
+@dataclasses.dataclass(frozen=True)
+class _Placeholder:
+  """A placeholder for a state value or an artifact in a template."""
+
+  name: str
+  optional: bool
+  is_artifact: bool
+
+
+_Segment = Union[str, _Placeholder]
+
 
 async def inject_session_state(
     template: str,
@@ -60,50 +83,100 @@ async def inject_session_state(
     The instruction template with values populated.
   """
 
+  segments = _compile_template(template)
+  if len(segments) == 1:
+    # No placeholders.
+    return template
+
   invocation_context = readonly_context._invocation_context
 
-  async def _async_sub(pattern, repl_async_fn, string) -> str:
-    result = []
-    last_end = 0
-    for match in re.finditer(pattern, string):
-      result.append(string[last_end : match.start()])
-      replacement = await repl_async_fn(match)
-      result.append(replacement)
-      last_end = match.end()
-    result.append(string[last_end:])
-    return ''.join(result)
-
-  async def _replace_match(match) -> str:
-    var_name = match.group().lstrip('{').rstrip('}').strip()
-    optional = False
-    if var_name.endswith('?'):
-      optional = True
-      var_name = var_name.removesuffix('?')
-    if var_name.startswith('artifact.'):
-      var_name = var_name.removeprefix('artifact.')
+  async def _load_artifact(filename: str) -> str:
+    artifact = await invocation_context.artifact_service.load_artifact(
+        app_name=invocation_context.session.app_name,
+        user_id=invocation_context.session.user_id,
+        session_id=invocation_context.session.id,
+        filename=filename,
+    )
+    if not filename:
+      raise KeyError(f'Artifact {filename} not found.')
+    return str(artifact)
+
+  # Load the artifacts concurrently. Errors are raised in template order.
+  artifact_names = list(
+      dict.fromkeys(
+          segment.name
+          for segment in segments
+          if isinstance(segment, _Placeholder) and segment.is_artifact
+      )
+  )
+  artifacts = {}
+  if artifact_names and invocation_context.artifact_service is not None:
+    artifacts = dict(
+        zip(
+            artifact_names,
+            await asyncio.gather(
+                *(_load_artifact(name) for name in artifact_names),
+                return_exceptions=True,
+            ),
+        )
+    )
+
+  result = []
+  state = invocation_context.session.state
+  for segment in segments:
+    if isinstance(segment, str):
+      result.append(segment)
+    elif segment.is_artifact:
       if invocation_context.artifact_service is None:
         raise ValueError('Artifact service is not initialized.')
-      artifact = await invocation_context.artifact_service.load_artifact(
-          app_name=invocation_context.session.app_name,
-          user_id=invocation_context.session.user_id,
-          session_id=invocation_context.session.id,
-          filename=var_name,
+      artifact = artifacts[segment.name]
+      if isinstance(artifact, BaseException):
+        raise artifact
+      result.append(artifact)
+    elif segment.name in state:
+      result.append(str(state[segment.name]))
+    elif not segment.optional:
+      raise KeyError(f'Context variable not found: `{segment.name}`.')
+  return ''.join(result)
+
+
+@functools.lru_cache(maxsize=_MAX_COMPILED_TEMPLATES)
+def _compile_template(template: str) -> tuple[_Segment, ...]:
+  """Parses the template into literal text and placeholders.
+
+  Literal text and placeholders alternate, starting and ending with literal
+  text. Braces around invalid state names are kept as literal text.
+
+  Args:
+    template: The instruction template.
+
+  Returns:
+    The segments of the template.
+  """
+  segments: list[_Segment] = []
+  literal = []
+  last_end = 0
+  for match in _PLACEHOLDER_PATTERN.finditer(template):
+    literal.append(template[last_end : match.start()])
+    last_end = match.end()
+    var_name = match.group().lstrip('{').rstrip('}').strip()
+    optional = var_name.endswith('?')
+    var_name = var_name.removesuffix('?')
+    if var_name.startswith('artifact.'):
+      placeholder = _Placeholder(
+          var_name.removeprefix('artifact.'), optional, is_artifact=True
       )
-      if not var_name:
-        raise KeyError(f'Artifact {var_name} not found.')
-      return str(artifact)
+    elif _is_valid_state_name(var_name):
+      placeholder = _Placeholder(var_name, optional, is_artifact=False)
     else:
-      if not _is_valid_state_name(var_name):
-        return match.group()
-      if var_name in invocation_context.session.state:
-        return str(invocation_context.session.state[var_name])
-      else:
-        if optional:
-          return ''
-        else:
-          raise KeyError(f'Context variable not found: `{var_name}`.')
-
-  return await _async_sub(r'{+[^{}]*}+', _replace_match, template)
+      literal.append(match.group())
+      continue
+    segments.append(''.join(literal))
+    segments.append(placeholder)
+    literal = []
+  literal.append(template[last_end:])
+  segments.append(''.join(literal))
+  return tuple(segments)
 
 
 def _is_valid_state_name(var_name):
@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import json
 from pathlib import Path
 import sys
 import tempfile
+import time
 from unittest.mock import AsyncMock
 from unittest.mock import Mock
 from unittest.mock import patch
@@ -47,6 +49,7 @@ except ImportError:
 
 from google.adk.events.event import Event
 from google.adk.sessions.session import Session
+from google.genai import types as genai_types
 import httpx
 import pytest
 
@@ -1016,3 +1019,376 @@ class TestRemoteA2aAgentIntegration:
 
                       # Verify A2A client was called
                       mock_a2a_client.send_message.assert_called_once()
+
+
+def _streaming_response(result):
+  """Wrap a task, message or task update into a streaming response."""
+  from a2a.types import SendStreamingMessageResponse
+  from a2a.types import SendStreamingMessageSuccessResponse
+
+  return SendStreamingMessageResponse(
+      root=SendStreamingMessageSuccessResponse(id="request-1", result=result)
+  )
+
+
+def _status_update(state, text=None, role="agent", final=False):
+  from a2a.types import Part as A2APart
+  from a2a.types import TaskStatus
+  from a2a.types import TaskStatusUpdateEvent
+  from a2a.types import TextPart
+
+  message = None
+  if text is not None:
+    message = A2AMessage(
+        messageId=f"message-{text}",
+        role=role,
+        parts=[A2APart(root=TextPart(text=text))],
+    )
+  return TaskStatusUpdateEvent(
+      taskId="task-1",
+      contextId="context-1",
+      status=TaskStatus(state=state, message=message),
+      final=final,
+  )
+
+
+class TestRemoteA2aAgentStreaming:
+  """Test streaming of the remote agent's task updates."""
+
+  def setup_method(self):
+    """Setup test fixtures."""
+    from google.adk.agents.run_config import RunConfig
+    from google.adk.agents.run_config import StreamingMode
+
+    self.agent_card = create_test_agent_card()
+    self.agent_card.capabilities = AgentCapabilities(streaming=True)
+    self.agent = RemoteA2aAgent(name="test_agent", agent_card=self.agent_card)
+    self.agent._is_resolved = True
+    self.agent._a2a_client = Mock()
+
+    self.mock_session = Mock(spec=Session)
+    self.mock_session.id = "session-123"
+    self.mock_session.events = [
+        Event(
+            author="user",
+            invocation_id="invocation-123",
+            content=genai_types.Content(
+                role="user", parts=[genai_types.Part(text="Hi")]
+            ),
+        )
+    ]
+
+    self.mock_context = Mock(spec=InvocationContext)
+    self.mock_context.session = self.mock_session
+    self.mock_context.invocation_id = "invocation-123"
+    self.mock_context.branch = "main"
+    self.mock_context.run_config = RunConfig(
+        streaming_mode=StreamingMode.SSE
+    )
+
+  def _stream(self, *results, gate=None):
+    """Make the client stream the results, pausing before the last one."""
+
+    self.stream_closed = False
+
+    async def send_message_streaming(request):
+      self.streaming_request = request
+      try:
+        for i, result in enumerate(results):
+          if gate is not None and i == len(results) - 1:
+            await gate.wait()
+          yield result
+      finally:
+        self.stream_closed = True
+
+    self.agent._a2a_client.send_message_streaming = send_message_streaming
+
+  @pytest.mark.asyncio
+  async def test_task_updates_are_yielded_as_partial_events(self):
+    """Test that updates are yielded before the remote task completes."""
+    from a2a.types import TaskState
+
+    gate = asyncio.Event()
+    self._stream(
+        _streaming_response(
+            _status_update(TaskState.submitted, "Hi", role="user")
+        ),
+        _streaming_response(_status_update(TaskState.working)),
+        _streaming_response(_status_update(TaskState.working, "Thinking")),
+        _streaming_response(_status_update(TaskState.working, "Done")),
+        _streaming_response(
+            _status_update(TaskState.completed, final=True)
+        ),
+        gate=gate,
+    )
+
+    events = []
+    async for event in self.agent._run_async_impl(self.mock_context):
+      events.append(event)
+      gate.set()
+
+    assert [e.content.parts[0].text for e in events] == [
+        "Thinking",
+        "Done",
+        "Done",
+    ]
+    assert [e.partial for e in events] == [True, True, None]
+    assert self.streaming_request.params.message.parts[0].root.text == "Hi"
+    final = events[-1].custom_metadata
+    assert final[A2A_METADATA_PREFIX + "task_id"] == "task-1"
+    assert final[A2A_METADATA_PREFIX + "context_id"] == "context-1"
+    assert final[A2A_METADATA_PREFIX + "response"]["result"]["status"] == {
+        "state": "completed"
+    }
+
+  @pytest.mark.asyncio
+  async def test_stream_is_closed_after_final_update(self):
+    """Test that the stream is closed when it ends with a final update."""
+    from a2a.types import TaskState
+
+    self._stream(
+        _streaming_response(
+            _status_update(TaskState.completed, "Done", final=True)
+        ),
+        _streaming_response(_status_update(TaskState.working, "Ignored")),
+    )
+
+    events = [
+        event async for event in self.agent._run_async_impl(self.mock_context)
+    ]
+
+    assert [e.content.parts[0].text for e in events] == ["Done"]
+    assert self.stream_closed
+
+  @pytest.mark.asyncio
+  async def test_artifact_updates_are_streamed(self):
+    """Test that artifact chunks are yielded and appended to the task."""
+    from a2a.types import Artifact
+    from a2a.types import Part as A2APart
+    from a2a.types import TaskArtifactUpdateEvent
+    from a2a.types import TaskState
+    from a2a.types import TextPart
+
+    def chunk(text, append):
+      return _streaming_response(
+          TaskArtifactUpdateEvent(
+              taskId="task-1",
+              contextId="context-1",
+              artifact=Artifact(
+                  artifactId="answer",
+                  parts=[A2APart(root=TextPart(text=text))],
+              ),
+              append=append,
+          )
+      )
+
+    self._stream(
+        chunk("Hello", append=False),
+        chunk(" world", append=True),
+        _streaming_response(
+            _status_update(TaskState.completed, "Hello world", final=True)
+        ),
+    )
+
+    events = [
+        event async for event in self.agent._run_async_impl(self.mock_context)
+    ]
+
+    assert [e.content.parts[0].text for e in events] == [
+        "Hello",
+        " world",
+        "Hello world",
+    ]
+    response = events[-1].custom_metadata[A2A_METADATA_PREFIX + "response"]
+    assert [p["text"] for p in response["result"]["artifacts"][0]["parts"]] == [
+        "Hello",
+        " world",
+    ]
+
+  @pytest.mark.asyncio
+  async def test_stream_error_response_yields_error_event(self):
+    """Test that an error streamed by the remote agent is surfaced."""
+    from a2a.types import InternalError
+    from a2a.types import JSONRPCErrorResponse
+    from a2a.types import SendStreamingMessageResponse
+
+    self._stream(
+        SendStreamingMessageResponse(
+            root=JSONRPCErrorResponse(
+                id="request-1", error=InternalError(message="Remote failed")
+            )
+        )
+    )
+
+    events = [
+        event async for event in self.agent._run_async_impl(self.mock_context)
+    ]
+
+    assert len(events) == 1
+    assert events[0].error_message == "Remote failed"
+
+  @pytest.mark.asyncio
+  async def test_does_not_stream_without_sse_mode(self):
+    """Test that the non-streaming endpoint is used outside SSE mode."""
+    from google.adk.agents.run_config import RunConfig
+
+    self.mock_context.run_config = RunConfig()
+    self.agent._a2a_client.send_message = AsyncMock(
+        side_effect=RuntimeError("not streaming")
+    )
+    self._stream()
+
+    events = [
+        event async for event in self.agent._run_async_impl(self.mock_context)
+    ]
+
+    assert len(events) == 1
+    assert "not streaming" in events[0].error_message
+
+
+class TestRemoteA2aAgentHistorySync:
+  """Test that only new history is sent to the remote agent."""
+
+  def setup_method(self):
+    """Setup test fixtures."""
+    from google.adk.agents.run_config import RunConfig
+
+    self.agent = RemoteA2aAgent(
+        name="test_agent", agent_card=create_test_agent_card()
+    )
+    self.agent._is_resolved = True
+    self.agent._a2a_client = Mock()
+    self.agent._a2a_client.send_message = AsyncMock(
+        side_effect=self._send_message
+    )
+    self.sent_requests = []
+    self.fail = False
+
+    self.session = Session(id="session-123", app_name="app", user_id="user")
+    self.mock_context = Mock(spec=InvocationContext)
+    self.mock_context.session = self.session
+    self.mock_context.invocation_id = "invocation-123"
+    self.mock_context.branch = None
+    self.mock_context.run_config = RunConfig()
+
+  async def _send_message(self, request):
+    from a2a.types import Part as A2APart
+    from a2a.types import SendMessageResponse
+    from a2a.types import TextPart
+
+    self.sent_requests.append(request)
+    if self.fail:
+      raise httpx.ConnectError("Connection refused")
+    return SendMessageResponse(
+        root=SendMessageSuccessResponse(
+            id=request.id,
+            result=A2AMessage(
+                messageId=str(len(self.sent_requests)),
+                role="agent",
+                parts=[A2APart(root=TextPart(text="ok"))],
+                contextId="context-1",
+            ),
+        )
+    )
+
+  def _add_events(self, count, author="user"):
+    for i in range(count):
+      self.session.events.append(
+          Event(
+              author=author,
+              invocation_id="invocation-123",
+              content=genai_types.Content(
+                  role="user", parts=[genai_types.Part(text=f"{author} {i}")]
+              ),
+          )
+      )
+
+  async def _hop(self):
+    """Run the agent once, appending its events like the runner does."""
+    async for event in self.agent._run_async_impl(self.mock_context):
+      self.session.events.append(event)
+
+  def _sent_texts(self):
+    return [p.root.text for p in self.sent_requests[-1].params.message.parts]
+
+  @pytest.mark.asyncio
+  async def test_benchmark_1000_event_session(self):
+    from google.adk.agents import remote_a2a_agent
+
+    self._add_events(500)
+    self._add_events(500, author="other_agent")
+    with patch.object(
+        remote_a2a_agent,
+        "convert_genai_part_to_a2a_part",
+        wraps=remote_a2a_agent.convert_genai_part_to_a2a_part,
+    ) as convert_part:
+      start = time.perf_counter()
+      await self._hop()
+      first_hop = time.perf_counter() - start
+      first_hop_conversions = convert_part.call_count
+
+      self._add_events(1)
+      start = time.perf_counter()
+      await self._hop()
+      second_hop = time.perf_counter() - start
+
+    assert len(self.sent_requests) == 2
+    assert self._sent_texts() == ["user 0"]
+    assert self.sent_requests[-1].params.message.contextId == "context-1"
+    assert convert_part.call_count == first_hop_conversions + 1
+    assert second_hop < first_hop / 5
+
+  @pytest.mark.asyncio
+  async def test_parts_keep_event_order(self):
+    self.session.events.append(
+        Event(
+            author="user",
+            invocation_id="invocation-123",
+            content=genai_types.Content(
+                role="user",
+                parts=[genai_types.Part(text="a"), genai_types.Part(text="b")],
+            ),
+        )
+    )
+    self._add_events(1)
+
+    await self._hop()
+
+    assert self._sent_texts() == ["a", "b", "user 0"]
+
+  @pytest.mark.asyncio
+  async def test_failed_request_is_resent_in_same_context(self):
+    from google.adk.agents import remote_a2a_agent
+
+    self._add_events(2)
+    await self._hop()
+    self._add_events(3)
+    self.fail = True
+    await self._hop()
+    assert self.session.events[-1].error_message
+
+    self.fail = False
+    with patch.object(
+        remote_a2a_agent,
+        "convert_genai_part_to_a2a_part",
+        wraps=remote_a2a_agent.convert_genai_part_to_a2a_part,
+    ) as convert_part:
+      await self._hop()
+
+    assert self._sent_texts() == ["user 0", "user 1", "user 2"]
+    assert self.sent_requests[-1].params.message.contextId == "context-1"
+    assert convert_part.call_count == 0
+
+  @pytest.mark.asyncio
+  async def test_falls_back_to_last_reply_without_synced_history(self):
+    self._add_events(2)
+    await self._hop()
+    self._add_events(1)
+    # E.g. a new agent instance, or events removed from the session.
+    self.agent._synced_histories.clear()
+    self.agent._converted_parts.clear()
+
+    await self._hop()
+
+    assert self._sent_texts() == ["user 0"]
+    assert self.sent_requests[-1].params.message.contextId == "context-1"
@@ -31,3 +31,9 @@ def test_validate_max_llm_calls_too_large():
       ValueError, match=f"max_llm_calls should be less than {sys.maxsize}."
   ):
     RunConfig.validate_max_llm_calls(sys.maxsize)
+
+
+@pytest.mark.parametrize("value", [0, -1])
+def test_max_concurrent_function_calls_must_be_positive(value):
+  with pytest.raises(ValueError):
+    RunConfig(max_concurrent_function_calls=value)
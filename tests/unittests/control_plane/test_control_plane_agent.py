@@ -0,0 +1,130 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from google.adk.control_plane import ControlPlaneAgent
+from google.adk.control_plane import PolicyType
+from google.adk.control_plane.policy_types import Policy
+from google.adk.control_plane.policy_types import PolicyResult
+from google.genai import types
+import pytest
+
+from .. import testing_utils
+
+
+class DeniedToolsPolicy(Policy):
+  policy_type: PolicyType = PolicyType.SECURITY
+  denied_tools: list[str] = []
+
+  async def evaluate(self, context):
+    tool_name = context.metadata.get('tool_name')
+    allowed = tool_name not in self.denied_tools
+    return PolicyResult(
+        allowed=allowed,
+        policy_name=self.name,
+        policy_type=self.policy_type,
+        reason=None if allowed else f'{tool_name} is denied',
+    )
+
+
+def read(path: str) -> str:
+  return f'content of {path}'
+
+
+def delete(path: str) -> str:
+  return f'deleted {path}'
+
+
+def _function_responses(events):
+  return [
+      (part.function_response.name, part.function_response.response)
+      for event in events
+      for part in event.content.parts
+      if part.function_response
+  ]
+
+
+def _agent(function_calls, **kwargs):
+  model = testing_utils.MockModel.create(responses=[
+      [types.Part(function_call=call) for call in function_calls],
+      'done',
+  ])
+  agent = ControlPlaneAgent(
+      name='control_plane', model=model, tools=[read, delete], **kwargs
+  )
+  agent.register_policy(
+      DeniedToolsPolicy(name='denied_tools', denied_tools=['delete'])
+  )
+  return agent
+
+
+@pytest.mark.asyncio
+async def test_blocked_tool_call_is_not_run():
+  agent = _agent(
+      [types.FunctionCall(name='delete', args={'path': 'a'})]
+  )
+
+  events = await testing_utils.InMemoryRunner(agent).run_async('test')
+
+  assert _function_responses(events) == [(
+      'delete',
+      {'policy_blocked': True, 'policy_reason': 'delete is denied'},
+  )]
+
+
+@pytest.mark.asyncio
+async def test_allowed_tool_call_falls_through_to_before_tool_callbacks():
+  def before_tool_callback(tool, args, tool_context):
+    if args['path'] == 'cached':
+      return {'result': 'from callback'}
+
+  agent = _agent(
+      [
+          types.FunctionCall(name='read', args={'path': 'cached'}),
+          types.FunctionCall(name='read', args={'path': 'a'}),
+      ],
+      before_tool_callback=before_tool_callback,
+  )
+
+  events = await testing_utils.InMemoryRunner(agent).run_async('test')
+
+  assert _function_responses(events) == [
+      ('read', {'result': 'from callback'}),
+      ('read', {'result': 'content of a'}),
+  ]
+  assert agent.before_tool_callback is before_tool_callback
+
+
+@pytest.mark.asyncio
+async def test_parallel_tool_calls_are_checked_in_one_batch(mocker):
+  agent = _agent([
+      types.FunctionCall(name='read', args={'path': 'a'}),
+      types.FunctionCall(name='delete', args={'path': 'b'}),
+      types.FunctionCall(name='read', args={'path': 'c'}),
+  ])
+  evaluate_many = mocker.spy(agent.policy_engine, 'evaluate_many')
+
+  events = await testing_utils.InMemoryRunner(agent).run_async('test')
+
+  assert _function_responses(events) == [
+      ('read', {'result': 'content of a'}),
+      (
+          'delete',
+          {'policy_blocked': True, 'policy_reason': 'delete is denied'},
+      ),
+      ('read', {'result': 'content of c'}),
+  ]
+  assert evaluate_many.call_count == 1
+  assert [
+      context.action for context in evaluate_many.call_args.args[0]
+  ] == ['tool_call:read', 'tool_call:delete', 'tool_call:read']
@@ -0,0 +1,352 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+
+from google.adk.control_plane import PolicyEngine
+from google.adk.control_plane import PolicyType
+from google.adk.control_plane import ResourcePolicy
+from google.adk.control_plane import SecurityPolicy
+from google.adk.control_plane.policy_types import Policy
+from google.adk.control_plane.policy_types import PolicyContext
+from google.adk.control_plane.policy_types import PolicyResult
+import pytest
+
+
+class CountingPolicy(Policy):
+  policy_type: PolicyType = PolicyType.RATE_LIMIT
+  allowed: bool = True
+  calls: int = 0
+
+  async def evaluate(self, context):
+    self.calls += 1
+    return PolicyResult(
+        allowed=self.allowed,
+        policy_name=self.name,
+        policy_type=self.policy_type,
+    )
+
+  def cache_key(self, context):
+    return context.action if self.pure else None
+
+
+def _context(**kwargs):
+  defaults = dict(
+      agent_name='agent',
+      user_id='user',
+      session_id='session',
+      action='read',
+      metadata={'authenticated': True},
+  )
+  defaults.update(kwargs)
+  return PolicyContext(**defaults)
+
+
+@pytest.mark.asyncio
+async def test_plan_is_sorted_by_priority_across_types():
+  engine = PolicyEngine()
+  engine.register_policy(SecurityPolicy(name='low', priority=1))
+  engine.register_policy(ResourcePolicy(name='high', priority=10))
+  engine.register_policy(SecurityPolicy(name='disabled', enabled=False))
+
+  decision = await engine.evaluate(
+      _context(),
+      {PolicyType.SECURITY, PolicyType.RESOURCE},
+      fail_fast=False,
+  )
+
+  assert [r.policy_name for r in decision.evaluated_policies] == [
+      'high',
+      'low',
+  ]
+
+
+@pytest.mark.asyncio
+async def test_plan_is_recompiled_on_register_and_unregister():
+  engine = PolicyEngine()
+  engine.register_policy(SecurityPolicy(name='security'))
+  assert (await engine.evaluate(_context())).allowed
+
+  engine.register_policy(ResourcePolicy(name='deny', denied_resources=['db']))
+  assert not (await engine.evaluate(_context(resource='db'))).allowed
+
+  engine.unregister_policy('deny')
+  assert (await engine.evaluate(_context(resource='db'))).allowed
+
+
+@pytest.mark.asyncio
+async def test_decisions_of_pure_policies_are_cached():
+  engine = PolicyEngine()
+  policy = CountingPolicy(name='counting', pure=True)
+  engine.register_policy(policy)
+  engine.register_policy(
+      ResourcePolicy(name='resources', denied_resources=['secret/*'])
+  )
+
+  first = await engine.evaluate(_context(resource='docs/a'))
+  # Differs only in fields the pure policies ignore.
+  second = await engine.evaluate(
+      _context(resource='docs/a', session_id='other')
+  )
+  denied = await engine.evaluate(_context(resource='secret/a'))
+
+  assert second == first and second is not first
+  assert first.allowed and not denied.allowed
+  assert policy.calls == 2
+  metrics = engine.get_metrics()
+  assert metrics['decision_cache_hits'] == 1
+  assert metrics['decision_cache_misses'] == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_decisions_are_not_shared_with_callers():
+  engine = PolicyEngine()
+  engine.register_policy(
+      ResourcePolicy(name='resources', denied_resources=['secret/*'])
+  )
+
+  first = await engine.evaluate(_context(resource='secret/a'))
+  first.allowed = True
+  first.blocking_policies.clear()
+  second = await engine.evaluate(_context(resource='secret/a'))
+  second.recommendations.append('ask an admin')
+  third = await engine.evaluate(_context(resource='secret/a'))
+
+  assert not third.allowed
+  assert third.blocking_policies
+  assert 'ask an admin' not in third.recommendations
+  assert engine.get_metrics()['decision_cache_hits'] == 2
+
+
+@pytest.mark.asyncio
+async def test_toggling_a_policy_changes_the_plan():
+  engine = PolicyEngine()
+  policy = ResourcePolicy(name='resources', denied_resources=['secret/*'])
+  engine.register_policy(policy)
+  assert not (await engine.evaluate(_context(resource='secret/a'))).allowed
+
+  policy.enabled = False
+  assert (await engine.evaluate(_context(resource='secret/a'))).allowed
+
+  policy.enabled = True
+  assert not (await engine.evaluate(_context(resource='secret/a'))).allowed
+
+
+@pytest.mark.asyncio
+async def test_decisions_of_impure_policies_are_not_cached():
+  engine = PolicyEngine()
+  policy = CountingPolicy(name='counting')
+  engine.register_policy(policy)
+
+  await engine.evaluate(_context())
+  await engine.evaluate(_context())
+
+  assert policy.calls == 2
+  assert engine.get_metrics()['decision_cache_size'] == 0
+
+
+@pytest.mark.asyncio
+async def test_decision_cache_evicts_least_recently_used():
+  engine = PolicyEngine(decision_cache_size=2)
+  engine.register_policy(ResourcePolicy(name='resources'))
+
+  for resource in ['a', 'b', 'a', 'c']:
+    await engine.evaluate(_context(resource=resource))
+  await engine.evaluate(_context(resource='a'))
+
+  metrics = engine.get_metrics()
+  assert metrics['decision_cache_size'] == 2
+  assert metrics['decision_cache_hits'] == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_deny_and_are_not_cached():
+  class FailingPolicy(CountingPolicy):
+
+    async def evaluate(self, context):
+      self.calls += 1
+      raise RuntimeError('store unavailable')
+
+  engine = PolicyEngine()
+  policy = FailingPolicy(name='failing', pure=True)
+  engine.register_policy(policy)
+
+  decision = await engine.evaluate(_context())
+  await engine.evaluate(_context())
+
+  assert not decision.allowed
+  assert 'store unavailable' in decision.blocking_policies[0].reason
+  assert policy.calls == 2
+
+
+class SlowPolicy(CountingPolicy):
+  delay: float = 0.0
+  finished: bool = False
+
+  async def evaluate(self, context):
+    self.calls += 1
+    await asyncio.sleep(self.delay)
+    self.finished = True
+    return PolicyResult(
+        allowed=self.allowed,
+        policy_name=self.name,
+        policy_type=self.policy_type,
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_mode_evaluates_a_tier_concurrently():
+  engine = PolicyEngine(concurrent=True)
+  for i in range(5):
+    engine.register_policy(SlowPolicy(name=f'slow-{i}', delay=0.05))
+
+  start = time.perf_counter()
+  decision = await engine.evaluate(_context())
+  elapsed = time.perf_counter() - start
+
+  assert decision.allowed
+  assert [r.policy_name for r in decision.evaluated_policies] == [
+      f'slow-{i}' for i in range(5)
+  ]
+  assert elapsed < 0.2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('concurrent', [False, True])
+async def test_fail_fast_stops_at_first_denial_in_priority_order(concurrent):
+  engine = PolicyEngine(concurrent=concurrent)
+  before = SlowPolicy(name='before', priority=1, delay=0.05)
+  deny = SlowPolicy(name='deny', priority=1, allowed=False)
+  after = SlowPolicy(name='after', priority=1, delay=0.05)
+  lower = SlowPolicy(name='lower', priority=0)
+  for policy in [before, deny, after, lower]:
+    engine.register_policy(policy)
+
+  decision = await engine.evaluate(_context())
+
+  assert [r.policy_name for r in decision.evaluated_policies] == [
+      'before',
+      'deny',
+  ]
+  assert [r.policy_name for r in decision.blocking_policies] == ['deny']
+  assert before.finished
+  assert not after.finished
+  assert lower.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_without_fail_fast_all_tiers_are_evaluated():
+  engine = PolicyEngine()
+  engine.register_policy(SlowPolicy(name='deny', priority=1, allowed=False))
+  engine.register_policy(SlowPolicy(name='allow'))
+
+  decision = await engine.evaluate_parallel(_context())
+
+  assert [r.policy_name for r in decision.evaluated_policies] == [
+      'deny',
+      'allow',
+  ]
+  assert not decision.allowed
+
+
+@pytest.mark.asyncio
+async def test_policy_timeout_denies():
+  engine = PolicyEngine(concurrent=True, policy_timeout=0.01)
+  engine.register_policy(SlowPolicy(name='stuck', delay=10, pure=True))
+  engine.register_policy(SlowPolicy(name='fast'))
+
+  decision = await engine.evaluate(_context(), fail_fast=False)
+
+  assert not decision.allowed
+  assert [r.policy_name for r in decision.blocking_policies] == ['stuck']
+  assert 'timed out' in decision.blocking_policies[0].reason
+
+
+@pytest.mark.asyncio
+async def test_evaluate_many_shares_decisions_of_equal_contexts():
+  engine = PolicyEngine()
+  pure = CountingPolicy(name='pure', pure=True)
+  engine.register_policy(pure)
+  engine.register_policy(
+      ResourcePolicy(name='resources', denied_resources=['secret/*'])
+  )
+  contexts = [
+      _context(resource='docs/a'),
+      _context(resource='secret/a'),
+      _context(resource='docs/a', session_id='other'),
+  ]
+
+  decisions = await engine.evaluate_many(contexts)
+
+  assert [d.allowed for d in decisions] == [True, False, True]
+  assert decisions[0] == decisions[2]
+  assert pure.calls == 2
+  assert (await engine.evaluate(contexts[1])) == decisions[1]
+  assert engine.get_metrics()['decision_cache_hits'] == 1
+
+
+@pytest.mark.asyncio
+async def test_evaluate_many_evaluates_impure_contexts_separately():
+  engine = PolicyEngine()
+  impure = SlowPolicy(name='impure', delay=0.05)
+  engine.register_policy(impure)
+
+  start = time.perf_counter()
+  decisions = await engine.evaluate_many([_context()] * 3)
+
+  assert impure.calls == 3
+  assert decisions[0] is not decisions[1]
+  assert time.perf_counter() - start < 0.15
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_coalesced_into_one_batch(mocker):
+  engine = PolicyEngine()
+  engine.register_policy(
+      ResourcePolicy(name='resources', denied_resources=['secret/*'])
+  )
+  evaluate_many = mocker.spy(engine, 'evaluate_many')
+
+  decisions = await asyncio.gather(
+      engine.evaluate_coalesced(_context(resource='docs/a')),
+      engine.evaluate_coalesced(_context(resource='secret/a')),
+      engine.evaluate_coalesced(_context(resource='docs/b')),
+  )
+
+  assert [d.allowed for d in decisions] == [True, False, True]
+  assert evaluate_many.call_count == 1
+  assert len(evaluate_many.call_args.args[0]) == 3
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_cancels_its_callers():
+  engine = PolicyEngine()
+  engine.register_policy(SlowPolicy(name='slow', delay=10))
+
+  callers = [
+      asyncio.create_task(engine.evaluate_coalesced(_context(action=action)))
+      for action in ('read', 'write')
+  ]
+  await asyncio.sleep(0.01)
+  for task in list(engine._batch_tasks):
+    task.cancel()
+  results = await asyncio.wait_for(
+      asyncio.gather(*callers, return_exceptions=True), timeout=1
+  )
+
+  assert [type(result) for result in results] == [
+      asyncio.CancelledError,
+      asyncio.CancelledError,
+  ]
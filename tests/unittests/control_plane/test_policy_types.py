@@ -0,0 +1,117 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import fnmatch
+import time
+
+from google.adk.control_plane import ResourcePolicy
+from google.adk.control_plane._glob_patterns import GlobPatternSet
+from google.adk.control_plane.policy_types import PolicyContext
+import pytest
+
+
+def _context(resource):
+  return PolicyContext(
+      agent_name='agent',
+      user_id='user',
+      session_id='session',
+      action='read',
+      resource=resource,
+  )
+
+
+def _fnmatch_first(patterns, name):
+  return next((p for p in patterns if fnmatch.fnmatchcase(name, p)), None)
+
+
+def test_pattern_set_matches_like_fnmatch():
+  patterns = [
+      'db/users/*/email',
+      'db/users/*',
+      'db/users/42',
+      'db/orders',
+      'db/*',
+      'logs/????-??-??',
+      'logs/[!a-z]*',
+      '*',
+  ]
+  names = [
+      'db/users/42',
+      'db/users/42/email',
+      'db/orders',
+      'db/ordersX',
+      'logs/2025-01-01',
+      'logs/1',
+      'logs/x',
+      'other',
+      '',
+  ]
+
+  for start in range(len(patterns)):
+    pattern_set = GlobPatternSet(patterns[start:])
+    for name in names:
+      assert pattern_set.match(name) == _fnmatch_first(
+          patterns[start:], name
+      ), (patterns[start:], name)
+
+
+@pytest.mark.asyncio
+async def test_resource_policy_reports_first_matching_pattern():
+  policy = ResourcePolicy(
+      name='resources',
+      allowed_resources=['docs/*', 'docs/public/*'],
+      denied_resources=['docs/secret*', 'docs/secret/plans'],
+  )
+
+  denied = await policy.evaluate(_context('docs/secret/plans'))
+  allowed = await policy.evaluate(_context('docs/public/a'))
+  unlisted = await policy.evaluate(_context('images/a'))
+
+  assert not denied.allowed
+  assert denied.reason.endswith('denied pattern docs/secret*')
+  assert allowed.allowed
+  assert allowed.reason.endswith('allowed pattern docs/*')
+  assert not unlisted.allowed
+
+
+@pytest.mark.asyncio
+async def test_resource_policy_recompiles_on_assignment():
+  policy = ResourcePolicy(name='resources')
+  assert (await policy.evaluate(_context('db/a'))).allowed
+
+  policy.denied_resources = ['db/*']
+
+  assert not (await policy.evaluate(_context('db/a'))).allowed
+
+
+@pytest.mark.asyncio
+async def test_benchmark_10k_patterns():
+  num_patterns = 10_000
+  policy = ResourcePolicy(
+      name='resources',
+      denied_resources=[f'tenant-{i}/secret/*' for i in range(num_patterns)],
+      allowed_resources=[f'tenant-{i}/*' for i in range(num_patterns)],
+  )
+  resources = [f'tenant-{i}/docs/a' for i in range(0, num_patterns, 7)]
+
+  start = time.perf_counter()
+  for resource in resources:
+    assert (await policy.evaluate(_context(resource))).allowed
+  check_rate = len(resources) / (time.perf_counter() - start)
+
+  assert not (
+      await policy.evaluate(_context(f'tenant-{num_patterns - 1}/secret/a'))
+  ).allowed
+  # A linear fnmatch scan manages about a hundred checks per second here.
+  assert check_rate > 5000
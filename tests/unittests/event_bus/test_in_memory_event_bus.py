@@ -0,0 +1,418 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+
+from google.adk.event_bus import InMemoryEventBus
+from google.adk.event_bus._topic_trie import TopicTrie
+from google.adk.event_bus.base_event_bus import EventPriority
+from google.adk.event_bus.base_event_bus import OverflowPolicy
+import pytest
+
+
+@pytest.mark.parametrize(
+    'pattern, topic, matches',
+    [
+        ('pillar.finance', 'pillar.finance', True),
+        ('pillar.finance', 'pillar.finance.invoices', False),
+        ('pillar.finance.*', 'pillar.finance.invoices', True),
+        ('pillar.finance.*', 'pillar.finance', False),
+        ('pillar.finance.*', 'pillar.finance.invoices.paid', False),
+        ('pillar.*.invoices', 'pillar.finance.invoices', True),
+        ('alerts.#', 'alerts', True),
+        ('alerts.#', 'alerts.security.critical', True),
+        ('alerts.#', 'alert.security', False),
+        ('#', 'any.topic', True),
+        ('alerts.#.critical', 'alerts.critical', True),
+        ('alerts.#.critical', 'alerts.security.network.critical', True),
+        ('alerts.#.critical', 'alerts.security.warning', False),
+    ],
+)
+def test_topic_trie_match(pattern, topic, matches):
+  trie = TopicTrie()
+  trie.add(pattern, 'value')
+
+  assert trie.match(topic) == ({'value'} if matches else set())
+
+
+def test_topic_trie_remove_prunes_empty_nodes():
+  trie = TopicTrie()
+  trie.add('a.b.c', 'first')
+  trie.add('a.*', 'second')
+
+  trie.remove('a.b.c', 'first')
+  trie.remove('a.b.c', 'unknown')
+
+  assert trie.match('a.b.c') == set()
+  assert trie.match('a.b') == {'second'}
+  assert 'b' not in trie._root.children['a'].children
+
+
+@pytest.mark.asyncio
+async def test_wildcard_subscriptions():
+  bus = InMemoryEventBus()
+  received = []
+  await bus.subscribe(
+      'finance', ['pillar.finance.*'], lambda e: received.append(('f', e.topic))
+  )
+  alerts = await bus.subscribe(
+      'alerts', ['alerts.#'], lambda e: received.append(('a', e.topic))
+  )
+
+  for topic in ['pillar.finance.invoices', 'pillar.ops.tasks', 'alerts.x.y']:
+    await bus.publish(topic=topic, event_type='t', source='s', payload={})
+  await bus.unsubscribe(alerts.id)
+  await bus.publish(topic='alerts', event_type='t', source='s', payload={})
+
+  assert received == [('f', 'pillar.finance.invoices'), ('a', 'alerts.x.y')]
+
+
+@pytest.mark.asyncio
+async def test_overlapping_patterns_deliver_once():
+  bus = InMemoryEventBus()
+  received = []
+  await bus.subscribe(
+      'subscriber', ['a.b', 'a.*', 'a.#'], lambda e: received.append(e)
+  )
+
+  await bus.publish(topic='a.b', event_type='t', source='s', payload={})
+
+  assert len(received) == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_for_event_matches_correlation_id():
+  bus = InMemoryEventBus()
+  waiter = asyncio.create_task(
+      bus.wait_for_event(topic='replies', correlation_id='2', timeout=1)
+  )
+  any_waiter = asyncio.create_task(
+      bus.wait_for_event(topic='replies', event_type='reply', timeout=1)
+  )
+  await asyncio.sleep(0)
+
+  await bus.publish(
+      topic='replies',
+      event_type='other',
+      source='s',
+      payload={},
+      correlation_id='2',
+  )
+  await bus.publish(
+      topic='replies',
+      event_type='reply',
+      source='s',
+      payload={},
+      correlation_id='1',
+  )
+
+  assert (await waiter).event_type == 'other'
+  assert (await any_waiter).correlation_id == '1'
+  assert bus.get_metrics()['waiting_futures'] == 0
+
+
+@pytest.mark.asyncio
+async def test_wait_for_event_timeout_removes_waiter():
+  bus = InMemoryEventBus()
+
+  assert await bus.wait_for_event(topic='t', timeout=0.01) is None
+  assert bus.get_metrics()['waiting_futures'] == 0
+
+
+@pytest.mark.asyncio
+async def test_benchmark_10k_subscriptions_and_waiters():
+  num = 10_000
+  bus = InMemoryEventBus(max_history=10)
+  received = []
+  for i in range(num):
+    await bus.subscribe(f'sub-{i}', [f'pillar.{i}.*'], received.append)
+  waiters = [
+      asyncio.create_task(
+          bus.wait_for_event(topic='replies', correlation_id=str(i), timeout=30)
+      )
+      for i in range(num)
+  ]
+  await asyncio.sleep(0)
+
+  start = time.perf_counter()
+  for i in range(num):
+    await bus.publish(
+        topic=f'pillar.{i}.events', event_type='t', source='s', payload={}
+    )
+    await bus.publish(
+        topic='replies',
+        event_type='reply',
+        source='s',
+        payload={},
+        correlation_id=str(i),
+    )
+  replies = await asyncio.gather(*waiters)
+  seconds = time.perf_counter() - start
+
+  assert len(received) == num
+  assert [reply.correlation_id for reply in replies] == [
+      str(i) for i in range(num)
+  ]
+  # A linear scan of subscriptions and waiters takes 2 * 10k^2 comparisons.
+  assert seconds < 10
+
+
+def _naive_history(events, topic, event_type, source, start_time, end_time):
+  return [
+      event
+      for event in reversed(events)
+      if (not topic or event.topic == topic)
+      and (not event_type or event.event_type == event_type)
+      and (not source or event.source == source)
+      and (not start_time or event.timestamp >= start_time)
+      and (not end_time or event.timestamp <= end_time)
+  ]
+
+
+@pytest.mark.asyncio
+async def test_event_history_matches_linear_scan():
+  bus = InMemoryEventBus(max_history=50)
+  published = []
+  for i in range(120):
+    published.append(
+        await bus.publish(
+            topic=f'topic-{i % 3}',
+            event_type=f'type-{i % 4}',
+            source=f'source-{i % 5}',
+            payload={'i': i},
+        )
+    )
+  retained = published[-50:]
+  start_time = retained[10].timestamp
+  end_time = retained[40].timestamp
+
+  for topic in [None, 'topic-1', 'topic-9']:
+    for event_type in [None, 'type-2']:
+      for source in [None, 'source-3']:
+        for time_range in [(None, None), (start_time, end_time)]:
+          history = await bus.get_event_history(
+              topic=topic,
+              event_type=event_type,
+              source=source,
+              start_time=time_range[0],
+              end_time=time_range[1],
+              limit=1000,
+          )
+          assert history == _naive_history(
+              retained, topic, event_type, source, *time_range
+          )
+
+  assert bus.get_metrics()['total_events'] == 50
+  assert len(await bus.get_event_history(limit=5)) == 5
+
+
+@pytest.mark.asyncio
+async def test_evicted_events_leave_no_index_entries():
+  bus = InMemoryEventBus(max_history=10)
+  for i in range(1000):
+    await bus.publish(
+        topic=f'reply.{i}', event_type='reply', source='s', payload={}
+    )
+
+  assert len(bus._event_history._by_topic) == 10
+  assert await bus.get_event_history(topic='reply.5') == []
+  assert len(await bus.get_event_history(topic='reply.995')) == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_for_event_returns_event_from_history():
+  bus = InMemoryEventBus()
+  reply = await bus.publish(
+      topic='replies',
+      event_type='reply',
+      source='s',
+      payload={},
+      correlation_id='1',
+  )
+  await bus.publish(
+      topic='replies',
+      event_type='reply',
+      source='s',
+      payload={},
+      correlation_id='2',
+  )
+
+  assert (
+      await bus.wait_for_event(topic='replies', correlation_id='1', timeout=0)
+      is reply
+  )
+
+
+@pytest.mark.asyncio
+async def test_benchmark_history_queries():
+  num_events = 100_000
+  bus = InMemoryEventBus(max_history=num_events)
+  for i in range(num_events):
+    await bus.publish(
+        topic='rare' if i % 1000 == 0 else 'common',
+        event_type='t',
+        source='s',
+        payload={},
+    )
+
+  start = time.perf_counter()
+  for _ in range(1000):
+    history = await bus.get_event_history(topic='rare', limit=1000)
+  seconds = time.perf_counter() - start
+
+  assert len(history) == 100
+  # A linear scan visits 100k events per query.
+  assert seconds < 2
+
+
+@pytest.mark.asyncio
+async def test_queued_delivery_does_not_wait_for_slow_handler():
+  bus = InMemoryEventBus(queue_size=10)
+  release = asyncio.Event()
+  fast_received = []
+
+  async def slow_handler(event):
+    await release.wait()
+
+  await bus.subscribe('slow', ['topic'], slow_handler)
+  await bus.subscribe('fast', ['topic'], fast_received.append)
+
+  for i in range(3):
+    await asyncio.wait_for(
+        bus.publish(topic='topic', event_type='t', source='s', payload={}),
+        timeout=1,
+    )
+  await asyncio.sleep(0.01)
+
+  assert len(fast_received) == 3
+  release.set()
+  await bus.drain()
+  metrics = bus.get_metrics()
+  assert metrics['queued_events'] == 0
+  assert sorted(
+      m['delivered_events'] for m in metrics['subscriber_queues'].values()
+  ) == [3, 3]
+  bus.clear()
+
+
+async def _publish_while_blocked(bus, priorities):
+  """Publishes events while the subscriber's handler is busy."""
+  release = asyncio.Event()
+  received = []
+
+  async def handler(event):
+    if event.payload['i'] == 0:
+      await release.wait()
+    received.append(event.payload['i'])
+
+  await bus.subscribe('subscriber', ['topic'], handler)
+  for i, priority in enumerate(priorities):
+    await bus.publish(
+        topic='topic',
+        event_type='t',
+        source='s',
+        payload={'i': i},
+        priority=priority,
+    )
+    # Let the worker pick up the first event.
+    await asyncio.sleep(0)
+  release.set()
+  await bus.drain()
+  bus.clear()
+  return received
+
+
+@pytest.mark.asyncio
+async def test_queued_delivery_by_priority():
+  bus = InMemoryEventBus(queue_size=10)
+
+  received = await _publish_while_blocked(
+      bus,
+      [
+          EventPriority.NORMAL,
+          EventPriority.LOW,
+          EventPriority.NORMAL,
+          EventPriority.CRITICAL,
+          EventPriority.HIGH,
+          EventPriority.CRITICAL,
+      ],
+  )
+
+  assert received == [0, 3, 5, 4, 2, 1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'overflow_policy, expected',
+    [
+        (OverflowPolicy.DROP_NEWEST, [0, 1, 2]),
+        (OverflowPolicy.DROP_OLDEST, [0, 3, 4]),
+    ],
+)
+async def test_queued_delivery_drops_on_overflow(overflow_policy, expected):
+  bus = InMemoryEventBus(queue_size=2, overflow_policy=overflow_policy)
+
+  received = await _publish_while_blocked(bus, [EventPriority.NORMAL] * 5)
+
+  assert received == expected
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_keeps_higher_priority_events():
+  bus = InMemoryEventBus(
+      queue_size=2, overflow_policy=OverflowPolicy.DROP_OLDEST
+  )
+
+  received = await _publish_while_blocked(
+      bus,
+      [
+          EventPriority.NORMAL,
+          EventPriority.HIGH,
+          EventPriority.LOW,
+          EventPriority.NORMAL,
+      ],
+  )
+
+  assert received == [0, 1, 3]
+
+
+@pytest.mark.asyncio
+async def test_queued_delivery_blocks_publisher_when_full():
+  bus = InMemoryEventBus(queue_size=1, overflow_policy=OverflowPolicy.BLOCK)
+  release = asyncio.Event()
+
+  async def handler(event):
+    await release.wait()
+
+  await bus.subscribe('subscriber', ['topic'], handler)
+  await bus.publish(topic='topic', event_type='t', source='s', payload={})
+  await asyncio.sleep(0)
+  await bus.publish(topic='topic', event_type='t', source='s', payload={})
+
+  publish = asyncio.create_task(
+      bus.publish(topic='topic', event_type='t', source='s', payload={})
+  )
+  await asyncio.sleep(0.01)
+  assert not publish.done()
+
+  release.set()
+  await publish
+  await bus.drain()
+  metrics = bus.get_metrics()
+  assert metrics['dropped_events'] == 0
+  (queue_metrics,) = metrics['subscriber_queues'].values()
+  assert queue_metrics['delivered_events'] == 3
+  assert queue_metrics['max_lag'] > 0
+  bus.clear()
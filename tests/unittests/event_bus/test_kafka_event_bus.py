@@ -0,0 +1,399 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for KafkaEventBus against an in-process stand-in for aiokafka."""
+
+import asyncio
+from collections import namedtuple
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+import time
+import types
+import zlib
+
+from google.adk.event_bus import EventMessage
+from google.adk.event_bus import kafka_event_bus
+from google.adk.event_bus import KafkaEventBus
+from google.adk.event_bus._event_codec import decode_event
+from google.adk.event_bus._event_codec import encode_event
+from google.adk.event_bus.base_event_bus import EventPriority
+import pytest
+
+TopicPartition = namedtuple('TopicPartition', ['topic', 'partition'])
+Record = namedtuple('Record', ['topic', 'partition', 'offset', 'key', 'value'])
+
+
+class FakeBroker:
+  """A single in-process broker with partitioned topics and groups."""
+
+  def __init__(self, num_partitions=3):
+    self.num_partitions = num_partitions
+    self.logs = {}
+    self.committed = {}
+    self.members = {}
+    self.batches = []
+
+  def partitions(self, topic):
+    return self.logs.setdefault(
+        topic, [[] for _ in range(self.num_partitions)]
+    )
+
+  def add_partition(self, topic):
+    self.partitions(topic).append([])
+
+  def end_offset(self, tp):
+    return len(self.partitions(tp.topic)[tp.partition])
+
+  def write_batch(self, batch):
+    self.batches.append(batch)
+    for topic, partition, key, value in batch:
+      log = self.partitions(topic)[partition]
+      log.append(Record(topic, partition, len(log), key, value))
+
+  def client(self):
+    broker = self
+
+    class AIOKafkaProducer:
+
+      def __init__(self, linger_ms, **kwargs):
+        self._linger = linger_ms / 1000
+        self._batch = []
+        self._timer = None
+        self._round_robin = 0
+
+      async def start(self):
+        pass
+
+      async def stop(self):
+        await self.flush()
+
+      async def partitions_for(self, topic):
+        return set(range(len(broker.partitions(topic))))
+
+      async def send(self, topic, value, key=None):
+        num_partitions = len(broker.partitions(topic))
+        if key is None:
+          self._round_robin += 1
+          partition = self._round_robin % num_partitions
+        else:
+          partition = zlib.crc32(key) % num_partitions
+        self._batch.append((topic, partition, key, value))
+        if self._timer is None:
+          self._timer = asyncio.get_running_loop().call_later(
+              self._linger, self._deliver
+          )
+
+      async def flush(self):
+        self._deliver()
+
+      def _deliver(self):
+        if self._timer is not None:
+          self._timer.cancel()
+          self._timer = None
+        if self._batch:
+          broker.write_batch(self._batch)
+          self._batch = []
+
+    class AIOKafkaConsumer:
+
+      def __init__(self, *topics, group_id, auto_offset_reset=None, **kwargs):
+        self._topics = topics
+        self._group_id = group_id
+        self._assigned = []
+        self._positions = {}
+
+      async def start(self):
+        for topic in self._topics:
+          broker.members.setdefault((self._group_id, topic), []).append(self)
+          # Resolve the positions of the current assignment eagerly.
+          self._assignment()
+
+      async def stop(self):
+        for topic in self._topics:
+          broker.members[(self._group_id, topic)].remove(self)
+
+      def assign(self, tps):
+        self._assigned = list(tps)
+
+      def seek(self, tp, offset):
+        self._positions[tp] = offset
+
+      async def seek_to_beginning(self, *tps):
+        for tp in tps:
+          self._positions[tp] = 0
+
+      async def seek_to_end(self, *tps):
+        for tp in tps:
+          self._positions[tp] = broker.end_offset(tp)
+
+      async def position(self, tp):
+        return self._positions[tp]
+
+      def _assignment(self):
+        if not self._topics:
+          return self._assigned
+        tps = []
+        for topic in self._topics:
+          members = broker.members[(self._group_id, topic)]
+          index = members.index(self)
+          for partition in range(len(broker.partitions(topic))):
+            if partition % len(members) == index:
+              tps.append(TopicPartition(topic, partition))
+        for tp in tps:
+          if tp not in self._positions:
+            self._positions[tp] = broker.committed.get(
+                (self._group_id, tp), broker.end_offset(tp)
+            )
+        for tp in list(self._positions):
+          if tp not in tps:
+            del self._positions[tp]
+        return tps
+
+      async def getmany(self, timeout_ms, max_records):
+        deadline = time.monotonic() + timeout_ms / 1000
+        while True:
+          batches = {}
+          remaining = max_records
+          for tp in self._assignment():
+            log = broker.partitions(tp.topic)[tp.partition]
+            records = log[self._positions[tp] :][:remaining]
+            if records:
+              batches[tp] = records
+              self._positions[tp] += len(records)
+              remaining -= len(records)
+          if batches or time.monotonic() >= deadline:
+            return batches
+          await asyncio.sleep(0.001)
+
+      async def commit(self):
+        for tp, offset in self._positions.items():
+          broker.committed[(self._group_id, tp)] = offset
+
+    return types.SimpleNamespace(
+        AIOKafkaProducer=AIOKafkaProducer,
+        AIOKafkaConsumer=AIOKafkaConsumer,
+        TopicPartition=TopicPartition,
+    )
+
+
+async def _wait_until(condition, timeout=2):
+  deadline = time.monotonic() + timeout
+  while not condition():
+    assert time.monotonic() < deadline, 'condition not met in time'
+    await asyncio.sleep(0.001)
+
+
+@pytest.fixture
+def broker():
+  return FakeBroker()
+
+
+@pytest.mark.parametrize(
+    'timestamp',
+    [
+        datetime(2025, 6, 1, 12, 30, 15, 123456),
+        datetime(2025, 6, 1, 12, 30, tzinfo=timezone(timedelta(hours=-7))),
+    ],
+)
+def test_codec_round_trip(timestamp):
+  event = EventMessage(
+      topic='pillar.finance',
+      event_type='invoice.created',
+      source='agent',
+      timestamp=timestamp,
+      priority=EventPriority.HIGH,
+      payload={'amount': 12.5, 'name': 'Zoë'},
+      metadata={'trace': [1, 2]},
+      correlation_id='c1',
+  )
+
+  data = encode_event(event)
+
+  assert decode_event(data) == event
+  assert len(data) < len(str(event.to_dict()))
+
+
+@pytest.mark.asyncio
+async def test_publish_and_subscribe(broker):
+  bus = KafkaEventBus(kafka_client=broker.client())
+  received = []
+  await bus.subscribe('sub', ['orders'], received.append)
+
+  event = await bus.publish(
+      'orders', 'created', 'shop', {'id': 1}, priority=EventPriority.HIGH
+  )
+
+  await _wait_until(lambda: len(received) == 1)
+  assert received[0] == event
+  assert await bus.get_event_history(topic='orders') == [event]
+  await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_events_of_a_correlation_share_a_partition(broker):
+  bus = KafkaEventBus(kafka_client=broker.client())
+  for i in range(10):
+    await bus.publish('orders', 't', 's', {'i': i}, correlation_id='order-1')
+  await bus.flush()
+
+  logs = [log for log in broker.logs['orders'] if log]
+  assert len(logs) == 1
+  assert [decode_event(r.value).payload['i'] for r in logs[0]] == list(
+      range(10)
+  )
+  assert logs[0][0].key == b'order-1'
+  await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_producer_batches_events(broker):
+  bus = KafkaEventBus(kafka_client=broker.client(), linger_ms=50)
+  for i in range(20):
+    await bus.publish('orders', 't', 's', {'i': i})
+  assert not broker.batches
+
+  await bus.flush()
+
+  assert len(broker.batches) == 1
+  assert len(broker.batches[0]) == 20
+  await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_group_members_share_partitions(broker):
+  received = {'a': [], 'b': []}
+  buses = []
+  for name in received:
+    bus = KafkaEventBus(kafka_client=broker.client(), client_id=name)
+    await bus.subscribe(name, ['orders'], received[name].append)
+    buses.append(bus)
+
+  for i in range(30):
+    await buses[0].publish(
+        'orders', 't', 's', {'i': i}, correlation_id=f'order-{i}'
+    )
+  await buses[0].flush()
+
+  await _wait_until(lambda: sum(map(len, received.values())) == 30)
+  assert received['a'] and received['b']
+  assert sorted(
+      e.payload['i'] for events in received.values() for e in events
+  ) == list(range(30))
+  for bus in buses:
+    await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_consumer_group_resumes_from_committed_offset(broker):
+  bus = KafkaEventBus(kafka_client=broker.client())
+  received = []
+  await bus.subscribe('sub', ['orders'], received.append)
+  await bus.publish('orders', 't', 's', {'i': 0})
+  await _wait_until(lambda: len(received) == 1)
+  await bus.stop()
+
+  producer = KafkaEventBus(kafka_client=broker.client())
+  await producer.publish('orders', 't', 's', {'i': 1})
+  await producer.stop()
+
+  bus = KafkaEventBus(kafka_client=broker.client())
+  received = []
+  await bus.subscribe('sub', ['orders'], received.append)
+  await _wait_until(lambda: len(received) == 1)
+  assert received[0].payload == {'i': 1}
+  await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_request_reply_across_buses(broker):
+  responder = KafkaEventBus(kafka_client=broker.client(), group_id='service')
+
+  async def reply(event):
+    await responder.publish(
+        event.reply_to,
+        'pong',
+        'service',
+        {'echo': event.payload['n']},
+        correlation_id=event.correlation_id,
+    )
+    await responder.flush()
+
+  await responder.subscribe('service', ['ping'], reply)
+  requester = KafkaEventBus(kafka_client=broker.client(), group_id='client')
+
+  response = await requester.request_reply(
+      'ping', 'ping', 'client', {'n': 7}, reply_timeout=2
+  )
+
+  assert response.event_type == 'pong'
+  assert response.payload == {'echo': 7}
+  assert requester.get_metrics()['waiting_futures'] == 0
+  await requester.stop()
+  await responder.stop()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_event_times_out(broker):
+  bus = KafkaEventBus(kafka_client=broker.client())
+
+  assert await bus.wait_for_event('orders', timeout=0.05) is None
+  assert bus.get_metrics()['waiting_futures'] == 0
+  await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_listener_picks_up_new_partitions(broker, monkeypatch):
+  monkeypatch.setattr(kafka_event_bus, '_PARTITIONS_REFRESH_SECONDS', 0)
+  bus = KafkaEventBus(kafka_client=broker.client())
+  await bus.publish('orders', 'early', 's', {})
+  await bus.flush()
+  waiter = asyncio.create_task(
+      bus.wait_for_event('orders', event_type='late', timeout=3)
+  )
+  await _wait_until(lambda: 'orders' in bus._listeners)
+
+  broker.add_partition('orders')
+  event = EventMessage(topic='orders', event_type='late', source='s')
+  broker.write_batch([('orders', 3, None, encode_event(event))])
+
+  assert await waiter == event
+  await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_polls_are_retried_with_backoff(broker, monkeypatch):
+  monkeypatch.setattr(kafka_event_bus, '_MIN_RETRY_DELAY_SECONDS', 0.01)
+  bus = KafkaEventBus(kafka_client=broker.client())
+  received = []
+  await bus.subscribe('sub', ['orders'], received.append)
+  consumer = bus._consumers['orders']
+  getmany = consumer.getmany
+  failures = []
+
+  async def flaky_getmany(**kwargs):
+    if len(failures) < 4:
+      failures.append(time.monotonic())
+      raise ConnectionError('broker unavailable')
+    return await getmany(**kwargs)
+
+  consumer.getmany = flaky_getmany
+  await bus.publish('orders', 't', 's', {'i': 0})
+
+  await _wait_until(lambda: len(received) == 1)
+  delays = [later - earlier for earlier, later in zip(failures, failures[1:])]
+  assert delays[0] >= 0.01
+  assert delays[1] >= 0.02
+  assert delays[2] >= 0.04
+  await bus.stop()
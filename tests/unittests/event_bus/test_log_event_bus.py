@@ -0,0 +1,244 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+import time
+
+from google.adk.event_bus import LocalLogEventBus
+import pytest
+
+
+async def _publish(bus, topic, count, start=0, **kwargs):
+  for i in range(start, start + count):
+    await bus.publish(
+        topic=topic, event_type='t', source='s', payload={'i': i}, **kwargs
+    )
+
+
+async def _wait_until(condition, timeout=2):
+  deadline = time.monotonic() + timeout
+  while not condition():
+    assert time.monotonic() < deadline, 'condition not met in time'
+    await asyncio.sleep(0.001)
+
+
+async def _replayed(bus, topic, offset=0):
+  return [
+      (offset, event.payload['i'])
+      async for offset, event in bus.replay(topic, offset)
+  ]
+
+
+@pytest.mark.asyncio
+async def test_events_survive_restart(tmp_path):
+  bus = LocalLogEventBus(str(tmp_path))
+  await _publish(bus, 'pillar/finance.invoices', 3)
+  await bus.close()
+
+  bus = LocalLogEventBus(str(tmp_path))
+  await _publish(bus, 'pillar/finance.invoices', 1, start=3)
+
+  assert await _replayed(bus, 'pillar/finance.invoices') == [
+      (0, 0),
+      (1, 1),
+      (2, 2),
+      (3, 3),
+  ]
+  assert await _replayed(bus, 'pillar/finance.invoices', offset=2) == [
+      (2, 2),
+      (3, 3),
+  ]
+  history = await bus.get_event_history(topic='pillar/finance.invoices')
+  assert [event.payload['i'] for event in history] == [3, 2, 1, 0]
+  await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_consumer_group_resumes_from_committed_offset(tmp_path):
+  bus = LocalLogEventBus(str(tmp_path), auto_offset_reset='earliest')
+  await _publish(bus, 'topic', 2)
+  received = []
+  await bus.subscribe('group', ['topic'], lambda e: received.append(e))
+  await _wait_until(lambda: len(received) == 2)
+  assert bus.get_committed_offset('group', 'topic') == 2
+  await bus.close()
+
+  bus = LocalLogEventBus(str(tmp_path))
+  await _publish(bus, 'topic', 2, start=2)
+  received = []
+  await bus.subscribe('group', ['topic'], lambda e: received.append(e))
+  await _wait_until(lambda: len(received) == 2)
+
+  assert [event.payload['i'] for event in received] == [2, 3]
+  assert bus.get_metrics()['consumer_lag'] == {'group': {'topic': 0}}
+  await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_new_group_starts_at_latest_offset(tmp_path):
+  bus = LocalLogEventBus(str(tmp_path))
+  await _publish(bus, 'topic', 2)
+  received = []
+  await bus.subscribe(
+      'group', ['topic'], lambda e: received.append(e), event_types=['t']
+  )
+  await _publish(bus, 'topic', 1, start=2)
+  await _wait_until(lambda: received)
+
+  assert [event.payload['i'] for event in received] == [2]
+  await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_seek_replays_group(tmp_path):
+  bus = LocalLogEventBus(str(tmp_path))
+  received = []
+  await bus.subscribe('group', ['topic'], lambda e: received.append(e))
+  await _publish(bus, 'topic', 3)
+  await _wait_until(lambda: len(received) == 3)
+
+  bus.seek('group', 'topic', 1)
+  await _wait_until(lambda: len(received) == 5)
+
+  assert [event.payload['i'] for event in received] == [0, 1, 2, 1, 2]
+  await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_segments_roll_and_retention_by_size(tmp_path):
+  bus = LocalLogEventBus(
+      str(tmp_path), segment_bytes=1024, retention_bytes=2048
+  )
+  await _publish(bus, 'topic', 40)
+
+  metrics = bus.get_metrics()['topics']['topic']
+  assert metrics['end_offset'] == 40
+  assert metrics['start_offset'] > 0
+  assert metrics['size_bytes'] <= 2048 + 1024
+  replayed = await _replayed(bus, 'topic')
+  assert replayed[0][0] == metrics['start_offset']
+  assert [i for _, i in replayed] == list(range(metrics['start_offset'], 40))
+  await bus.close()
+
+  bus = LocalLogEventBus(str(tmp_path))
+  assert bus.get_metrics()['topics']['topic'] == metrics
+  await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_retention_by_age(tmp_path):
+  bus = LocalLogEventBus(
+      str(tmp_path), segment_bytes=1024, retention_seconds=3600
+  )
+  await _publish(bus, 'topic', 20)
+  assert bus.get_metrics()['topics']['topic']['start_offset'] == 0
+
+  bus.retention_seconds = 0
+  bus.enforce_retention()
+
+  metrics = bus.get_metrics()['topics']['topic']
+  # Only the active segment is left.
+  assert metrics['segments'] == 1
+  assert metrics['start_offset'] > 0
+  await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_torn_record_is_truncated(tmp_path):
+  bus = LocalLogEventBus(str(tmp_path))
+  await _publish(bus, 'topic', 3)
+  await bus.close()
+
+  # Simulates a crash in the middle of writing the last record.
+  (segment,) = (tmp_path / 'topics' / 'topic').iterdir()
+  with open(segment, 'r+b') as f:
+    f.truncate(os.path.getsize(segment) - 5)
+
+  bus = LocalLogEventBus(str(tmp_path))
+  assert await _replayed(bus, 'topic') == [(0, 0), (1, 1)]
+  await _publish(bus, 'topic', 1, start=3)
+  assert await _replayed(bus, 'topic') == [(0, 0), (1, 1), (2, 3)]
+  await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_request_reply(tmp_path):
+  bus = LocalLogEventBus(str(tmp_path))
+
+  async def reply(event):
+    await bus.publish(
+        topic=event.reply_to,
+        event_type='reply',
+        source='responder',
+        payload={'answer': 42},
+        correlation_id=event.correlation_id,
+    )
+
+  await bus.subscribe('responder', ['requests'], reply)
+  response = await bus.request_reply(
+      topic='requests',
+      event_type='question',
+      source='asker',
+      payload={},
+      reply_timeout=2,
+  )
+
+  assert response.payload == {'answer': 42}
+  await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_benchmark_publish_and_replay(tmp_path):
+  num_events = 20_000
+  bus = LocalLogEventBus(str(tmp_path), segment_bytes=1024 * 1024)
+
+  start = time.perf_counter()
+  await _publish(bus, 'topic', num_events)
+  publish_rate = num_events / (time.perf_counter() - start)
+
+  start = time.perf_counter()
+  replayed = await _replayed(bus, 'topic')
+  replay_rate = num_events / (time.perf_counter() - start)
+
+  assert len(replayed) == num_events
+  assert bus.get_metrics()['topics']['topic']['segments'] > 1
+  # Loose floors, typically an order of magnitude higher.
+  assert publish_rate > 2000
+  assert replay_rate > 2000
+  await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_subscriptions_of_a_group_share_its_offset(tmp_path):
+  bus = LocalLogEventBus(str(tmp_path), max_batch_size=2)
+  received = []
+
+  async def handler(event):
+    await asyncio.sleep(0.001)
+    received.append(event)
+
+  for _ in range(2):
+    await bus.subscribe('group', ['topic'], handler)
+  await _publish(bus, 'topic', 5)
+  await _wait_until(lambda: bus.get_committed_offset('group', 'topic') == 5)
+  await asyncio.sleep(0.01)
+
+  assert sorted(event.payload['i'] for event in received) == [0, 1, 2, 3, 4]
+  await bus.close()
+
+
+def test_segment_bytes_must_be_positive(tmp_path):
+  with pytest.raises(ValueError, match='segment_bytes'):
+    LocalLogEventBus(str(tmp_path), segment_bytes=0)
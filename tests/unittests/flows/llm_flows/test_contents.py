@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+
 from google.adk.agents import Agent
+from google.adk.agents import ContextWindowConfig
 from google.adk.events.event import Event
 from google.adk.flows.llm_flows import contents
 from google.adk.flows.llm_flows.contents import _convert_foreign_event
@@ -20,7 +23,9 @@ from google.adk.flows.llm_flows.contents import _get_contents
 from google.adk.flows.llm_flows.contents import _merge_function_response_events
 from google.adk.flows.llm_flows.contents import _rearrange_events_for_async_function_responses_in_history
 from google.adk.flows.llm_flows.contents import _rearrange_events_for_latest_function_response
+from google.adk.flows.llm_flows.functions import remove_client_function_call_id
 from google.adk.models import LlmRequest
+from google.adk.sessions.base_session_service import GetSessionConfig
 from google.genai import types
 import pytest
 
@@ -359,3 +364,379 @@ def test_rearrange_events_for_latest_function_response():
   # Should remove intermediate events and merge responses
   assert len(rearranged) == 2
   assert rearranged[0] == call_event
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("include_contents", ["default", "none"])
+async def test_content_processor_loads_older_events(include_contents):
+  """Older session events are paged in only as far as the contents need."""
+  agent = Agent(
+      model="gemini-1.5-flash", name="agent", include_contents=include_contents
+  )
+  invocation_context = await testing_utils.create_invocation_context(
+      agent=agent
+  )
+  session_service = invocation_context.session_service
+  session = invocation_context.session
+  texts = [f"message {i}" for i in range(12)]
+  for text in texts:
+    await session_service.append_event(
+        session,
+        Event(
+            author="user",
+            content=types.Content(
+                role="user", parts=[types.Part.from_text(text=text)]
+            ),
+        ),
+    )
+    await session_service.append_event(
+        session,
+        Event(
+            author="agent",
+            content=types.Content(
+                role="model", parts=[types.Part.from_text(text="ok")]
+            ),
+        ),
+    )
+  invocation_context.session = await session_service.get_session(
+      app_name=session.app_name,
+      user_id=session.user_id,
+      session_id=session.id,
+      config=GetSessionConfig(num_recent_events=1),
+  )
+  llm_request = LlmRequest(model="gemini-1.5-flash")
+
+  async for _ in contents.request_processor.run_async(
+      invocation_context, llm_request
+  ):
+    pass
+
+  request_texts = [content.parts[0].text for content in llm_request.contents]
+  if include_contents == "default":
+    assert request_texts == [t for text in texts for t in (text, "ok")]
+    assert not invocation_context.session.has_older_events
+  else:
+    assert request_texts == ["message 11", "ok"]
+    assert invocation_context.session.has_older_events
+
+
+def _text_event(author, text):
+  return Event(
+      author=author,
+      content=types.Content(
+          role="user" if author == "user" else "model",
+          parts=[types.Part.from_text(text=text)],
+      ),
+  )
+
+
+def _call_event(*call_ids):
+  return Event(
+      author="agent",
+      content=types.Content(
+          role="model",
+          parts=[
+              types.Part(
+                  function_call=types.FunctionCall(
+                      id=call_id, name="tool", args={"id": call_id}
+                  )
+              )
+              for call_id in call_ids
+          ],
+      ),
+  )
+
+
+def _response_event(*call_ids):
+  return Event(
+      author="agent",
+      content=types.Content(
+          role="user",
+          parts=[
+              types.Part(
+                  function_response=types.FunctionResponse(
+                      id=call_id, name="tool", response={"id": call_id}
+                  )
+              )
+              for call_id in call_ids
+          ],
+      ),
+  )
+
+
+def _rearranged_contents(events):
+  """The contents of the events, always rearranging them."""
+  events = _rearrange_events_for_latest_function_response(events)
+  events = _rearrange_events_for_async_function_responses_in_history(events)
+  result = []
+  for event in events:
+    content = copy.deepcopy(event.content)
+    remove_client_function_call_id(content)
+    result.append(content)
+  return result
+
+
+@pytest.mark.parametrize(
+    "events",
+    [
+        [
+            _text_event("user", "hi"),
+            _call_event("adk-1", "adk-2"),
+            _response_event("adk-1", "adk-2"),
+            _call_event("adk-3"),
+            _response_event("adk-3"),
+            _text_event("agent", "done"),
+        ],
+        [
+            _text_event("user", "hi"),
+            _call_event("adk-1"),
+            _response_event("adk-1"),
+            _text_event("agent", "started"),
+            _text_event("user", "and now?"),
+            _response_event("adk-1"),
+            _text_event("agent", "done"),
+        ],
+        [
+            _text_event("user", "hi"),
+            _call_event("adk-1", "adk-2"),
+            _response_event("adk-1"),
+            _response_event("adk-2"),
+            _text_event("agent", "done"),
+        ],
+        [
+            _text_event("user", "hi"),
+            _call_event("adk-1"),
+            _text_event("agent", "waiting"),
+            _response_event("adk-1"),
+        ],
+        [
+            _call_event(None),
+            _response_event(None),
+            _call_event(None),
+            _response_event(None),
+        ],
+    ],
+    ids=["paired", "async", "split", "interleaved", "no_ids"],
+)
+def test_contents_builder_matches_rearranged_events(events):
+  """Incremental builds match rearranging all events at every step."""
+  builder = contents._ContentsBuilder(None, "agent")
+
+  for num_events in range(1, len(events) + 1):
+    assert builder.build(events[:num_events]) == _rearranged_contents(
+        events[:num_events]
+    )
+
+
+def test_contents_builder_copies_contents_once(mocker):
+  """Events of previous builds are not processed again."""
+  events = [_text_event("user", "hi")]
+  for i in range(50):
+    events += [_call_event(f"adk-{i}"), _response_event(f"adk-{i}")]
+  builder = contents._ContentsBuilder(None, "agent")
+  deepcopy = mocker.spy(contents.copy, "deepcopy")
+
+  for num_events in range(1, len(events) + 1):
+    request_contents = builder.build(events[:num_events])
+
+  assert deepcopy.call_count == len(events)
+  assert not builder._needs_rearrangement
+  assert len(request_contents) == len(events)
+  # Client function call ids are removed from the copies only.
+  assert request_contents[1].parts[0].function_call.id is None
+  assert events[1].content.parts[0].function_call.id == "adk-0"
+
+
+def test_contents_builder_isolates_requests():
+  """Changes to the contents of a request don't leak into later requests."""
+  events = [_text_event("user", "hi"), _text_event("agent", "hello")]
+  builder = contents._ContentsBuilder(None, "agent")
+
+  first = builder.build(events)
+  first[0].parts[0] = types.Part.from_text(text="replaced")
+  first[1].parts[0].thought = True
+  second = builder.build(events)
+
+  assert second == [event.content for event in events]
+
+
+def test_contents_builder_rebuilds_when_history_changes():
+  """Events added before the previously built ones are included."""
+  older_events = [_text_event("user", "first"), _text_event("agent", "one")]
+  events = [_text_event("user", "second"), _text_event("agent", "two")]
+  builder = contents._ContentsBuilder(None, "agent")
+
+  builder.build(events)
+  request_contents = builder.build(older_events + events)
+
+  assert [content.parts[0].text for content in request_contents] == [
+      "first",
+      "one",
+      "second",
+      "two",
+  ]
+
+
+@pytest.mark.asyncio
+async def test_content_processor_reuses_builder_within_invocation(mocker):
+  """Each LLM call of an invocation only processes the new events."""
+  agent = Agent(model="gemini-1.5-flash", name="agent")
+  invocation_context = await testing_utils.create_invocation_context(
+      agent=agent
+  )
+  session = invocation_context.session
+  session.events = [_text_event("user", "hi")]
+  deepcopy = mocker.spy(contents.copy, "deepcopy")
+
+  for i in range(3):
+    session.events += [_call_event(f"adk-{i}"), _response_event(f"adk-{i}")]
+    llm_request = LlmRequest(model="gemini-1.5-flash")
+    async for _ in contents.request_processor.run_async(
+        invocation_context, llm_request
+    ):
+      pass
+
+  assert len(llm_request.contents) == 7
+  assert deepcopy.call_count == 7
+
+
+def _window_texts(events, **kwargs):
+  request_contents = contents._ContentsBuilder(None, "agent").build(
+      events, ContextWindowConfig(**kwargs)
+  )
+  return [
+      part.text
+      or (part.function_call and f"call {part.function_call.id}")
+      or f"response {part.function_response.id}"
+      for content in request_contents
+      for part in content.parts
+  ]
+
+
+def test_context_window_keeps_most_recent_events():
+  events = [_text_event("user", f"message {i}") for i in range(5)]
+
+  assert _window_texts(events, max_events=2) == ["message 3", "message 4"]
+  # Each message is estimated as 3 tokens.
+  assert _window_texts(events, max_tokens=10) == [
+      "message 2",
+      "message 3",
+      "message 4",
+  ]
+  assert _window_texts(events, max_events=10, max_tokens=100) == [
+      f"message {i}" for i in range(5)
+  ]
+
+
+def test_context_window_keeps_function_calls_with_responses():
+  events = [
+      _text_event("user", "hi"),
+      _call_event("1"),
+      _response_event("1"),
+      _call_event("2"),
+      _response_event("2"),
+  ]
+
+  # Only function calls fit, so the user turn before them is kept too.
+  assert _window_texts(events, max_events=3) == [
+      "hi",
+      "call 2",
+      "response 2",
+  ]
+  # The latest events are kept even if they don't fit.
+  assert _window_texts(events, max_events=1) == [
+      "hi",
+      "call 2",
+      "response 2",
+  ]
+
+
+def test_context_window_starts_with_user_turn():
+  events = [
+      _text_event("user", "hi"),
+      _call_event("1"),
+      _response_event("1"),
+      _text_event("user", "again"),
+      _text_event("agent", "ok"),
+  ]
+
+  assert _window_texts(events, max_events=4) == ["again", "ok"]
+
+
+def test_context_window_keeps_pinned_events():
+  events = [
+      _text_event("user", "request"),
+      _text_event("agent", "pinned"),
+      _text_event("agent", "older"),
+      _text_event("agent", "recent"),
+  ]
+
+  assert _window_texts(
+      events,
+      max_events=1,
+      pinned=lambda event: event.author == "user"
+      or event.content.parts[0].text == "pinned",
+  ) == ["request", "pinned", "recent"]
+
+
+@pytest.mark.asyncio
+async def test_content_processor_applies_context_window():
+  agent = Agent(
+      model="gemini-1.5-flash",
+      name="agent",
+      context_window=ContextWindowConfig(max_events=2),
+  )
+  invocation_context = await testing_utils.create_invocation_context(
+      agent=agent
+  )
+  invocation_context.session.events = [
+      _text_event("user", f"message {i}") for i in range(5)
+  ]
+  llm_request = LlmRequest(model="gemini-1.5-flash")
+
+  async for _ in contents.request_processor.run_async(
+      invocation_context, llm_request
+  ):
+    pass
+
+  assert [content.parts[0].text for content in llm_request.contents] == [
+      "message 3",
+      "message 4",
+  ]
+
+
+@pytest.mark.asyncio
+async def test_content_processor_loads_older_events_to_fill_context_window():
+  agent = Agent(
+      model="gemini-1.5-flash",
+      name="agent",
+      context_window=ContextWindowConfig(max_events=150),
+  )
+  invocation_context = await testing_utils.create_invocation_context(
+      agent=agent
+  )
+  session_service = invocation_context.session_service
+  session = invocation_context.session
+  for i in range(400):
+    await session_service.append_event(
+        session, _text_event("user", f"message {i}")
+    )
+  invocation_context.session = await session_service.get_session(
+      app_name=session.app_name,
+      user_id=session.user_id,
+      session_id=session.id,
+      config=GetSessionConfig(num_recent_events=10),
+  )
+  llm_request = LlmRequest(model="gemini-1.5-flash")
+
+  async for _ in contents.request_processor.run_async(
+      invocation_context, llm_request
+  ):
+    pass
+
+  assert [content.parts[0].text for content in llm_request.contents] == [
+      f"message {i}" for i in range(250, 400)
+  ]
+  # One page of 100 events, then one of 200.
+  assert len(invocation_context.session.events) == 310
+  assert invocation_context.session.has_older_events
@@ -0,0 +1,183 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+from google.adk.agents import Agent
+from google.adk.agents.run_config import RunConfig
+from google.adk.events.event import Event
+from google.adk.flows.llm_flows.functions import handle_function_calls_async
+from google.adk.tools.function_tool import FunctionTool
+from google.genai import types
+import pytest
+
+from ... import testing_utils
+
+
+def _function_call_event(*function_calls: types.FunctionCall) -> Event:
+  return Event(
+      author='root_agent',
+      content=types.Content(
+          role='model',
+          parts=[
+              types.Part(function_call=function_call)
+              for function_call in function_calls
+          ],
+      ),
+  )
+
+
+async def _handle_function_calls(agent, tools, run_config, function_calls):
+  invocation_context = await testing_utils.create_invocation_context(
+      agent=agent, user_content='test', run_config=run_config
+  )
+  return await handle_function_calls_async(
+      invocation_context,
+      _function_call_event(*function_calls),
+      {tool.name: tool for tool in tools},
+  )
+
+
+@pytest.mark.asyncio
+async def test_function_calls_run_concurrently():
+  in_flight = 0
+  max_in_flight = 0
+
+  async def wait(seconds: float) -> float:
+    nonlocal in_flight, max_in_flight
+    in_flight += 1
+    max_in_flight = max(max_in_flight, in_flight)
+    await asyncio.sleep(seconds)
+    in_flight -= 1
+    return seconds
+
+  tool = FunctionTool(wait)
+  agent = Agent(name='root_agent', model='gemini-1.5-flash', tools=[tool])
+
+  # The slower call comes first, the responses still follow the call order.
+  event = await _handle_function_calls(
+      agent,
+      [tool],
+      RunConfig(),
+      [
+          types.FunctionCall(id='1', name='wait', args={'seconds': 0.02}),
+          types.FunctionCall(id='2', name='wait', args={'seconds': 0.01}),
+          types.FunctionCall(id='3', name='wait', args={'seconds': 0}),
+      ],
+  )
+
+  assert max_in_flight == 3
+  assert [
+      (part.function_response.id, part.function_response.response)
+      for part in event.content.parts
+  ] == [
+      ('1', {'result': 0.02}),
+      ('2', {'result': 0.01}),
+      ('3', {'result': 0}),
+  ]
+
+
+@pytest.mark.asyncio
+async def test_function_calls_concurrency_limit():
+  in_flight = 0
+  max_in_flight = 0
+
+  async def wait() -> None:
+    nonlocal in_flight, max_in_flight
+    in_flight += 1
+    max_in_flight = max(max_in_flight, in_flight)
+    await asyncio.sleep(0)
+    in_flight -= 1
+
+  tool = FunctionTool(wait)
+  agent = Agent(name='root_agent', model='gemini-1.5-flash', tools=[tool])
+
+  await _handle_function_calls(
+      agent,
+      [tool],
+      RunConfig(max_concurrent_function_calls=2),
+      [types.FunctionCall(id=str(i), name='wait') for i in range(5)],
+  )
+
+  assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_tool_callbacks_run_concurrently():
+  both_started = asyncio.Event()
+  started = []
+
+  async def before_tool_callback(tool, args, tool_context):
+    started.append(args['name'])
+    if len(started) == 2:
+      both_started.set()
+    # Blocks until the callback of the other call started too.
+    await asyncio.wait_for(both_started.wait(), timeout=1)
+
+  def echo(name: str) -> str:
+    return name
+
+  tool = FunctionTool(echo)
+  agent = Agent(
+      name='root_agent',
+      model='gemini-1.5-flash',
+      tools=[tool],
+      before_tool_callback=before_tool_callback,
+  )
+
+  event = await _handle_function_calls(
+      agent,
+      [tool],
+      RunConfig(),
+      [
+          types.FunctionCall(id='1', name='echo', args={'name': 'a'}),
+          types.FunctionCall(id='2', name='echo', args={'name': 'b'}),
+      ],
+  )
+
+  assert [part.function_response.response for part in event.content.parts] == [
+      {'result': 'a'},
+      {'result': 'b'},
+  ]
+
+
+@pytest.mark.asyncio
+async def test_failed_function_call_cancels_others():
+  cancelled = False
+
+  async def slow() -> None:
+    nonlocal cancelled
+    try:
+      await asyncio.sleep(1)
+    except asyncio.CancelledError:
+      cancelled = True
+      raise
+
+  async def fail() -> None:
+    raise RuntimeError('tool failed')
+
+  tools = [FunctionTool(slow), FunctionTool(fail)]
+  agent = Agent(name='root_agent', model='gemini-1.5-flash', tools=tools)
+
+  with pytest.raises(RuntimeError, match='tool failed'):
+    await _handle_function_calls(
+        agent,
+        tools,
+        RunConfig(),
+        [
+            types.FunctionCall(id='1', name='slow'),
+            types.FunctionCall(id='2', name='fail'),
+        ],
+    )
+  assert cancelled
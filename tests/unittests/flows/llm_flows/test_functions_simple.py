@@ -20,6 +20,7 @@ from google.adk.agents import Agent
 from google.adk.events.event import Event
 from google.adk.flows.llm_flows.functions import find_matching_function_call
 from google.adk.sessions.session import Session
+from google.adk.tools import _automatic_function_calling_util
 from google.adk.tools import ToolContext
 from google.adk.tools.function_tool import FunctionTool
 from google.genai import types
@@ -392,3 +393,37 @@ def test_find_function_call_event_multiple_function_responses():
   # Should return the first matching function call event found
   result = find_matching_function_call(events)
   assert result == call_event1  # First match (func_123)
+
+
+def test_function_declarations_are_built_once(mocker):
+  function_call = types.Part.from_function_call(
+      name='increase_by_one', args={'x': 1}
+  )
+  mock_model = testing_utils.MockModel.create(
+      responses=[function_call, 'response1', 'response2']
+  )
+
+  def increase_by_one(x: int) -> int:
+    return x + 1
+
+  build_function_declaration = mocker.patch(
+      'google.adk.tools.function_tool.build_function_declaration',
+      wraps=_automatic_function_calling_util.build_function_declaration,
+  )
+  agent = Agent(name='root_agent', model=mock_model, tools=[increase_by_one])
+  runner = testing_utils.InMemoryRunner(agent)
+  runner.run('test')
+  runner.run('test again')
+
+  assert len(mock_model.requests) == 3
+  for request in mock_model.requests:
+    assert [
+        declaration.name
+        for declaration in request.config.tools[0].function_declarations
+    ] == ['increase_by_one']
+  # Each request gets its own list of declarations.
+  assert (
+      mock_model.requests[0].config.tools[0].function_declarations
+      is not mock_model.requests[1].config.tools[0].function_declarations
+  )
+  assert build_function_declaration.call_count == 1
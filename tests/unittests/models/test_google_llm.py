@@ -12,8 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import datetime
 import os
 import sys
+import time
 from typing import Optional
 from unittest import mock
 
@@ -25,6 +28,7 @@ from google.adk.models.google_llm import Gemini
 from google.adk.models.llm_request import LlmRequest
 from google.adk.models.llm_response import LlmResponse
 from google.adk.utils.variant_utils import GoogleLLMVariant
+from google.genai import errors
 from google.genai import types
 from google.genai import version as genai_version
 from google.genai.types import Content
@@ -669,3 +673,287 @@ def test_preprocess_request_handles_backend_specific_fields(
     assert file_part.file_data.display_name == expected_file_display_name
     assert inline_part.inline_data.display_name == expected_inline_display_name
     assert llm_request_with_files.config.labels == expected_labels
+
+
+class FakeGenaiClient:
+  """An offline genai client, recording the calls made to it."""
+
+  def __init__(self, response, generate_errors=(), create_error=None):
+    self.vertexai = False
+    self.generate_configs = []
+    self.created_caches = []
+    self.updated_caches = []
+    self.aio = mock.Mock()
+    self.aio.models.generate_content = self._generate_content
+    self.aio.models.generate_content_stream = self._generate_content_stream
+    self.aio.caches.create = self._create_cache
+    self.aio.caches.update = self._update_cache
+    self._response = response
+    self._generate_errors = list(generate_errors)
+    self._create_error = create_error
+
+  async def _generate_content(self, *, model, contents, config):
+    self.generate_configs.append(config)
+    if self._generate_errors:
+      raise self._generate_errors.pop(0)
+    return self._response
+
+  async def _generate_content_stream(self, *, model, contents, config):
+    self.generate_configs.append(config)
+    error = self._generate_errors.pop(0) if self._generate_errors else None
+
+    # Like the genai client, only sends the request once iterated.
+    async def responses():
+      if error:
+        raise error
+      yield self._response
+
+    return responses()
+
+  async def _create_cache(self, *, model, config):
+    # Like a request, lets other tasks run meanwhile.
+    await asyncio.sleep(0)
+    if self._create_error:
+      raise self._create_error
+    self.created_caches.append(config)
+    return types.CachedContent(
+        name=f"cachedContents/{len(self.created_caches)}",
+        model=model,
+        expire_time=datetime.datetime.now(datetime.timezone.utc)
+        + datetime.timedelta(seconds=int(config.ttl.rstrip("s"))),
+    )
+
+  async def _update_cache(self, *, name, config):
+    self.updated_caches.append((name, config.ttl))
+    return types.CachedContent(name=name)
+
+
+def _cacheable_request(instruction="Be helpful. " * 400):
+  return LlmRequest(
+      model="gemini-1.5-flash",
+      contents=[Content(role="user", parts=[Part.from_text(text="Hello")])],
+      config=types.GenerateContentConfig(
+          system_instruction=instruction,
+          tools=[
+              types.Tool(
+                  function_declarations=[
+                      types.FunctionDeclaration(name="get_weather")
+                  ]
+              )
+          ],
+      ),
+  )
+
+
+async def _generate(gemini, client, llm_request, stream=False):
+  with mock.patch.object(gemini, "api_client", client):
+    return [
+        response
+        async for response in gemini.generate_content_async(
+            llm_request, stream=stream
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_context_cache_is_created_once_and_reused(
+    generate_content_response,
+):
+  gemini = Gemini(model="gemini-1.5-flash", context_cache_ttl=600)
+  client = FakeGenaiClient(generate_content_response)
+
+  for _ in range(3):
+    llm_request = _cacheable_request()
+    responses = await _generate(gemini, client, llm_request)
+    assert responses[0].content.parts[0].text == "Hello, how can I help you?"
+    # The request itself is left as is.
+    assert llm_request.config.cached_content is None
+    assert llm_request.config.tools
+
+  assert len(client.created_caches) == 1
+  assert client.created_caches[0].ttl == "600s"
+  assert client.created_caches[0].tools[0].function_declarations[0].name == (
+      "get_weather"
+  )
+  for config in client.generate_configs:
+    assert config.cached_content == "cachedContents/1"
+    assert config.system_instruction is None
+    assert config.tools is None
+
+  await _generate(gemini, client, _cacheable_request("Be brief. " * 500))
+  assert len(client.created_caches) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("context_cache_ttl", [None, 600])
+async def test_context_cache_is_not_used_when_disabled_or_small(
+    generate_content_response, llm_request, context_cache_ttl
+):
+  gemini = Gemini(
+      model="gemini-1.5-flash", context_cache_ttl=context_cache_ttl
+  )
+  client = FakeGenaiClient(generate_content_response)
+
+  await _generate(gemini, client, llm_request)
+  await _generate(gemini, client, _cacheable_request())
+
+  assert client.generate_configs[0].system_instruction
+  assert not client.generate_configs[0].cached_content
+  if context_cache_ttl is None:
+    assert not client.created_caches
+    assert not client.generate_configs[1].cached_content
+
+
+@pytest.mark.asyncio
+async def test_context_cache_creation_failure_falls_back(
+    generate_content_response,
+):
+  gemini = Gemini(model="gemini-1.5-flash", context_cache_ttl=600)
+  error = errors.ClientError(
+      400, {"error": {"code": 400, "message": "Caching is not supported."}}
+  )
+  client = FakeGenaiClient(generate_content_response, create_error=error)
+  create_cache = mock.AsyncMock(side_effect=error)
+  client.aio.caches.create = create_cache
+
+  await _generate(gemini, client, _cacheable_request())
+  await _generate(gemini, client, _cacheable_request())
+
+  assert create_cache.call_count == 1
+  for config in client.generate_configs:
+    assert config.system_instruction
+    assert not config.cached_content
+
+
+@pytest.mark.asyncio
+async def test_context_cache_ttl_is_refreshed_before_expiry(
+    generate_content_response,
+):
+  gemini = Gemini(model="gemini-1.5-flash", context_cache_ttl=600)
+  client = FakeGenaiClient(generate_content_response)
+  await _generate(gemini, client, _cacheable_request())
+  (cache,) = gemini._context_caches.values()
+
+  cache.expire_time = time.time() + 100
+  await _generate(gemini, client, _cacheable_request())
+  assert client.updated_caches == [("cachedContents/1", "600s")]
+  assert cache.expire_time > time.time() + 500
+
+  cache.expire_time = time.time() - 1
+  await _generate(gemini, client, _cacheable_request())
+  assert len(client.created_caches) == 2
+  assert client.generate_configs[-1].cached_content == "cachedContents/2"
+
+
+@pytest.mark.asyncio
+async def test_missing_context_cache_is_retried_without_cache(
+    generate_content_response,
+):
+  gemini = Gemini(model="gemini-1.5-flash", context_cache_ttl=600)
+  not_found = errors.ClientError(
+      404, {"error": {"code": 404, "message": "CachedContent not found."}}
+  )
+  client = FakeGenaiClient(
+      generate_content_response, generate_errors=[not_found]
+  )
+
+  responses = await _generate(gemini, client, _cacheable_request())
+  await _generate(gemini, client, _cacheable_request())
+
+  assert responses[0].content.parts[0].text == "Hello, how can I help you?"
+  assert [config.cached_content for config in client.generate_configs] == [
+      "cachedContents/1",
+      None,
+      "cachedContents/2",
+  ]
+
+
+@pytest.mark.asyncio
+async def test_missing_context_cache_is_retried_without_cache_when_streaming(
+    generate_content_response,
+):
+  gemini = Gemini(model="gemini-1.5-flash", context_cache_ttl=600)
+  not_found = errors.ClientError(
+      404, {"error": {"code": 404, "message": "CachedContent not found."}}
+  )
+  client = FakeGenaiClient(
+      generate_content_response, generate_errors=[not_found]
+  )
+
+  responses = await _generate(
+      gemini, client, _cacheable_request(), stream=True
+  )
+
+  assert responses[0].content.parts[0].text == "Hello, how can I help you?"
+  assert [config.cached_content for config in client.generate_configs] == [
+      "cachedContents/1",
+      None,
+  ]
+
+
+@pytest.mark.asyncio
+async def test_permission_denied_for_context_cache_is_retried_without_cache(
+    generate_content_response,
+):
+  gemini = Gemini(model="gemini-1.5-flash", context_cache_ttl=600)
+  permission_denied = errors.ClientError(
+      403,
+      {
+          "error": {
+              "code": 403,
+              "message": "CachedContent not found (or permission denied)",
+          }
+      },
+  )
+  client = FakeGenaiClient(
+      generate_content_response, generate_errors=[permission_denied]
+  )
+
+  await _generate(gemini, client, _cacheable_request())
+
+  assert [config.cached_content for config in client.generate_configs] == [
+      "cachedContents/1",
+      None,
+  ]
+
+
+@pytest.mark.asyncio
+async def test_other_permission_errors_are_not_retried(
+    generate_content_response,
+):
+  gemini = Gemini(model="gemini-1.5-flash", context_cache_ttl=600)
+  permission_denied = errors.ClientError(
+      403, {"error": {"code": 403, "message": "API key not valid."}}
+  )
+  client = FakeGenaiClient(
+      generate_content_response, generate_errors=[permission_denied]
+  )
+
+  with pytest.raises(errors.ClientError):
+    await _generate(gemini, client, _cacheable_request())
+  assert len(client.generate_configs) == 1
+  assert gemini._context_caches
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_create_one_context_cache(
+    generate_content_response,
+):
+  gemini = Gemini(model="gemini-1.5-flash", context_cache_ttl=600)
+  client = FakeGenaiClient(generate_content_response)
+
+  async def generate():
+    return [
+        response
+        async for response in gemini.generate_content_async(
+            _cacheable_request()
+        )
+    ]
+
+  with mock.patch.object(gemini, "api_client", client):
+    await asyncio.gather(*(generate() for _ in range(5)))
+
+  assert len(client.created_caches) == 1
+  assert [config.cached_content for config in client.generate_configs] == [
+      "cachedContents/1"
+  ] * 5
@@ -0,0 +1,122 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import time
+
+from google.adk.events import Event
+from google.adk.events import EventActions
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+import pytest
+
+
+async def _create_session_with_events(
+    session_service: InMemorySessionService, num_events: int
+):
+  session = await session_service.create_session(
+      app_name='my_app', user_id='user', state={'nested': {'key': 'value'}}
+  )
+  for i in range(num_events):
+    await session_service.append_event(
+        session,
+        Event(
+            author='user',
+            content=types.Content(
+                role='user', parts=[types.Part(text=f'message {i}')]
+            ),
+        ),
+    )
+  return session
+
+
+@pytest.mark.asyncio
+async def test_get_session_shares_events():
+  session_service = InMemorySessionService()
+  session = await _create_session_with_events(session_service, 3)
+
+  got_session = await session_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+
+  assert got_session.events == session.events
+  assert all(a is b for a, b in zip(got_session.events, session.events))
+
+  # The event list and state of the copy are still private.
+  got_session.events.append(Event(author='user'))
+  got_session.state['nested']['key'] = 'changed'
+  stored_session = await session_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert len(stored_session.events) == 3
+  assert stored_session.state == {'nested': {'key': 'value'}}
+
+
+@pytest.mark.asyncio
+async def test_get_session_after_append_to_copy():
+  session_service = InMemorySessionService()
+  session = await _create_session_with_events(session_service, 1)
+  got_session = await session_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+
+  await session_service.append_event(
+      got_session,
+      Event(author='user', actions=EventActions(state_delta={'key': 1})),
+  )
+
+  stored_session = await session_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert len(stored_session.events) == 2
+  assert len(session.events) == 1
+  assert stored_session.state['key'] == 1
+
+
+@pytest.mark.asyncio
+async def test_list_sessions_does_not_copy_events(mocker):
+  session_service = InMemorySessionService()
+  for _ in range(3):
+    await _create_session_with_events(session_service, 5)
+  deepcopy = mocker.spy(copy, 'deepcopy')
+
+  response = await session_service.list_sessions(
+      app_name='my_app', user_id='user'
+  )
+
+  assert len(response.sessions) == 3
+  assert all(not s.events and not s.state for s in response.sessions)
+  deepcopy.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_session_benchmark_against_deepcopy():
+  session_service = InMemorySessionService()
+  session = await _create_session_with_events(session_service, 500)
+  stored_session = session_service.sessions['my_app']['user'][session.id]
+  num_reads = 5
+
+  start = time.perf_counter()
+  for _ in range(num_reads):
+    copy.deepcopy(stored_session)
+  deepcopy_seconds = time.perf_counter() - start
+
+  start = time.perf_counter()
+  for _ in range(num_reads):
+    await session_service.get_session(
+        app_name='my_app', user_id='user', session_id=session.id
+    )
+  get_session_seconds = time.perf_counter() - start
+
+  assert get_session_seconds * 10 < deepcopy_seconds
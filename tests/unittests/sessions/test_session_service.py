@@ -12,22 +12,30 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 from datetime import datetime
 from datetime import timezone
 import enum
+import time
+from typing import AsyncGenerator
 
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events import Event
 from google.adk.events import EventActions
+from google.adk.runners import Runner
 from google.adk.sessions import DatabaseSessionService
 from google.adk.sessions import InMemorySessionService
 from google.adk.sessions.base_session_service import GetSessionConfig
 from google.genai import types
 import pytest
+from sqlalchemy import event as sqlalchemy_event
 
 
 class SessionServiceType(enum.Enum):
   IN_MEMORY = 'IN_MEMORY'
   DATABASE = 'DATABASE'
+  DATABASE_ASYNC = 'DATABASE_ASYNC'
 
 
 def get_session_service(
@@ -36,12 +44,19 @@ def get_session_service(
   """Creates a session service for testing."""
   if service_type == SessionServiceType.DATABASE:
     return DatabaseSessionService('sqlite:///:memory:')
+  if service_type == SessionServiceType.DATABASE_ASYNC:
+    return DatabaseSessionService('sqlite+aiosqlite:///:memory:')
   return InMemorySessionService()
 
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
-    'service_type', [SessionServiceType.IN_MEMORY, SessionServiceType.DATABASE]
+    'service_type',
+    [
+        SessionServiceType.IN_MEMORY,
+        SessionServiceType.DATABASE,
+        SessionServiceType.DATABASE_ASYNC,
+    ],
 )
 async def test_get_empty_session(service_type):
   session_service = get_session_service(service_type)
@@ -52,7 +67,12 @@ async def test_get_empty_session(service_type):
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
-    'service_type', [SessionServiceType.IN_MEMORY, SessionServiceType.DATABASE]
+    'service_type',
+    [
+        SessionServiceType.IN_MEMORY,
+        SessionServiceType.DATABASE,
+        SessionServiceType.DATABASE_ASYNC,
+    ],
 )
 async def test_create_get_session(service_type):
   session_service = get_session_service(service_type)
@@ -96,7 +116,12 @@ async def test_create_get_session(service_type):
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
-    'service_type', [SessionServiceType.IN_MEMORY, SessionServiceType.DATABASE]
+    'service_type',
+    [
+        SessionServiceType.IN_MEMORY,
+        SessionServiceType.DATABASE,
+        SessionServiceType.DATABASE_ASYNC,
+    ],
 )
 async def test_create_and_list_sessions(service_type):
   session_service = get_session_service(service_type)
@@ -119,7 +144,12 @@ async def test_create_and_list_sessions(service_type):
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
-    'service_type', [SessionServiceType.IN_MEMORY, SessionServiceType.DATABASE]
+    'service_type',
+    [
+        SessionServiceType.IN_MEMORY,
+        SessionServiceType.DATABASE,
+        SessionServiceType.DATABASE_ASYNC,
+    ],
 )
 async def test_session_state(service_type):
   session_service = get_session_service(service_type)
@@ -211,7 +241,12 @@ async def test_session_state(service_type):
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
-    'service_type', [SessionServiceType.IN_MEMORY, SessionServiceType.DATABASE]
+    'service_type',
+    [
+        SessionServiceType.IN_MEMORY,
+        SessionServiceType.DATABASE,
+        SessionServiceType.DATABASE_ASYNC,
+    ],
 )
 async def test_create_new_session_will_merge_states(service_type):
   session_service = get_session_service(service_type)
@@ -257,7 +292,12 @@ async def test_create_new_session_will_merge_states(service_type):
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
-    'service_type', [SessionServiceType.IN_MEMORY, SessionServiceType.DATABASE]
+    'service_type',
+    [
+        SessionServiceType.IN_MEMORY,
+        SessionServiceType.DATABASE,
+        SessionServiceType.DATABASE_ASYNC,
+    ],
 )
 async def test_append_event_bytes(service_type):
   session_service = get_session_service(service_type)
@@ -298,7 +338,12 @@ async def test_append_event_bytes(service_type):
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
-    'service_type', [SessionServiceType.IN_MEMORY, SessionServiceType.DATABASE]
+    'service_type',
+    [
+        SessionServiceType.IN_MEMORY,
+        SessionServiceType.DATABASE,
+        SessionServiceType.DATABASE_ASYNC,
+    ],
 )
 async def test_append_event_complete(service_type):
   session_service = get_session_service(service_type)
@@ -338,7 +383,12 @@ async def test_append_event_complete(service_type):
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
-    'service_type', [SessionServiceType.IN_MEMORY, SessionServiceType.DATABASE]
+    'service_type',
+    [
+        SessionServiceType.IN_MEMORY,
+        SessionServiceType.DATABASE,
+        SessionServiceType.DATABASE_ASYNC,
+    ],
 )
 async def test_get_session_with_config(service_type):
   session_service = get_session_service(service_type)
@@ -398,3 +448,213 @@ async def test_get_session_with_config(service_type):
   )
   events = session.events
   assert len(events) == num_test_events - after_timestamp + 1
+
+
+class _EchoAgent(BaseAgent):
+  """Agent that replies once per invocation, used to drive the runner."""
+
+  async def _run_async_impl(
+      self, ctx: InvocationContext
+  ) -> AsyncGenerator[Event, None]:
+    yield Event(
+        invocation_id=ctx.invocation_id,
+        author=self.name,
+        content=types.Content(role='model', parts=[types.Part(text='echo')]),
+        actions=EventActions(state_delta={'turns': 1}),
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'service_type',
+    [SessionServiceType.DATABASE, SessionServiceType.DATABASE_ASYNC],
+)
+async def test_concurrent_runner_invocations(service_type):
+  session_service = get_session_service(service_type)
+  runner = Runner(
+      app_name='my_app',
+      agent=_EchoAgent(name='echo_agent'),
+      session_service=session_service,
+  )
+  num_sessions = 20
+  sessions = [
+      await session_service.create_session(app_name='my_app', user_id='user')
+      for _ in range(num_sessions)
+  ]
+
+  async def run(session_id: str) -> list[Event]:
+    return [
+        event
+        async for event in runner.run_async(
+            user_id='user',
+            session_id=session_id,
+            new_message=types.Content(
+                role='user', parts=[types.Part(text='hi')]
+            ),
+        )
+    ]
+
+  results = await asyncio.gather(*(run(session.id) for session in sessions))
+
+  assert [len(events) for events in results] == [1] * num_sessions
+  for session in sessions:
+    stored_session = await session_service.get_session(
+        app_name='my_app', user_id='user', session_id=session.id
+    )
+    assert [event.author for event in stored_session.events] == [
+        'user',
+        'echo_agent',
+    ]
+    assert stored_session.state['turns'] == 1
+
+
+class _SlowEchoAgent(BaseAgent):
+  """Agent that waits like a model call before replying."""
+
+  delay: float = 0.05
+
+  async def _run_async_impl(
+      self, ctx: InvocationContext
+  ) -> AsyncGenerator[Event, None]:
+    await asyncio.sleep(self.delay)
+    yield Event(
+        invocation_id=ctx.invocation_id,
+        author=self.name,
+        content=types.Content(role='model', parts=[types.Part(text='echo')]),
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('database', ['memory', 'file'])
+async def test_benchmark_concurrent_runner_throughput(database, tmp_path):
+  db_path = ':memory:' if database == 'memory' else tmp_path / 'sessions.db'
+  session_service = DatabaseSessionService(f'sqlite+aiosqlite:///{db_path}')
+  agent = _SlowEchoAgent(name='echo_agent')
+  runner = Runner(
+      app_name='my_app', agent=agent, session_service=session_service
+  )
+  num_sessions = 50
+  sessions = [
+      await session_service.create_session(app_name='my_app', user_id='user')
+      for _ in range(num_sessions)
+  ]
+
+  async def run(session_id: str) -> int:
+    num_events = 0
+    async for _ in runner.run_async(
+        user_id='user',
+        session_id=session_id,
+        new_message=types.Content(role='user', parts=[types.Part(text='hi')]),
+    ):
+      num_events += 1
+    return num_events
+
+  start = time.perf_counter()
+  results = await asyncio.gather(*(run(session.id) for session in sessions))
+  throughput = num_sessions / (time.perf_counter() - start)
+
+  assert results == [1] * num_sessions
+  # Each invocation takes at least `delay`, so running them one by one would
+  # manage at most 1 / delay = 20 per second.
+  assert throughput > 1 / agent.delay
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'service_type',
+    [SessionServiceType.DATABASE, SessionServiceType.DATABASE_ASYNC],
+)
+async def test_append_event_statement_count(service_type):
+  session_service = get_session_service(service_type)
+  session = await session_service.create_session(
+      app_name='my_app', user_id='user', state={'key': 'value'}
+  )
+  engine = getattr(
+      session_service.db_engine, 'sync_engine', session_service.db_engine
+  )
+  statements = []
+
+  def record_statement(conn, cursor, statement, *args):
+    statements.append(statement.split()[0].upper())
+
+  sqlalchemy_event.listen(engine, 'before_cursor_execute', record_statement)
+
+  # An event without state delta reads the rows once and inserts the event.
+  await session_service.append_event(session, Event(author='user'))
+  assert statements == ['SELECT', 'INSERT']
+
+  # State deltas are applied as one update per touched row.
+  statements.clear()
+  await session_service.append_event(
+      session,
+      Event(
+          author='user',
+          actions=EventActions(
+              state_delta={'app:a': 1, 'user:b': None, 'key': 'new'}
+          ),
+      ),
+  )
+  assert statements.count('SELECT') == 1
+  assert statements.count('UPDATE') == 3
+
+  session = await session_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert session.state == {'app:a': 1, 'user:b': None, 'key': 'new'}
+  assert len(session.events) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'service_type',
+    [
+        SessionServiceType.IN_MEMORY,
+        SessionServiceType.DATABASE,
+        SessionServiceType.DATABASE_ASYNC,
+    ],
+)
+async def test_get_session_load_older_events(service_type):
+  session_service = get_session_service(service_type)
+  session = await session_service.create_session(
+      app_name='my_app', user_id='user'
+  )
+  for i in range(1, 8):
+    await session_service.append_event(
+        session, Event(author='user', timestamp=i)
+    )
+
+  session = await session_service.get_session(
+      app_name='my_app',
+      user_id='user',
+      session_id=session.id,
+      config=GetSessionConfig(num_recent_events=3),
+  )
+  assert [e.timestamp for e in session.events] == [5, 6, 7]
+  assert session.has_older_events
+
+  older_events = await session.load_older_events(2)
+  assert [e.timestamp for e in older_events] == [3, 4]
+  assert [e.timestamp for e in session.events] == [3, 4, 5, 6, 7]
+  assert session.has_older_events
+
+  assert [e.timestamp async for e in session.iter_events_reversed(1)] == [
+      7,
+      6,
+      5,
+      4,
+      3,
+      2,
+      1,
+  ]
+  assert not session.has_older_events
+  assert [e.timestamp for e in session.events] == [1, 2, 3, 4, 5, 6, 7]
+  assert not await session.load_older_events()
+
+  # Nothing to page in when all events fit.
+  session = await session_service.get_session(
+      app_name='my_app',
+      user_id='user',
+      session_id=session.id,
+      config=GetSessionConfig(num_recent_events=7),
+  )
+  assert not session.has_older_events
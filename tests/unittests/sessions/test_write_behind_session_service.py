@@ -0,0 +1,248 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from typing import AsyncGenerator
+from unittest import mock
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.events import EventActions
+from google.adk.runners import Runner
+from google.adk.sessions import DatabaseSessionService
+from google.adk.sessions import InMemorySessionService
+from google.adk.sessions import WriteBehindSessionService
+from google.genai import types
+import pytest
+from sqlalchemy import event as sqlalchemy_event
+
+
+def _text_event(text: str, **kwargs) -> Event:
+  return Event(
+      author='user',
+      content=types.Content(role='user', parts=[types.Part(text=text)]),
+      **kwargs,
+  )
+
+
+async def _stored_texts(session_service, session):
+  stored = await session_service.get_session(
+      app_name=session.app_name,
+      user_id=session.user_id,
+      session_id=session.id,
+  )
+  return [event.content.parts[0].text for event in stored.events]
+
+
+@pytest.mark.asyncio
+async def test_events_are_buffered_until_flush():
+  database = DatabaseSessionService('sqlite:///:memory:')
+  session_service = WriteBehindSessionService(
+      database, max_buffered_events=10, flush_interval=60
+  )
+  session = await session_service.create_session(
+      app_name='my_app', user_id='user'
+  )
+
+  for i in range(3):
+    await session_service.append_event(session, _text_event(f'event {i}'))
+
+  # The live session is authoritative, storage lags behind.
+  assert len(session.events) == 3
+  assert await _stored_texts(database, session) == []
+
+  await session_service.flush(session)
+  assert await _stored_texts(database, session) == [
+      'event 0',
+      'event 1',
+      'event 2',
+  ]
+
+
+@pytest.mark.asyncio
+async def test_flush_is_a_single_commit():
+  database = DatabaseSessionService('sqlite:///:memory:')
+  session_service = WriteBehindSessionService(
+      database, max_buffered_events=10, flush_interval=60
+  )
+  session = await session_service.create_session(
+      app_name='my_app', user_id='user'
+  )
+  for i in range(5):
+    await session_service.append_event(
+        session,
+        _text_event(f'event {i}', actions=EventActions(state_delta={'i': i})),
+    )
+
+  commits = []
+  sqlalchemy_event.listen(
+      database.db_engine, 'commit', lambda conn: commits.append(conn)
+  )
+  await session_service.flush()
+
+  assert len(commits) == 1
+  stored = await database.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert len(stored.events) == 5
+  assert stored.state == {'i': 4}
+  assert session.last_update_time == stored.last_update_time
+
+
+@pytest.mark.asyncio
+async def test_flush_after_max_buffered_events():
+  database = DatabaseSessionService('sqlite:///:memory:')
+  session_service = WriteBehindSessionService(
+      database, max_buffered_events=2, flush_interval=60
+  )
+  session = await session_service.create_session(
+      app_name='my_app', user_id='user'
+  )
+
+  for i in range(3):
+    await session_service.append_event(session, _text_event(f'event {i}'))
+
+  assert await _stored_texts(database, session) == ['event 0', 'event 1']
+  await session_service.flush()
+
+
+@pytest.mark.asyncio
+async def test_flush_after_interval():
+  database = InMemorySessionService()
+  session_service = WriteBehindSessionService(
+      database, max_buffered_events=10, flush_interval=0.01
+  )
+  session = await session_service.create_session(
+      app_name='my_app', user_id='user'
+  )
+
+  await session_service.append_event(session, _text_event('event'))
+  assert await _stored_texts(database, session) == []
+
+  await asyncio.sleep(0.05)
+  assert await _stored_texts(database, session) == ['event']
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_events_in_order():
+  database = InMemorySessionService()
+  session_service = WriteBehindSessionService(
+      database, max_buffered_events=10, flush_interval=60
+  )
+  session = await session_service.create_session(
+      app_name='my_app', user_id='user'
+  )
+  await session_service.append_event(session, _text_event('event 0'))
+
+  with mock.patch.object(
+      database, 'append_events', side_effect=RuntimeError('db down')
+  ):
+    with pytest.raises(RuntimeError):
+      await session_service.flush(session)
+  await session_service.append_event(session, _text_event('event 1'))
+
+  # Nothing was persisted by the failed flush.
+  assert await _stored_texts(database, session) == []
+  await session_service.flush(session)
+  assert await _stored_texts(database, session) == ['event 0', 'event 1']
+
+
+@pytest.mark.asyncio
+async def test_failed_timed_flush_is_retried_with_backoff():
+  database = InMemorySessionService()
+  session_service = WriteBehindSessionService(
+      database, max_buffered_events=10, flush_interval=0.01
+  )
+  session = await session_service.create_session(
+      app_name='my_app', user_id='user'
+  )
+  append_events = database.append_events
+  attempts = []
+
+  async def flaky_append_events(session, events):
+    attempts.append(asyncio.get_running_loop().time())
+    if len(attempts) <= 2:
+      raise RuntimeError('db down')
+    return await append_events(session, events)
+
+  with mock.patch.object(
+      database, 'append_events', side_effect=flaky_append_events
+  ):
+    await session_service.append_event(session, _text_event('event'))
+    # No further appends or flushes: the retries are scheduled.
+    await asyncio.sleep(0.5)
+
+  assert await _stored_texts(database, session) == ['event']
+  assert len(attempts) == 3
+  first_retry_interval = attempts[1] - attempts[0]
+  second_retry_interval = attempts[2] - attempts[1]
+  assert second_retry_interval > first_retry_interval
+
+
+@pytest.mark.asyncio
+async def test_get_session_reads_buffered_events():
+  session_service = WriteBehindSessionService(
+      DatabaseSessionService('sqlite:///:memory:'), flush_interval=60
+  )
+  session = await session_service.create_session(
+      app_name='my_app', user_id='user'
+  )
+  await session_service.append_event(session, _text_event('event'))
+
+  assert await _stored_texts(session_service, session) == ['event']
+
+
+class _ToolLoopAgent(BaseAgent):
+  """Agent that yields several events per invocation."""
+
+  async def _run_async_impl(
+      self, ctx: InvocationContext
+  ) -> AsyncGenerator[Event, None]:
+    for i in range(4):
+      yield Event(
+          invocation_id=ctx.invocation_id,
+          author=self.name,
+          content=types.Content(role='model', parts=[types.Part(text=str(i))]),
+      )
+
+
+@pytest.mark.asyncio
+async def test_runner_flushes_at_invocation_end():
+  database = DatabaseSessionService('sqlite:///:memory:')
+  session_service = WriteBehindSessionService(
+      database, max_buffered_events=100, flush_interval=60
+  )
+  runner = Runner(
+      app_name='my_app',
+      agent=_ToolLoopAgent(name='agent'),
+      session_service=session_service,
+  )
+  session = await session_service.create_session(
+      app_name='my_app', user_id='user'
+  )
+
+  commits = []
+  sqlalchemy_event.listen(
+      database.db_engine, 'commit', lambda conn: commits.append(conn)
+  )
+  async for _ in runner.run_async(
+      user_id='user',
+      session_id=session.id,
+      new_message=types.Content(role='user', parts=[types.Part(text='hi')]),
+  ):
+    pass
+
+  assert len(commits) == 1
+  assert await _stored_texts(database, session) == ['hi', '0', '1', '2', '3']
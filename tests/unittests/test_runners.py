@@ -16,12 +16,14 @@ from typing import Optional
 
 from google.adk.agents.base_agent import BaseAgent
 from google.adk.agents.llm_agent import LlmAgent
+from google.adk.agents.run_config import RunConfig
 from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
 from google.adk.events.event import Event
 from google.adk.runners import Runner
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
 from google.adk.sessions.session import Session
 from google.genai import types
+import pytest
 
 
 class MockAgent(BaseAgent):
@@ -308,3 +310,65 @@ class TestRunnerFindAgentToRun:
     # MockAgent inherits from BaseAgent, not LlmAgent, so it should return False
     result = self.runner._is_transferable_across_agent_tree(non_llm_agent)
     assert result is False
+
+
+@pytest.mark.asyncio
+async def test_run_async_pages_in_events_to_find_agent():
+  """Test that older events are loaded when the loaded page is inconclusive."""
+  session_service = InMemorySessionService()
+  root_agent = MockLlmAgent("root_agent")
+  sub_agent = MockLlmAgent("sub_agent1", parent_agent=root_agent)
+  root_agent.sub_agents = [sub_agent]
+  runner = Runner(
+      app_name="test_app", agent=root_agent, session_service=session_service
+  )
+  session = await session_service.create_session(
+      app_name="test_app", user_id="test_user"
+  )
+  await session_service.append_event(
+      session,
+      Event(
+          invocation_id="inv1",
+          author="sub_agent1",
+          content=types.Content(
+              role="model",
+              parts=[
+                  types.Part(
+                      function_call=types.FunctionCall(
+                          id="func_123", name="test_func", args={}
+                      )
+                  )
+              ],
+          ),
+      ),
+  )
+  for i in range(5):
+    await session_service.append_event(
+        session,
+        Event(
+            invocation_id=f"inv{i + 2}",
+            author="user",
+            content=types.Content(role="user", parts=[types.Part(text="hi")]),
+        ),
+    )
+
+  events = [
+      event
+      async for event in runner.run_async(
+          user_id="test_user",
+          session_id=session.id,
+          new_message=types.Content(
+              role="user",
+              parts=[
+                  types.Part(
+                      function_response=types.FunctionResponse(
+                          id="func_123", name="test_func", response={}
+                      )
+                  )
+              ],
+          ),
+          run_config=RunConfig(session_events_page_size=2),
+      )
+  ]
+
+  assert [event.author for event in events] == ["sub_agent1"]
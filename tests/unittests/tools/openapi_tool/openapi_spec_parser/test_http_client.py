@@ -0,0 +1,190 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+
+from fastapi.openapi.models import Operation
+from google.adk.tools.openapi_tool.openapi_spec_parser import OperationEndpoint
+from google.adk.tools.openapi_tool.openapi_spec_parser import RestApiHttpClient
+from google.adk.tools.openapi_tool.openapi_spec_parser import RestApiTool
+import pytest
+
+
+class StubServer:
+  """HTTP/1.1 server with keep-alive, echoing requests after a delay."""
+
+  def __init__(self, delay=0.0):
+    self.delay = delay
+    self.connections = 0
+    self.in_flight = 0
+    self.max_in_flight = 0
+    self._server = None
+
+  async def __aenter__(self):
+    self._server = await asyncio.start_server(self._serve, '127.0.0.1', 0)
+    return self
+
+  async def __aexit__(self, *args):
+    self._server.close()
+
+  @property
+  def url(self):
+    host, port = self._server.sockets[0].getsockname()[:2]
+    return f'http://{host}:{port}'
+
+  async def _serve(self, reader, writer):
+    self.connections += 1
+    try:
+      while True:
+        request_line = await reader.readline()
+        if not request_line:
+          return
+        method, target, _ = request_line.decode().split(' ', 2)
+        headers = {}
+        while (line := await reader.readline()) != b'\r\n':
+          name, value = line.decode().split(':', 1)
+          headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+
+        extra_headers = ''
+        if target.startswith('/missing'):
+          status = '404 Not Found'
+        elif target.startswith('/moved'):
+          status = '302 Found'
+          extra_headers = f'Location: {target.replace("/moved", "", 1)}\r\n'
+        else:
+          status = '200 OK'
+        payload = json.dumps({
+            'method': method,
+            'target': target,
+            'cookie': headers.get('cookie'),
+            'body': body.decode(),
+        }).encode()
+        writer.write(
+            f'HTTP/1.1 {status}\r\nContent-Type: application/json\r\n'
+            f'{extra_headers}Content-Length: {len(payload)}\r\n\r\n'.encode()
+            + payload
+        )
+        await writer.drain()
+    finally:
+      writer.close()
+
+
+def _tool(server, path, http_client):
+  return RestApiTool(
+      name='get_item',
+      description='Gets an item.',
+      endpoint=OperationEndpoint(base_url=server.url, path=path, method='GET'),
+      operation=Operation(operationId='getItem'),
+      http_client=http_client,
+  )
+
+
+@pytest.mark.asyncio
+async def test_request_translates_requests_parameters():
+  http_client = RestApiHttpClient()
+  async with StubServer() as server:
+    response = await http_client.request(
+        method='post',
+        url=f'{server.url}/items',
+        params={'q': 'a b'},
+        headers={'Content-Type': 'text/plain'},
+        cookies={'session': 'abc', 'theme': 'dark'},
+        data='raw body',
+    )
+    await http_client.aclose()
+
+  assert response.json() == {
+      'method': 'POST',
+      'target': '/items?q=a+b',
+      'cookie': 'session=abc; theme=dark',
+      'body': 'raw body',
+  }
+
+
+@pytest.mark.asyncio
+async def test_connections_are_kept_alive():
+  http_client = RestApiHttpClient()
+  async with StubServer() as server:
+    tool = _tool(server, '/items', http_client)
+    for _ in range(5):
+      result = await tool.call(args={}, tool_context=None)
+      assert result['target'] == '/items'
+    await http_client.aclose()
+
+  assert server.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_http_errors_are_returned_to_the_model():
+  http_client = RestApiHttpClient()
+  async with StubServer() as server:
+    result = await _tool(server, '/missing', http_client).call(
+        args={}, tool_context=None
+    )
+    await http_client.aclose()
+
+  assert result['error'].startswith('Tool get_item execution failed.')
+
+
+@pytest.mark.asyncio
+async def test_requests_per_host_are_limited():
+  http_client = RestApiHttpClient(max_connections_per_host=3)
+  async with StubServer(delay=0.02) as server:
+    tool = _tool(server, '/items', http_client)
+    await asyncio.gather(
+        *(tool.call(args={}, tool_context=None) for _ in range(10))
+    )
+    await http_client.aclose()
+
+  assert server.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_redirects_are_followed():
+  http_client = RestApiHttpClient()
+  async with StubServer() as server:
+    result = await _tool(server, '/moved/items', http_client).call(
+        args={}, tool_context=None
+    )
+    await http_client.aclose()
+
+  assert result['target'] == '/items'
+
+
+@pytest.mark.asyncio
+async def test_benchmark_concurrent_tool_calls():
+  num_calls = 50
+  http_client = RestApiHttpClient(
+      max_connections_per_host=num_calls, max_keepalive_connections=num_calls
+  )
+  async with StubServer(delay=0.1) as server:
+    tool = _tool(server, '/items', http_client)
+    for _ in range(2):
+      results = await asyncio.gather(
+          *(tool.call(args={}, tool_context=None) for _ in range(num_calls))
+      )
+      assert all(result['target'] == '/items' for result in results)
+    await http_client.aclose()
+
+  # Blocking calls would reach the server one at a time.
+  assert server.max_in_flight == num_calls
+  # The second round of calls reused the pooled connections of the first.
+  assert server.connections == num_calls
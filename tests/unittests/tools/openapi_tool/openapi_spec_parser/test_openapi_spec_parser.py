@@ -12,9 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 from typing import Any
 from typing import Dict
 
+from google.adk.tools.openapi_tool.openapi_spec_parser import openapi_spec_parser
 from google.adk.tools.openapi_tool.openapi_spec_parser.openapi_spec_parser import OpenApiSpecParser
 import pytest
 
@@ -624,3 +626,64 @@ def test_parse_spec_with_duplicate_parameter_names(openapi_spec_generator):
   assert body_param is not None
   assert body_param.original_name == "name"
   assert body_param.py_name == "name_0"
+
+
+def test_parse_lazily_parses_operations_on_demand(openapi_spec_generator):
+  """Operations are listed by name and only parsed when requested."""
+  openapi_spec = create_minimal_openapi_spec()
+  openapi_spec["paths"]["/other"] = {
+      "post": {"responses": {"200": {"description": "OK"}}}
+  }
+
+  operations = openapi_spec_generator.parse_lazily(openapi_spec)
+
+  assert [op.name for op in operations] == ["test_get", "other_post"]
+  assert all(op._parsed is None for op in operations)
+  assert operations[1].get() is operations[1].get()
+  assert operations[1].get().name == "other_post"
+  assert operations[0]._parsed is None
+
+
+def test_parse_shares_resolved_references(openapi_spec_generator):
+  """References are resolved once and the input spec is left untouched."""
+  openapi_spec = {
+      "openapi": "3.1.0",
+      "info": {"title": "API", "version": "1.0.0"},
+      "paths": {
+          f"/item{i}": {
+              "get": {
+                  "responses": {
+                      "200": {
+                          "description": "OK",
+                          "content": {
+                              "application/json": {
+                                  "schema": {
+                                      "$ref": "#/components/schemas/Item"
+                                  }
+                              }
+                          },
+                      }
+                  }
+              }
+          }
+          for i in range(2)
+      },
+      "components": {
+          "schemas": {
+              "Item": {
+                  "type": "object",
+                  "properties": {"id": {"type": "string"}},
+              }
+          }
+      },
+  }
+  original = copy.deepcopy(openapi_spec)
+  resolver = openapi_spec_parser._ReferenceResolver(openapi_spec)
+  ref = {"$ref": "#/components/schemas/Item"}
+
+  assert resolver.resolve(ref) is resolver.resolve(dict(ref))
+
+  parsed_operations = openapi_spec_generator.parse(openapi_spec)
+
+  assert [op.name for op in parsed_operations] == ["item0_get", "item1_get"]
+  assert openapi_spec == original
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import os
 from typing import Dict
 
@@ -23,6 +24,7 @@ from fastapi.openapi.models import ParameterInType
 from fastapi.openapi.models import SecuritySchemeType
 from google.adk.auth.auth_credential import AuthCredential
 from google.adk.auth.auth_credential import AuthCredentialTypes
+from google.adk.tools.openapi_tool.openapi_spec_parser.openapi_spec_parser import OpenApiSpecParser
 from google.adk.tools.openapi_tool.openapi_spec_parser.openapi_toolset import OpenAPIToolset
 from google.adk.tools.openapi_tool.openapi_spec_parser.rest_api_tool import RestApiTool
 import pytest
@@ -137,3 +139,60 @@ def test_openapi_toolset_configure_auth_on_init(openapi_spec: Dict):
   for tool in toolset._tools:
     assert tool.auth_scheme == auth_scheme
     assert tool.auth_credential == auth_credential
+
+
+@pytest.mark.asyncio
+async def test_openapi_toolset_only_parses_selected_operations(
+    openapi_spec: Dict, mocker
+):
+  """Test that operations filtered out by name are never parsed."""
+  from_parsed_operation = mocker.spy(RestApiTool, "from_parsed_operation")
+  toolset = OpenAPIToolset(
+      spec_dict=openapi_spec, tool_filter=["calendar_calendars_get"]
+  )
+  assert from_parsed_operation.call_count == 0
+
+  tools = await toolset.get_tools()
+
+  assert [tool.name for tool in tools] == ["calendar_calendars_get"]
+  assert all(op._parsed is None for op in toolset._operations[2:])
+  assert (await toolset.get_tools())[0] is tools[0]
+  assert from_parsed_operation.call_count == 1
+
+
+def test_openapi_toolset_parse_cache(openapi_spec: Dict, tmp_path, mocker):
+  """Test that a spec seen before is loaded from the parse cache."""
+  first = OpenAPIToolset(
+      spec_dict=openapi_spec, parse_cache_dir=str(tmp_path)
+  )
+  assert len(list(tmp_path.iterdir())) == 1
+
+  parse_lazily = mocker.spy(OpenApiSpecParser, "parse_lazily")
+  second = OpenAPIToolset(
+      spec_dict=openapi_spec, parse_cache_dir=str(tmp_path)
+  )
+
+  assert parse_lazily.call_count == 0
+  for expected, tool in zip(first._tools, second._tools):
+    assert tool.name == expected.name
+    assert tool.operation == expected.operation
+    assert tool.auth_scheme == expected.auth_scheme
+    assert tool._get_declaration() == expected._get_declaration()
+
+
+def test_openapi_toolset_ignores_corrupt_parse_cache(
+    openapi_spec: Dict, tmp_path
+):
+  """Test that an unreadable cache entry is replaced."""
+  OpenAPIToolset(spec_dict=openapi_spec, parse_cache_dir=str(tmp_path))
+  (cache_file,) = tmp_path.iterdir()
+  cache_file.write_text("{not json")
+
+  toolset = OpenAPIToolset(
+      spec_dict=openapi_spec, parse_cache_dir=str(tmp_path)
+  )
+
+  assert len(toolset._tools) == 5
+  assert json.loads(cache_file.read_text())[0]["name"] == (
+      "calendar_calendars_insert"
+  )
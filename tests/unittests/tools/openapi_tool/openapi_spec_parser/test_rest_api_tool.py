@@ -193,7 +193,8 @@ class TestRestApiTool:
     assert isinstance(declaration.parameters, Schema)
 
   @patch(
-      "google.adk.tools.openapi_tool.openapi_spec_parser.rest_api_tool.requests.request"
+      "google.adk.tools.openapi_tool.openapi_spec_parser.http_client.RestApiHttpClient.request",
+      new_callable=AsyncMock,
   )
   @pytest.mark.asyncio
   async def test_call_success(
@@ -225,7 +226,8 @@ class TestRestApiTool:
     assert result == {"result": "success"}
 
   @patch(
-      "google.adk.tools.openapi_tool.openapi_spec_parser.rest_api_tool.requests.request"
+      "google.adk.tools.openapi_tool.openapi_spec_parser.http_client.RestApiHttpClient.request",
+      new_callable=AsyncMock,
   )
   @pytest.mark.asyncio
   async def test_call_auth_pending(
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import inspect
 from unittest.mock import MagicMock
 
 from google.adk.agents.invocation_context import InvocationContext
@@ -345,3 +346,42 @@ async def test_run_async_with_tool_context_and_unexpected_argument():
       "received_arg": "world",
       "context_present": True,
   }
+
+
+def test_declaration_is_cached_until_tool_changes():
+  """Test that the declaration is built once, and rebuilt on changes."""
+
+  def first(x: int) -> int:
+    return x
+
+  def second(y: str) -> str:
+    return y
+
+  tool = FunctionTool(first)
+  declaration = tool._get_declaration()
+
+  assert tool._get_declaration() is declaration
+
+  tool.func = second
+  assert tool._get_declaration().name == "second"
+
+  tool._ignore_params.append("y")
+  assert tool._get_declaration().parameters is None
+
+
+@pytest.mark.asyncio
+async def test_run_async_inspects_signature_once(mocker):
+  """Test that repeated calls reuse the function's signature."""
+  signature = mocker.spy(inspect, "signature")
+
+  tool = FunctionTool(function_for_testing_with_2_arg_and_no_tool_context)
+  for _ in range(3):
+    assert (
+        await tool.run_async(args={"arg1": 1, "arg2": 2}, tool_context=None)
+        == 1
+    )
+    assert await tool.run_async(args={"arg1": 1}, tool_context=None) == {
+        "error": mocker.ANY
+    }
+
+  assert signature.call_count == 1
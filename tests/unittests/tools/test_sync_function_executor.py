@@ -0,0 +1,133 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import contextvars
+import threading
+import time
+from unittest.mock import MagicMock
+
+from google.adk.tools import sync_function_executor
+from google.adk.tools.function_tool import FunctionTool
+from google.adk.tools.sync_function_executor import SyncFunctionExecutor
+import pytest
+
+_request_id = contextvars.ContextVar('request_id', default=None)
+
+
+def _square(x: int) -> int:
+  return x * x
+
+
+@pytest.fixture
+def executor():
+  executor = SyncFunctionExecutor(max_workers=2)
+  yield executor
+  executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_sync_function_runs_off_the_event_loop(executor):
+  def get_thread_id() -> int:
+    return threading.get_ident()
+
+  tool = FunctionTool(get_thread_id, executor=executor)
+
+  result = await tool.run_async(args={}, tool_context=MagicMock())
+
+  assert result != threading.get_ident()
+  assert executor.get_metrics()['completed_calls'] == 1
+
+
+@pytest.mark.asyncio
+async def test_context_is_propagated(executor):
+  def get_request_id() -> str:
+    return _request_id.get()
+
+  tool = FunctionTool(get_request_id, executor=executor)
+  _request_id.set('request-1')
+
+  assert await tool.run_async(args={}, tool_context=MagicMock()) == 'request-1'
+
+
+@pytest.mark.asyncio
+async def test_blocking_function_does_not_block_event_loop(executor):
+  def block() -> None:
+    time.sleep(0.2)
+
+  tool = FunctionTool(block, executor=executor)
+  ticks = 0
+
+  async def tick():
+    nonlocal ticks
+    while True:
+      ticks += 1
+      await asyncio.sleep(0.01)
+
+  ticker = asyncio.create_task(tick())
+  await tool.run_async(args={}, tool_context=MagicMock())
+  ticker.cancel()
+
+  assert ticks > 5
+
+
+@pytest.mark.asyncio
+async def test_metrics_report_queue_depth_and_wait_time(executor):
+  release = threading.Event()
+
+  def wait() -> None:
+    release.wait(timeout=5)
+
+  tasks = [asyncio.create_task(executor.run(wait)) for _ in range(3)]
+  await asyncio.sleep(0.05)
+
+  metrics = executor.get_metrics()
+  assert metrics['pending_calls'] == 3
+  assert metrics['queue_depth'] == 1
+
+  release.set()
+  await asyncio.gather(*tasks)
+  metrics = executor.get_metrics()
+  assert metrics['pending_calls'] == 0
+  assert metrics['completed_calls'] == 3
+  # Only the queued call waited for a worker.
+  assert 0 < metrics['average_wait_time'] < metrics['max_wait_time']
+
+
+@pytest.mark.asyncio
+async def test_process_pool():
+  executor = SyncFunctionExecutor(max_workers=1, use_process_pool=True)
+  tool = FunctionTool(_square, executor=executor)
+  try:
+    assert await tool.run_async(args={'x': 3}, tool_context=MagicMock()) == 9
+  finally:
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_disabled_default_executor_runs_inline(monkeypatch):
+  # Restores the default executor after the test.
+  monkeypatch.setattr(sync_function_executor, '_default_executor', None)
+  monkeypatch.setattr(
+      sync_function_executor, '_default_executor_disabled', False
+  )
+  sync_function_executor.set_default_executor(None)
+
+  def get_thread_id() -> int:
+    return threading.get_ident()
+
+  tool = FunctionTool(get_thread_id)
+  result = await tool.run_async(args={}, tool_context=MagicMock())
+
+  assert result == threading.get_ident()
@@ -1,3 +1,6 @@
+import asyncio
+import time
+
 from google.adk.agents import Agent
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.agents.readonly_context import ReadonlyContext
@@ -214,3 +217,86 @@ async def test_inject_session_state_artifact_service_not_initialized_raises_valu
     await instructions_utils.inject_session_state(
         instruction_template, invocation_context
     )
+
+
+@pytest.mark.asyncio
+async def test_inject_session_state_parses_template_once():
+  instruction_template = "Hello {user_name}, {{not_a_var}} and {invalid-key}!"
+  invocation_context = await _create_test_readonly_context(
+      state={"user_name": "Foo", "not_a_var": "Bar"}
+  )
+  instructions_utils._compile_template.cache_clear()
+
+  for _ in range(3):
+    populated_instruction = await instructions_utils.inject_session_state(
+        instruction_template, invocation_context
+    )
+    assert populated_instruction == "Hello Foo, Bar and {invalid-key}!"
+
+  cache_info = instructions_utils._compile_template.cache_info()
+  assert (cache_info.misses, cache_info.hits) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_inject_session_state_returns_literal_template_as_is():
+  instruction_template = "You are a helpful assistant. " * 10
+  invocation_context = await _create_test_readonly_context()
+
+  populated_instruction = await instructions_utils.inject_session_state(
+      instruction_template, invocation_context
+  )
+  assert populated_instruction is instruction_template
+
+
+@pytest.mark.asyncio
+async def test_inject_session_state_raises_first_error_in_template_order():
+  instruction_template = "{missing_key} {artifact.missing_file}"
+  invocation_context = await _create_test_readonly_context(
+      artifact_service=MockArtifactService({})
+  )
+
+  with pytest.raises(
+      KeyError, match="Context variable not found: `missing_key`."
+  ):
+    await instructions_utils.inject_session_state(
+        instruction_template, invocation_context
+    )
+
+
+class SlowArtifactService(MockArtifactService):
+
+  def __init__(self, artifacts: dict, delay: float):
+    super().__init__(artifacts)
+    self.delay = delay
+
+  async def load_artifact(self, app_name, user_id, session_id, filename):
+    await asyncio.sleep(self.delay)
+    return await super().load_artifact(app_name, user_id, session_id, filename)
+
+
+@pytest.mark.asyncio
+async def test_benchmark_inject_session_state_with_many_placeholders():
+  num_placeholders = 40
+  delay = 0.02
+  instruction_template = " ".join(
+      f"{{var_{i}}} {{artifact.file_{i}}} {{optional_{i}?}}"
+      for i in range(num_placeholders)
+  )
+  invocation_context = await _create_test_readonly_context(
+      state={f"var_{i}": i for i in range(num_placeholders)},
+      artifact_service=SlowArtifactService(
+          {f"file_{i}": f"file {i}" for i in range(num_placeholders)}, delay
+      ),
+  )
+
+  start = time.perf_counter()
+  populated_instruction = await instructions_utils.inject_session_state(
+      instruction_template, invocation_context
+  )
+  elapsed = time.perf_counter() - start
+
+  assert populated_instruction == " ".join(
+      f"{i} file {i} " for i in range(num_placeholders)
+  )
+  # Loading the artifacts one by one would take num_placeholders * delay.
+  assert elapsed < num_placeholders * delay / 4